@@ -16,10 +16,365 @@
 
 import re
 import math
-import json
+import heapq
+import argparse
+from array import array
+from bisect import bisect_left
 from collections import Counter, defaultdict
+from functools import lru_cache
 from pathlib import Path
 
+from text_tokenizer import (is_separator, tokenize, split_sentences, scan_segments, count_sentence_frequency,
+                            trailing_word_start, last_sentence_start)
+from ngram_counter import NGramCounter, count_ngrams
+from analysis_cache import AnalysisCache, DEFAULT_CACHE_DIR, hash_file
+from lexicon_matcher import load_lexicon, sum_scores
+from token_stream import TokenStream
+from lazy_stats import LazyStats
+from json_export import StreamedList, StreamedDict, check_format, write_sections
+from file_input import read_text, iter_text_chunks
+
+# 統計情報の元になる合計値のグループ（グループごとに初めて必要になったときに計算する）
+TOTAL_GROUPS = {
+    'words': ('total_words', 'total_word_length'),
+    'sentences': ('total_sentences', 'total_sentence_tokens'),
+    'syllables': ('total_syllables',),
+    'sentiment': ('positive_count', 'negative_count')
+}
+_TOTAL_GROUP_OF = {name: group for group, names in TOTAL_GROUPS.items() for name in names}
+
+# 音節数キャッシュの最大件数（プロセス全体・全アナライザーで共有）
+SYLLABLE_CACHE_SIZE = 200000
+
+_VOWEL_GROUP_PATTERN = re.compile(r'[aeiouy]+')
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def count_syllables(word):
+    """
+    音節数を推定（英語の場合）
+    
+    連続する母音のまとまりを1音節として数えます。
+    同じ単語の結果はキャッシュされ、アナライザーや文書をまたいで再利用されます。
+    """
+    # 最低1音節
+    return max(1, len(_VOWEL_GROUP_PATTERN.findall(word.lower())))
+
+def count_total_syllables(word_counts):
+    """単語ごとの出現回数から総音節数を計算（単語の種類ごとに1回だけ数える）"""
+    return sum(count_syllables(word) * count for word, count in word_counts.items())
+
+# analyze_word_patterns で数える単語パターン
+WORD_PATTERN_NAMES = ('starts_with_vowel', 'ends_with_consonant', 'contains_numbers', 'all_caps_words', 'repeated_letters')
+
+_VOWELS = frozenset('aeiouAEIOU')
+_CONSONANTS = frozenset('bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ')
+_REPEATED_LETTER_PATTERN = re.compile(r'(.)\1', re.DOTALL)
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def classify_word(word):
+    """
+    単語が当てはまるパターン名のタプルを返す
+    
+    1文字ずつのPythonのループを使わず、文字集合・コンパイル済みの正規表現・
+    文字列メソッドで判定します。同じ単語の結果はキャッシュされます。
+    """
+    names = []
+    # 母音で始まる
+    if word[0] in _VOWELS:
+        names.append('starts_with_vowel')
+    # 子音で終わる
+    if word[-1] in _CONSONANTS:
+        names.append('ends_with_consonant')
+    # 数字を含む
+    if any(map(str.isdigit, word)):
+        names.append('contains_numbers')
+    # 全て大文字
+    if word.isupper() and len(word) > 1:
+        names.append('all_caps_words')
+    # 連続する同じ文字
+    if _REPEATED_LETTER_PATTERN.search(word):
+        names.append('repeated_letters')
+    return tuple(names)
+
+class TextStatsAccumulator:
+    """
+    テキストを少しずつ受け取りながら統計情報を集計するクラス
+    
+    全文や単語リストを保持せず、単語の出現回数と各種合計値だけを
+    更新するため、メモリに載らない巨大なテキストも処理できます。
+    チャンクの境界で分断された単語や文も正しく扱います。
+    
+    テキストの前半と後半を別々に集計した結果は merge() で結合でき、
+    全体を一度に集計した場合と同じ結果になります。
+    """
+    
+    def __init__(self, stopwords=(), min_length=2, ngram_sizes=(), track_sentence_frequency=False, splitter=None):
+        """
+        Args:
+            stopwords (set): 除外する単語の集合
+            min_length (int): 残す単語の最小文字数
+            ngram_sizes (tuple): 集計するN-gramのサイズ（例: (2, 3)）
+            track_sentence_frequency (bool): 単語ごとの出現文数を集計するか（TF-IDF用）
+            splitter (callable): テキストを単語リストに分割する関数（例: JapaneseTokenizer）
+        """
+        self.stopwords = stopwords
+        self.min_length = min_length
+        self.splitter = splitter
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.track_sentence_frequency = track_sentence_frequency
+        self.word_count = Counter()
+        self.total_words = 0
+        self.total_word_length = 0
+        
+        # 文の集計
+        # 最初の区切り文字より前の部分は、前のテキストとつながる可能性があるため別に保持
+        self.has_delimiter = False
+        self.leading_sentence_tokens = 0
+        self.leading_sentence_words = Counter()
+        self.sentence_count = 0          # 区切り済みの文の数
+        self.sentence_token_total = 0    # 区切り済みの文に含まれるトークン数
+        self.current_sentence_tokens = 0 # 区切られていない末尾の文のトークン数
+        self.current_sentence_words = Counter()
+        self.sentence_frequency = Counter()  # 区切り済みの文における単語ごとの出現文数
+        
+        # N-gramの集計
+        self.ngram_counts = {n: Counter() for n in self.ngram_sizes}
+        self._context_size = max(self.ngram_sizes, default=1) - 1
+        self.head_words = []  # 先頭の単語（結合時に境界をまたぐN-gramを数えるため）
+        self.tail_words = []  # 末尾の単語
+        
+        self._last_raw = ''              # 次のチャンクとつながる可能性がある末尾のトークン
+        self._last_words = []
+        self._tail_before_last = []
+    
+    def feed(self, chunk):
+        """テキストの断片を追加で集計"""
+        if not chunk:
+            return
+        
+        # 前回の末尾トークンが今回の先頭とつながる場合は取り消して再集計
+        if self._last_raw and not is_separator(chunk[0]):
+            raw = self._last_raw
+            self._retract_last_token()
+            chunk = raw + chunk
+        
+        self._last_raw = ''
+        self._last_words = []
+        
+        segments = scan_segments(chunk, self.stopwords, self.min_length, self.splitter)
+        for i, (tokens, words) in enumerate(segments):
+            if i > 0:
+                self._close_sentence()
+            tail_before = self.tail_words
+            self._add_segment(tokens, words)
+        
+        # 末尾が空白や区切り文字で終わっていなければ、次のチャンクとつながる可能性がある
+        cut = len(chunk)
+        while cut > 0 and not is_separator(chunk[cut - 1]):
+            cut -= 1
+        if cut < len(chunk):
+            self._last_raw = chunk[cut:]
+            count = len(tokenize(self._last_raw, self.stopwords, self.min_length, self.splitter))
+            self._last_words = words[len(words) - count:]
+            self._tail_before_last = (tail_before + words[:len(words) - count])[-self._context_size:] if self._context_size > 0 else []
+    
+    def end_document(self):
+        """文書の終わりとして、末尾の文を区切りN-gramの連結を断つ"""
+        self._close_sentence()
+        self._last_raw = ''
+        self._last_words = []
+        self.tail_words = []
+    
+    def _add_segment(self, tokens, words):
+        """文の一部（トークン数と単語）を集計に加える"""
+        self.current_sentence_tokens += tokens
+        if not words:
+            return
+        
+        self.word_count.update(words)
+        self.total_words += len(words)
+        self.total_word_length += sum(map(len, words))
+        
+        if self.track_sentence_frequency:
+            self.current_sentence_words.update(words)
+        
+        if self._context_size > 0:
+            if len(self.head_words) < self._context_size:
+                self.head_words = (self.head_words + words)[:self._context_size]
+            self._count_ngrams(self.tail_words, words)
+            self.tail_words = (self.tail_words + words)[-self._context_size:]
+    
+    def _count_ngrams(self, context, words, delta=1, crossing_only=False):
+        """
+        context の後ろに words が続くときに、words の中で終わるN-gramを数える
+        
+        crossing_only=True の場合は context と words の境界をまたぐものだけを数える
+        """
+        sequence = context + words
+        start = len(context)
+        for n in self.ngram_sizes:
+            counts = self.ngram_counts[n]
+            first = max(0, start - n + 1)
+            stop = min(len(sequence), start + n - 1) if crossing_only else len(sequence)
+            window = sequence[first:stop]
+            ngrams = zip(*(window[i:] for i in range(n)))
+            
+            if delta > 0:
+                counts.update(ngrams)
+                continue
+            
+            for ngram in ngrams:
+                counts[ngram] += delta
+                if counts[ngram] <= 0:
+                    del counts[ngram]
+    
+    def _retract_last_token(self):
+        """末尾トークンの集計結果を取り消す"""
+        words = self._last_words
+        for word in words:
+            self.word_count[word] -= 1
+            if self.word_count[word] == 0:
+                del self.word_count[word]
+            self.total_word_length -= len(word)
+        self.total_words -= len(words)
+        self.current_sentence_tokens -= 1
+        
+        if self.track_sentence_frequency:
+            self.current_sentence_words.subtract(words)
+            self.current_sentence_words = +self.current_sentence_words
+        
+        if self._context_size > 0 and words:
+            self._count_ngrams(self._tail_before_last, words, -1)
+            self.tail_words = self._tail_before_last
+            self.head_words = self.head_words[:self.total_words]
+        
+        self._last_raw = ''
+        self._last_words = []
+    
+    def _close_sentence(self):
+        """現在の文を区切る"""
+        if not self.has_delimiter:
+            self.has_delimiter = True
+            self.leading_sentence_tokens = self.current_sentence_tokens
+            self.leading_sentence_words = self.current_sentence_words
+        elif self.current_sentence_tokens > 0:
+            self.sentence_count += 1
+            self.sentence_token_total += self.current_sentence_tokens
+            self.sentence_frequency.update(self.current_sentence_words.keys())
+        self.current_sentence_tokens = 0
+        self.current_sentence_words = Counter()
+    
+    def merge(self, other):
+        """
+        直後に続くテキストの集計結果を結合
+        
+        2つのテキストの境界は空白か文区切り文字の位置である必要があります。
+        
+        Args:
+            other (TextStatsAccumulator): 後ろに続くテキストの集計結果
+        """
+        self.word_count.update(other.word_count)
+        self.total_words += other.total_words
+        self.total_word_length += other.total_word_length
+        
+        # 文の結合（自分の末尾の文と相手の先頭の文は1つの文になる）
+        if not other.has_delimiter:
+            self.current_sentence_tokens += other.current_sentence_tokens
+            self.current_sentence_words.update(other.current_sentence_words)
+        else:
+            self.current_sentence_tokens += other.leading_sentence_tokens
+            self.current_sentence_words.update(other.leading_sentence_words)
+            self._close_sentence()
+            self.sentence_count += other.sentence_count
+            self.sentence_token_total += other.sentence_token_total
+            self.sentence_frequency.update(other.sentence_frequency)
+            self.current_sentence_tokens = other.current_sentence_tokens
+            self.current_sentence_words = Counter(other.current_sentence_words)
+        
+        # N-gramの結合（境界をまたぐN-gramを先に数えて出現順を保つ）
+        tail_before_merge = self.tail_words
+        if self._context_size > 0:
+            self._count_ngrams(self.tail_words, other.head_words, crossing_only=True)
+        for n in self.ngram_sizes:
+            self.ngram_counts[n].update(other.ngram_counts.get(n, {}))
+        if self._context_size > 0:
+            if len(self.head_words) < self._context_size:
+                self.head_words = (self.head_words + other.head_words)[:self._context_size]
+            self.tail_words = (self.tail_words + other.tail_words)[-self._context_size:]
+        
+        # 相手の末尾トークンを引き継ぐ（結合後も feed を続けられるように）
+        self._last_raw = other._last_raw
+        self._last_words = other._last_words
+        self._tail_before_last = (tail_before_merge + other._tail_before_last)[-self._context_size:] if self._context_size > 0 else []
+    
+    @property
+    def total_sentences(self):
+        """末尾の区切られていない文も含めた文の数"""
+        open_sentences = (1 if self.leading_sentence_tokens > 0 else 0) + (1 if self.current_sentence_tokens > 0 else 0)
+        return self.sentence_count + open_sentences
+    
+    @property
+    def total_sentence_tokens(self):
+        """全ての文に含まれるトークン数"""
+        return self.sentence_token_total + self.leading_sentence_tokens + self.current_sentence_tokens
+    
+    def get_sentence_frequency(self):
+        """区切られていない文も含めた単語ごとの出現文数"""
+        frequency = Counter(self.sentence_frequency)
+        frequency.update(self.leading_sentence_words.keys())
+        frequency.update(self.current_sentence_words.keys())
+        return frequency
+    
+    def to_dict(self):
+        """集計の途中状態（N-gramの出現回数を除く）をJSONに変換できる辞書にする"""
+        return {
+            'word_count': self.word_count,
+            'total_words': self.total_words,
+            'total_word_length': self.total_word_length,
+            'has_delimiter': self.has_delimiter,
+            'leading_sentence_tokens': self.leading_sentence_tokens,
+            'leading_sentence_words': self.leading_sentence_words,
+            'sentence_count': self.sentence_count,
+            'sentence_token_total': self.sentence_token_total,
+            'current_sentence_tokens': self.current_sentence_tokens,
+            'current_sentence_words': self.current_sentence_words,
+            'sentence_frequency': self.sentence_frequency,
+            'head_words': self.head_words,
+            'tail_words': self.tail_words,
+            'last_raw': self._last_raw,
+            'last_words': self._last_words,
+            'tail_before_last': self._tail_before_last
+        }
+    
+    def load_dict(self, state):
+        """to_dict() で作成した辞書から集計の途中状態を復元"""
+        self.word_count = Counter(state['word_count'])
+        self.total_words = state['total_words']
+        self.total_word_length = state['total_word_length']
+        self.has_delimiter = state['has_delimiter']
+        self.leading_sentence_tokens = state['leading_sentence_tokens']
+        self.leading_sentence_words = Counter(state['leading_sentence_words'])
+        self.sentence_count = state['sentence_count']
+        self.sentence_token_total = state['sentence_token_total']
+        self.current_sentence_tokens = state['current_sentence_tokens']
+        self.current_sentence_words = Counter(state['current_sentence_words'])
+        self.sentence_frequency = Counter(state['sentence_frequency'])
+        self.head_words = state['head_words']
+        self.tail_words = state['tail_words']
+        self._last_raw = state['last_raw']
+        self._last_words = state['last_words']
+        self._tail_before_last = state['tail_before_last']
+    
+    def ngrams_to_dict(self):
+        """N-gramの出現回数をJSONに変換できる辞書にする（単語を空白でつないだキー）"""
+        return {str(n): {' '.join(ngram): count for ngram, count in counts.items()}
+                for n, counts in self.ngram_counts.items()}
+    
+    def load_ngrams_dict(self, data):
+        """ngrams_to_dict() で作成した辞書からN-gramの出現回数を復元"""
+        for n, counts in data.items():
+            self.ngram_counts[int(n)] = Counter({tuple(ngram.split(' ')): count for ngram, count in counts.items()})
+
 class AdvancedWordAnalyzer:
     """高度な単語解析クラス"""
     
@@ -31,6 +386,34 @@ class AdvancedWordAnalyzer:
         self.word_count = {}
         self.stats = {}
         
+        # 統計情報の元になる合計値（未解析の場合は None。グループごとに必要になったときに計算し、
+        # 計算済みのものは append_text で追加分だけ更新する）
+        self.totals = None
+        self.preprocess_options = (True, 'english')  # (remove_stopwords, language)
+        
+        # True にすると単語列を整数IDの配列（TokenStream）で保持する（大きなテキスト向け）
+        self.compact_tokens = False
+        
+        # 単語分割の関数（None の場合は \w+ の並び。日本語は JapaneseTokenizer を設定する）
+        self.word_splitter = None
+        self.open_sentence_start = None  # 区切られていない末尾の文の開始位置
+        
+        # 集計済みのN-gram（サイズごと。単語列を保持する場合は最初に必要になったときに作成）
+        self.ngram_counts = {}
+        
+        # ストリーミング・並列解析の集計結果（append_text で追加分を集計する）
+        self.accumulator = None
+        
+        # JSON出力の内容と、まだ読み込んでいないN-gram（キャッシュから読み込んだ場合）
+        self.analysis_result = None
+        self.pending_ngrams = None  # (AnalysisCache, キー)
+        
+        # 単語ごとの出現文数（TF-IDFの文書頻度。最初に必要になったときに作成）
+        self.sentence_frequency = None
+        
+        # 単語ごとの出現位置（共起語の検索用。最初に必要になったときに作成）
+        self.word_positions = None
+        
         # ストップワード（除外する一般的な単語）
         self.stopwords = {
             'english': {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'this', 'that', 'these', 'those'},
@@ -42,45 +425,273 @@ class AdvancedWordAnalyzer:
             'positive': {'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 'love', 'like', 'happy', 'joy', 'beautiful', 'perfect', 'awesome', 'brilliant'},
             'negative': {'bad', 'terrible', 'awful', 'horrible', 'hate', 'dislike', 'sad', 'angry', 'ugly', 'worst', 'pain', 'difficult', 'problem', 'issue'}
         }
+        
+        # 外部の感情辞書（フレーズを含む PhraseLexicon。設定すると sentiment_dict の代わりに使う）
+        self.sentiment_lexicon = None
+        self.sentiment_matches = []  # 単語列で見つかった感情フレーズ（開始位置, 終了位置, スコア）
     
-    def load_text_from_file(self, filename):
-        """ファイルからテキストを読み込み"""
+    def load_sentiment_lexicon(self, filename, cache_dir=None, language='english'):
+        """
+        感情辞書ファイル（フレーズ<TAB>スコア）を読み込んで使用する
+        
+        「not good」のような複数語のフレーズは、単語列を保持する解析
+        （preprocess_text 後の calculate_advanced_statistics）で重ならない最長一致として数えます。
+        単語列を保持しない解析（ストリーミング・並列）では1語のフレーズだけを使います。
+        
+        単語列からはストップワードと1文字の単語が除かれるため、フレーズも同じ規則で
+        分割します（「the worst」は「worst」、「a lot of」は「lot」として照合）。
+        ストップワードや word_splitter を変更した場合は辞書を読み込み直してください。
+        
+        Args:
+            filename (str): 辞書ファイル名
+            cache_dir (str): 変換済みのオートマトンを保存するディレクトリ
+            language (str): フレーズから除くストップワードの言語
+            
+        Returns:
+            bool: 読み込み成功時True
+        """
+        try:
+            self.sentiment_lexicon = load_lexicon(filename, cache_dir, self._get_stopwords(True, language),
+                                                  min_length=2, splitter=self.word_splitter)
+        except Exception as e:
+            print(f"❌ 感情辞書の読み込みエラー: {e}")
+            return False
+        
+        # 解析済みの場合は感情スコアだけを計算し直す
+        if self.totals:
+            for name in TOTAL_GROUPS['sentiment']:
+                self.totals.pop(name, None)
+            self.stats.invalidate('sentiment')
+            self.analysis_result = None
+        
+        print(f"✅ 感情辞書を読み込みました: {self.sentiment_lexicon.size}件（最長{self.sentiment_lexicon.max_length}語）")
+        return True
+    
+    def load_stopword_lexicon(self, filename, language='english'):
+        """
+        ストップワードの一覧ファイル（1行に1語）を読み込んで指定した言語のストップワードにする
+        
+        ストップワードは集合で1語ずつ判定するため、件数が多くても1語あたりの判定時間は変わりません。
+        
+        Returns:
+            bool: 読み込み成功時True
+        """
         try:
             with open(filename, 'r', encoding='utf-8') as f:
-                self.text = f.read()
+                self.stopwords[language] = set(tokenize(f.read()))
+        except Exception as e:
+            print(f"❌ ストップワードの読み込みエラー: {e}")
+            return False
+        
+        print(f"✅ ストップワードを読み込みました: {len(self.stopwords[language])}語")
+        return True
+    
+    def load_text_from_file(self, filename):
+        """ファイルからテキストを読み込み（mmap で読み込む。'-' の場合は標準入力）"""
+        try:
+            self.text = read_text(filename)
             print(f"✅ ファイルを読み込みました: {filename}")
             return True
         except Exception as e:
             print(f"❌ ファイル読み込みエラー: {e}")
             return False
     
-    def preprocess_text(self, remove_stopwords=True, language='english'):
-        """高度なテキスト前処理"""
-        if not self.text:
+    def analyze_file_streaming(self, filename, remove_stopwords=True, language='english', chunk_size=1024 * 1024,
+                               detailed=False):
+        """
+        ファイルをチャンク単位で読み込みながら統計情報を計算
+        
+        全文を読み込まないため、メモリより大きなファイルも解析できます。
+        ファイルは mmap で対応付けて少しずつ文字列に変換します（'-' の場合は標準入力）。
+        word_count と stats は通常の解析と同じ結果になりますが、
+        text・sentences・words は保持しません。
+        
+        Args:
+            filename (str): 読み込むファイル名
+            remove_stopwords (bool): ストップワードを除去するか
+            language (str): ストップワードの言語
+            chunk_size (int): 一度に変換するバイト数（mmap を使えない入力では文字数）
+            detailed (bool): N-gramと出現文数（TF-IDF用）も集計するか
+            
+        Returns:
+            bool: 解析成功時True
+        """
+        accumulator = self.create_accumulator(remove_stopwords, language, detailed)
+        
+        try:
+            for chunk in iter_text_chunks(filename, chunk_size):
+                accumulator.feed(chunk)
+        except Exception as e:
+            print(f"❌ ファイル読み込みエラー: {e}")
             return False
         
-        # 文単位で分割
-        self.sentences = re.split(r'[.!?。！？]', self.text)
-        self.sentences = [s.strip() for s in self.sentences if s.strip()]
+        if not self.load_accumulator(accumulator):
+            print("❌ 単語が抽出されませんでした")
+            return False
         
-        # テキストの正規化
-        text_lower = self.text.lower()
+        print(f"✅ ストリーミング解析完了: {accumulator.total_words}個の単語を集計")
+        return True
+    
+    def analyze_file_cached(self, filename, remove_stopwords=True, language='english', cache=None):
+        """
+        ディスクキャッシュを使ってファイルを解析
         
-        # 特殊文字の処理
-        text_processed = re.sub(r'[^\w\s]', ' ', text_lower)
-        text_processed = re.sub(r'\s+', ' ', text_processed)
+        ファイルの内容とオプション（ストップワード・感情辞書を含む）が同じ場合は
+        保存済みの集計結果を読み込み、そうでなければストリーミング解析
+        （N-gram・TF-IDFを含む）を行って結果を保存します。
+        export_analysis_to_json() の内容もキャッシュから出力されます。
+        サイズの大きいN-gramの集計結果は、必要になったときに読み込みます。
+        
+        Args:
+            filename (str): 読み込むファイル名
+            remove_stopwords (bool): ストップワードを除去するか
+            language (str): ストップワードの言語
+            cache (AnalysisCache): 使用するキャッシュ（None の場合は既定のディレクトリ）
+            
+        Returns:
+            bool: 解析成功時True
+        """
+        cache = cache or AnalysisCache()
+        stopwords = self._get_stopwords(remove_stopwords, language)
+        options = {
+            'stopwords': sorted(stopwords),
+            'splitter': getattr(self.word_splitter, 'digest', None),
+            'sentiment': self.sentiment_lexicon.digest if self.sentiment_lexicon is not None
+                         else {name: sorted(words) for name, words in self.sentiment_dict.items()}
+        }
+        
+        try:
+            key = hash_file(filename, options)
+        except OSError as e:
+            print(f"❌ ファイル読み込みエラー: {e}")
+            return False
+        
+        entry = cache.get(key)
+        if entry is not None:
+            accumulator = self.create_accumulator(remove_stopwords, language, detailed=True)
+            accumulator.load_dict(entry['accumulator'])
+            self.load_accumulator(accumulator, totals=entry['totals'])
+            self.analysis_result = entry['result']
+            self.pending_ngrams = (cache, key)
+            print(f"✅ キャッシュから読み込みました: {filename}")
+            return True
+        
+        if not self.analyze_file_streaming(filename, remove_stopwords, language, detailed=True):
+            return False
+        
+        self.analysis_result = self.get_analysis_result()
+        cache.put(key, {
+            'summary': {
+                'accumulator': self.accumulator.to_dict(),
+                'totals': self._get_totals(),
+                'result': self.analysis_result
+            },
+            'ngrams': self.accumulator.ngrams_to_dict()
+        })
+        return True
+    
+    def _load_pending_ngrams(self):
+        """キャッシュから読み込んでいないN-gramの集計結果を読み込む"""
+        if self.pending_ngrams is None:
+            return
         
-        # 単語分割
-        words = [word.strip() for word in text_processed.split() if word.strip()]
+        cache, key = self.pending_ngrams
+        self.pending_ngrams = None
+        data = cache.get(key, 'ngrams')
+        if data is None:
+            print("❌ キャッシュからN-gramを読み込めませんでした")
+            return
         
-        # ストップワード除去
+        self.accumulator.load_ngrams_dict(data)
+        self.ngram_counts = dict(self.accumulator.ngram_counts)
+    
+    def create_accumulator(self, remove_stopwords=True, language='english', detailed=False):
+        """
+        このアナライザーの設定で集計用のTextStatsAccumulatorを作成
+        
+        Args:
+            remove_stopwords (bool): ストップワードを除去するか
+            language (str): ストップワードの言語
+            detailed (bool): N-gramと出現文数（TF-IDF用）も集計するか
+            
+        Returns:
+            TextStatsAccumulator: 集計用オブジェクト
+        """
+        stopwords = self._get_stopwords(remove_stopwords, language)
+        if detailed:
+            return TextStatsAccumulator(stopwords, ngram_sizes=(2, 3), track_sentence_frequency=True,
+                                        splitter=self.word_splitter)
+        return TextStatsAccumulator(stopwords, splitter=self.word_splitter)
+    
+    def _get_stopwords(self, remove_stopwords, language):
+        """除外するストップワードの集合を取得"""
         if remove_stopwords and language in self.stopwords:
-            words = [word for word in words if word not in self.stopwords[language]]
+            return self.stopwords[language]
+        return set()
+    
+    def load_accumulator(self, accumulator, totals=None):
+        """
+        集計結果を読み込んで word_count と stats を設定
         
-        # 短すぎる単語を除去（1文字以下）
-        words = [word for word in words if len(word) > 1]
+        text・sentences・words は空になり、N-gramとTF-IDFは
+        集計済みの値（detailed=True で集計した場合）から計算されます。
         
-        self.words = words
+        Args:
+            accumulator (TextStatsAccumulator): 集計結果
+            totals (dict): 保存済みの合計値（指定すると音節数などを数え直さない）
+            
+        Returns:
+            bool: 単語が1つ以上あればTrue
+        """
+        self.text = ""
+        self.sentences = []
+        self.words = []
+        self.word_count = accumulator.word_count
+        self.ngram_counts = dict(accumulator.ngram_counts)
+        self.sentence_frequency = accumulator.get_sentence_frequency() if accumulator.track_sentence_frequency else None
+        self.word_positions = None
+        self.accumulator = accumulator
+        self.analysis_result = None
+        self.pending_ngrams = None
+        
+        if accumulator.total_words == 0:
+            self.stats = {}
+            self.totals = None
+            return False
+        
+        self.totals = dict(totals) if totals is not None else {}
+        self.stats = self._new_stats()
+        return True
+    
+    def preprocess_text(self, remove_stopwords=True, language='english'):
+        """高度なテキスト前処理"""
+        self.preprocess_options = (remove_stopwords, language)
+        if not self.text:
+            return False
+        
+        self.ngram_counts = {}
+        self.sentence_frequency = None
+        self.word_positions = None
+        self.accumulator = None
+        self.analysis_result = None
+        self.pending_ngrams = None
+        self.sentiment_matches = []
+        self.stats = {}
+        self.totals = None
+        self.open_sentence_start = None
+        
+        # 文単位で分割
+        # 文は元の表記のまま保持するため、単語の取り出しとは別の走査にしている。
+        # 文ごとに単語を取り出す1回の走査も試したが、文ごとの findall の呼び出しが増えて
+        # split と findall をそれぞれテキスト全体に1回ずつ行うより遅かった（1文15語で約2割）
+        self.sentences = split_sentences(self.text)
+        
+        # 正規化・単語分割・ストップワード除去・短すぎる単語（1文字以下）の除去を
+        # 共通トークナイザーで1回の走査にまとめて行う
+        stopwords = self._get_stopwords(remove_stopwords, language)
+        self.words = tokenize(self.text, stopwords, min_length=2, splitter=self.word_splitter)
+        if self.compact_tokens:
+            self.words = TokenStream(self.words)
         print(f"✅ 高度な前処理完了: {len(self.words)}個の単語を抽出")
         return True
     
@@ -89,42 +700,267 @@ class AdvancedWordAnalyzer:
         if not self.words:
             return False
         
-        self.word_count = Counter(self.words)
+        self.word_count = self._count_words()
+        self.analysis_result = None
         
-        # 基本統計
-        total_words = len(self.words)
-        unique_words = len(self.word_count)
-        
-        # 語彙の豊富さ
-        ttr = unique_words / total_words if total_words > 0 else 0
-        
-        # 単語長統計
-        word_lengths = [len(word) for word in self.words]
-        avg_word_length = sum(word_lengths) / len(word_lengths)
-        
-        # 文の統計
-        sentence_lengths = [len(sentence.split()) for sentence in self.sentences]
-        avg_sentence_length = sum(sentence_lengths) / len(sentence_lengths) if sentence_lengths else 0
-        
-        # 読みやすさスコア（簡易版）
-        readability_score = self._calculate_readability()
-        
-        # 感情スコア
-        sentiment_score = self._calculate_sentiment()
-        
-        self.stats = {
-            'total_words': total_words,
-            'unique_words': unique_words,
-            'total_sentences': len(self.sentences),
-            'type_token_ratio': ttr,
-            'average_word_length': avg_word_length,
-            'average_sentence_length': avg_sentence_length,
-            'readability_score': readability_score,
-            'sentiment_score': sentiment_score
-        }
+        # 文の統計・音節数・感情スコアなどは、stats で参照したときに計算する
+        self.totals = {}
+        self.sentiment_matches = []
+        self.stats = self._new_stats()
+        
+        return True
+    
+    def append_text(self, text):
+        """
+        解析済みのテキストにテキストを追加し、追加分だけを処理して結果を更新
+        
+        末尾の単語と文は追加したテキストとつながる可能性があるため、
+        いったん取り消してから数え直します。word_count・stats・N-gram・TF-IDFは
+        テキスト全体を解析し直した場合と同じになります。
+        ストリーミング・並列解析の結果に対しては、集計結果に追加分を集計します。
         
+        Args:
+            text (str): 追加するテキスト
+            
+        Returns:
+            bool: 解析成功時True
+        """
+        if self.accumulator is not None:
+            self._load_pending_ngrams()
+            self.accumulator.feed(text)
+            return self.load_accumulator(self.accumulator)
+        
+        if self.totals is None:
+            # まだ解析していない場合は全体を解析
+            self.text += text
+            return self.preprocess_text(*self.preprocess_options) and self.calculate_advanced_statistics()
+        
+        old_text = self.text
+        self.text = old_text + text
+        self.analysis_result = None
+        stopwords = self._get_stopwords(*self.preprocess_options)
+        
+        # 単語: 末尾の単語を取り消して、追加分とつなげて数え直す
+        cut = trailing_word_start(old_text)
+        removed = tokenize(old_text[cut:], stopwords, min_length=2, splitter=self.word_splitter)
+        self._remove_last_words(len(removed))
+        start = len(self.words)
+        added = tokenize(old_text[cut:] + text, stopwords, min_length=2, splitter=self.word_splitter)
+        self._append_words(added)
+        if self._uses_phrase_sentiment() and 'positive_count' in self.totals:
+            self._update_phrase_sentiment(start)
+        
+        # 文: 区切られていない末尾の文を取り消して、追加分とつなげて分割し直す
+        # （preprocess_text と同じ理由で、単語とは別に分割する）
+        if self.open_sentence_start is None:
+            self.open_sentence_start = last_sentence_start(old_text)
+        open_sentence = old_text[self.open_sentence_start:]
+        if open_sentence.strip():
+            self._update_sentences([self.sentences.pop()], -1)
+        new_sentences = split_sentences(open_sentence + text)
+        self.sentences.extend(new_sentences)
+        self._update_sentences(new_sentences, 1)
+        self.open_sentence_start = last_sentence_start(self.text, self.open_sentence_start)
+        
+        self.stats.invalidate()
+        print(f"✅ 追加テキストを解析しました: {len(added) - len(removed)}個の単語を追加")
         return True
     
+    def _remove_last_words(self, count):
+        """末尾のcount個の単語を集計結果から取り除く"""
+        if count == 0:
+            return
+        
+        start = len(self.words) - count
+        self._update_ngram_counts(start, -1)
+        removed = self.words[start:]
+        del self.words[start:]
+        
+        for word in removed:
+            self.word_count[word] -= 1
+            if self.word_count[word] == 0:
+                del self.word_count[word]
+            if self.word_positions is not None:
+                positions = self.word_positions[word]
+                positions.pop()
+                if not positions:
+                    del self.word_positions[word]
+        self._update_word_totals(Counter(removed), -1)
+    
+    def _append_words(self, words):
+        """単語を末尾に追加して集計結果に加える"""
+        start = len(self.words)
+        self.words.extend(words)
+        self.word_count.update(words)
+        self._update_word_totals(Counter(words))
+        self._update_ngram_counts(start, 1)
+        
+        if self.word_positions is not None:
+            for i, word in enumerate(words, start):
+                self.word_positions.setdefault(word, array('I')).append(i)
+    
+    def _update_ngram_counts(self, start, delta):
+        """集計済みのN-gramのうち、self.words[start:] で終わるものを増減"""
+        for n, counts in self.ngram_counts.items():
+            ngrams = self._count_ngrams(n, max(0, start - n + 1))
+            if delta > 0:
+                counts.update(ngrams)
+                continue
+            for ngram, count in ngrams.items():
+                counts[ngram] -= count
+                if counts[ngram] <= 0:
+                    del counts[ngram]
+    
+    def _update_phrase_sentiment(self, start):
+        """
+        self.words[start:] が変わったときに、感情フレーズの一致を求め直して合計を更新
+        
+        開始位置が start - (最長フレーズの語数 - 1) より前の一致は変わらないため、
+        それ以降の一致だけを取り消して照合し直します。
+        """
+        lexicon = self.sentiment_lexicon
+        restart = max(0, start - lexicon.max_length + 1)
+        index = bisect_left(self.sentiment_matches, (restart,))
+        removed = self.sentiment_matches[index:]
+        del self.sentiment_matches[index:]
+        
+        free = self.sentiment_matches[-1][1] if self.sentiment_matches else 0
+        added = lexicon.find_matches(self.words, restart, free)
+        self.sentiment_matches.extend(added)
+        
+        for matches, sign in ((removed, -1), (added, 1)):
+            positive, negative = sum_scores(matches)
+            self.totals['positive_count'] += positive * sign
+            self.totals['negative_count'] += negative * sign
+    
+    def _update_sentences(self, sentences, delta):
+        """文数・文のトークン数（計算済みの場合）・単語ごとの出現文数を増減"""
+        if 'total_sentences' in self.totals:
+            self.totals['total_sentences'] += len(sentences) * delta
+            self.totals['total_sentence_tokens'] += sum(len(sentence.split()) for sentence in sentences) * delta
+        
+        if self.sentence_frequency is not None and sentences:
+            frequency = count_sentence_frequency('.'.join(sentences), self.word_splitter)
+            if delta > 0:
+                self.sentence_frequency.update(frequency)
+                return
+            for word, count in frequency.items():
+                self.sentence_frequency[word] -= count
+                if self.sentence_frequency[word] <= 0:
+                    del self.sentence_frequency[word]
+    
+    def _get_total(self, name):
+        """合計値を取得（そのグループが未計算なら計算する）"""
+        if name not in self.totals:
+            self._compute_totals(_TOTAL_GROUP_OF[name])
+        return self.totals[name]
+    
+    def _get_totals(self):
+        """すべてのグループを計算した合計値の辞書"""
+        for names in TOTAL_GROUPS.values():
+            self._get_total(names[0])
+        return dict(self.totals)
+    
+    def _compute_totals(self, group):
+        """合計値のグループを word_count・文・単語列から計算"""
+        totals = self.totals
+        if group == 'sentences':
+            if self.accumulator is not None:
+                totals['total_sentences'] = self.accumulator.total_sentences
+                totals['total_sentence_tokens'] = self.accumulator.total_sentence_tokens
+            else:
+                totals['total_sentences'] = len(self.sentences)
+                totals['total_sentence_tokens'] = sum(len(sentence.split()) for sentence in self.sentences)
+            return
+        
+        totals.update(dict.fromkeys(TOTAL_GROUPS[group], 0))
+        if group == 'sentiment' and self._uses_phrase_sentiment():
+            # 外部の感情辞書はフレーズ単位で単語列を照合
+            self.sentiment_matches = []
+            self._update_phrase_sentiment(0)
+            return
+        self._update_word_totals(self.word_count, groups=(group,))
+    
+    def _uses_phrase_sentiment(self):
+        """感情スコアを単語列のフレーズ照合で数えるか（単語列を保持しない解析では1語ずつ数える）"""
+        return self.sentiment_lexicon is not None and self.accumulator is None
+    
+    def _update_word_totals(self, counts, sign=1, groups=None):
+        """
+        単語の出現回数を合計値に加える（sign=-1 の場合は取り除く）
+        
+        Args:
+            counts (dict): 単語と出現回数
+            sign (int): 1 または -1
+            groups (tuple): 更新するグループ（None の場合は計算済みのグループ）
+        """
+        totals = self.totals
+        if groups is None:
+            groups = [group for group in ('words', 'syllables', 'sentiment') if TOTAL_GROUPS[group][0] in totals]
+        add_words = 'words' in groups
+        add_syllables = 'syllables' in groups
+        add_sentiment = 'sentiment' in groups and not self._uses_phrase_sentiment()
+        if not (add_words or add_syllables or add_sentiment):
+            return
+        word_scores = self._get_word_scores() if add_sentiment else {}
+        
+        for word, count in counts.items():
+            count *= sign
+            if add_words:
+                totals['total_words'] += count
+                totals['total_word_length'] += len(word) * count
+            if add_syllables:
+                totals['total_syllables'] += count_syllables(word) * count
+            score = word_scores.get(word)
+            if score is None:
+                continue
+            if score > 0:
+                totals['positive_count'] += score * count
+            elif score < 0:
+                totals['negative_count'] -= score * count
+    
+    def _get_word_scores(self):
+        """1語ごとの感情スコア（外部の感情辞書がなければ sentiment_dict から ±1）"""
+        if self.sentiment_lexicon is not None:
+            return self.sentiment_lexicon.word_scores
+        
+        # 両方に含まれる単語はポジティブとして扱う
+        scores = dict.fromkeys(self.sentiment_dict['negative'], -1)
+        scores.update(dict.fromkeys(self.sentiment_dict['positive'], 1))
+        return scores
+    
+    def _new_stats(self):
+        """
+        統計情報の LazyStats を作成
+        
+        各指標は初めて参照したときに合計値から計算します。依存する値の名前は
+        合計値のグループ（words・sentences・syllables・sentiment）・word_count・他の指標です。
+        """
+        total = self._get_total
+        
+        def ratio(numerator, denominator):
+            return numerator / denominator if denominator > 0 else 0
+        
+        return LazyStats({
+            'total_words': (lambda stats: total('total_words'), ('words',)),
+            'unique_words': (lambda stats: len(self.word_count), ('word_count',)),
+            'total_sentences': (lambda stats: total('total_sentences'), ('sentences',)),
+            # 語彙の豊富さ
+            'type_token_ratio': (lambda stats: ratio(stats['unique_words'], stats['total_words']),
+                                 ('unique_words', 'total_words')),
+            'average_word_length': (lambda stats: ratio(total('total_word_length'), stats['total_words']),
+                                    ('words', 'total_words')),
+            'average_sentence_length': (lambda stats: ratio(total('total_sentence_tokens'), stats['total_sentences']),
+                                        ('sentences', 'total_sentences')),
+            # 読みやすさスコア（簡易版）
+            'readability_score': (lambda stats: self._flesch_score(stats['total_words'], stats['total_sentences'],
+                                                                   total('total_syllables')),
+                                  ('syllables', 'total_words', 'total_sentences')),
+            # 感情スコア
+            'sentiment_score': (lambda stats: self._sentiment_score(total('positive_count'), total('negative_count')),
+                                ('sentiment',))
+        })
+    
     def _calculate_readability(self):
         """読みやすさスコアを計算（Flesch Reading Ease風）"""
         if not self.sentences or not self.words:
@@ -132,8 +968,12 @@ class AdvancedWordAnalyzer:
         
         total_sentences = len(self.sentences)
         total_words = len(self.words)
-        total_syllables = sum(self._count_syllables(word) for word in self.words)
+        total_syllables = count_total_syllables(self._count_words())
         
+        return self._flesch_score(total_words, total_sentences, total_syllables)
+    
+    def _flesch_score(self, total_words, total_sentences, total_syllables):
+        """文数・単語数・音節数から読みやすさスコアを計算"""
         if total_sentences == 0 or total_words == 0:
             return 0
         
@@ -143,22 +983,13 @@ class AdvancedWordAnalyzer:
     
     def _count_syllables(self, word):
         """音節数を推定（英語の場合）"""
-        word = word.lower()
-        vowels = 'aeiouy'
-        syllable_count = 0
-        prev_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not prev_was_vowel:
-                syllable_count += 1
-            prev_was_vowel = is_vowel
-        
-        # 最低1音節
-        return max(1, syllable_count)
+        return count_syllables(word)
     
     def _calculate_sentiment(self):
         """感情スコアを計算"""
+        if self.sentiment_lexicon is not None:
+            return self._sentiment_score(*self.sentiment_lexicon.score(self.words))
+        
         positive_count = 0
         negative_count = 0
         
@@ -168,6 +999,10 @@ class AdvancedWordAnalyzer:
             elif word in self.sentiment_dict['negative']:
                 negative_count += 1
         
+        return self._sentiment_score(positive_count, negative_count)
+    
+    def _sentiment_score(self, positive_count, negative_count):
+        """ポジティブ・ネガティブ語の出現数から感情スコアを計算"""
         total_sentiment_words = positive_count + negative_count
         if total_sentiment_words == 0:
             return 0.0
@@ -176,68 +1011,186 @@ class AdvancedWordAnalyzer:
         sentiment_score = (positive_count - negative_count) / total_sentiment_words
         return sentiment_score
     
+    def _total_words(self):
+        """総単語数（単語列を保持していない場合は集計済みの値）"""
+        if self.words:
+            return len(self.words)
+        return self.stats.get('total_words', 0)
+    
     def get_ngrams(self, n=2):
-        """N-gramを生成"""
-        if len(self.words) < n:
-            return []
+        """N-gramを生成（スライディングウィンドウで数え、途中のリストは作らない）"""
+        return Counter(self._get_ngram_counts(n))
+    
+    def _get_ngram_counts(self, n):
+        """集計済みのN-gramの Counter（コピーしない。未集計なら集計する）"""
+        self._load_pending_ngrams()
+        if n not in self.ngram_counts:
+            # 集計結果は append_text で追加分だけ更新できるように保持する
+            self.ngram_counts[n] = self._count_ngrams(n)
+        return self.ngram_counts[n]
+    
+    def get_top_ngrams(self, n=2, k=10, max_entries=None):
+        """
+        出現回数の多いN-gramを取得
+        
+        Args:
+            n (int): N-gramのサイズ
+            k (int): 取得する件数
+            max_entries (int): 集計中に保持するN-gramの上限
+                （指定すると Space-Saving による近似集計になり、メモリ使用量が一定になる）
         
-        ngrams = []
-        for i in range(len(self.words) - n + 1):
-            ngram = tuple(self.words[i:i + n])
-            ngrams.append(ngram)
+        Returns:
+            list: (N-gramのタプル, 回数) のリスト
+        """
+        self._load_pending_ngrams()
+        if max_entries is None or n in self.ngram_counts:
+            return self.get_ngrams(n).most_common(k)
         
-        return Counter(ngrams)
+        counter = NGramCounter(n, capacity=max_entries)
+        counter.update(self.words)
+        return counter.most_common(k)
+    
+    def _count_words(self):
+        """単語列の出現回数を数える"""
+        if isinstance(self.words, TokenStream):
+            return self.words.count_words()
+        return Counter(self.words)
+    
+    def _count_ngrams(self, n, start=0):
+        """self.words[start:] のN-gramを数える"""
+        if isinstance(self.words, TokenStream):
+            return self.words.count_ngrams(n, start)
+        return count_ngrams(self.words[start:] if start else self.words, n)
+    
+    def _get_tokens(self):
+        """
+        単語列を走査用に取得
+        
+        Returns:
+            tuple: (単語または整数IDの並び, IDを単語に戻す語彙表（文字列のリストの場合は None）)
+        """
+        if isinstance(self.words, TokenStream):
+            return self.words.ids, self.words.vocabulary
+        return self.words, None
+    
+    def _get_word_positions(self):
+        """単語ごとの出現位置の索引を取得（最初の呼び出し時に1回の走査で作成）"""
+        if self.word_positions is None:
+            if isinstance(self.words, TokenStream):
+                self.word_positions = self.words.positions()
+            else:
+                positions = defaultdict(lambda: array('I'))
+                for i, word in enumerate(self.words):
+                    positions[word].append(i)
+                self.word_positions = dict(positions)
+        return self.word_positions
+    
+    def _count_collocations(self, positions, window, collocations):
+        """出現位置の前後windowサイズ分の単語（または整数ID）を数える"""
+        tokens, _ = self._get_tokens()
+        length = len(tokens)
+        for i in positions:
+            # 前後のwindowサイズ分の単語を取得（自分自身は除く）
+            for j in range(max(0, i - window), min(length, i + window + 1)):
+                if j != i:
+                    collocations[tokens[j]] += 1
     
     def get_word_collocations(self, target_word, window=2):
-        """指定した単語の共起語を取得"""
+        """
+        指定した単語の共起語を取得
+        
+        出現位置の索引を使い、対象の単語が出現する位置の周辺だけを調べます。
+        """
         collocations = defaultdict(int)
+        positions = self._get_word_positions().get(target_word, ())
+        self._count_collocations(positions, window, collocations)
+        _, vocabulary = self._get_tokens()
+        if vocabulary is not None:
+            return {vocabulary[word_id]: count for word_id, count in collocations.items()}
+        return dict(collocations)
+    
+    def get_collocation_table(self, target_words, window=2):
+        """
+        複数の単語の共起語をまとめて取得
         
-        for i, word in enumerate(self.words):
-            if word == target_word:
-                # 前後のwindowサイズ分の単語を取得
-                start = max(0, i - window)
-                end = min(len(self.words), i + window + 1)
-                
-                for j in range(start, end):
-                    if j != i:  # 自分自身は除く
-                        collocations[self.words[j]] += 1
+        単語列を1回だけ走査し、全ての対象単語の共起語を同時に数えます。
         
-        return dict(collocations)
+        Args:
+            target_words (iterable): 対象の単語
+            window (int): 前後に調べる単語数
+        
+        Returns:
+            dict: 対象の単語ごとの共起語辞書（get_word_collocations と同じ形式）
+        """
+        tables = {word: defaultdict(int) for word in target_words}
+        tokens, vocabulary = self._get_tokens()
+        length = len(tokens)
+        
+        # 整数IDの場合は対象の単語もIDで引く
+        lookup = tables
+        if vocabulary is not None:
+            word_ids = self.words.word_ids
+            lookup = {word_ids[word]: table for word, table in tables.items() if word in word_ids}
+        
+        for i, token in enumerate(tokens):
+            collocations = lookup.get(token)
+            if collocations is None:
+                continue
+            for j in range(max(0, i - window), min(length, i + window + 1)):
+                if j != i:
+                    collocations[tokens[j]] += 1
+        
+        if vocabulary is not None:
+            return {word: {vocabulary[word_id]: count for word_id, count in collocations.items()}
+                    for word, collocations in tables.items()}
+        return {word: dict(collocations) for word, collocations in tables.items()}
     
-    def calculate_tf_idf(self):
-        """TF-IDF風のスコアを計算（簡易版）"""
-        if not self.sentences:
+    def calculate_tf_idf(self, top_k=None):
+        """
+        TF-IDF風のスコアを計算（簡易版）
+        
+        各文を文書として扱い、文書頻度の索引（最初の呼び出し時に1回だけ作成）を使います。
+        
+        Args:
+            top_k (int): 指定した場合はスコア上位k件だけを返す
+            
+        Returns:
+            dict: 単語とスコアの辞書（top_k指定時はスコアの高い順）
+        """
+        if self.sentence_frequency is None and self.sentences:
+            # 文を区切り文字でつないで1回の走査で数える
+            self.sentence_frequency = count_sentence_frequency('.'.join(self.sentences), self.word_splitter)
+        
+        if self.sentence_frequency is None:
             return {}
         
         # 各文を文書として扱う
-        documents = []
-        for sentence in self.sentences:
-            words = re.findall(r'\w+', sentence.lower())
-            documents.append(words)
-        
-        if not documents:
+        total_documents = len(self.sentences) if self.sentences else self.stats.get('total_sentences', 0)
+        total_words = self._total_words()
+        if total_documents == 0 or total_words == 0:
             return {}
         
-        # TF（Term Frequency）計算
+        # TF（Term Frequency）× IDF（Inverse Document Frequency）
+        frequency = self.sentence_frequency
         tf_scores = {}
-        for word in self.word_count:
-            tf = self.word_count[word] / len(self.words)
-            
-            # IDF（Inverse Document Frequency）計算
-            doc_count = sum(1 for doc in documents if word in doc)
-            idf = math.log(len(documents) / (doc_count + 1))
-            
+        for word, count in self.word_count.items():
+            tf = count / total_words
+            idf = math.log(total_documents / (frequency.get(word, 0) + 1))
             tf_scores[word] = tf * idf
         
+        if top_k is not None:
+            # 全件をソートせずヒープで上位だけを選ぶ
+            return dict(heapq.nlargest(top_k, tf_scores.items(), key=lambda x: x[1]))
+        
         return tf_scores
     
     def get_keyword_density(self, min_frequency=2):
         """キーワード密度を計算"""
-        if not self.words:
+        total_words = self._total_words()
+        if total_words == 0:
             return {}
         
         density = {}
-        total_words = len(self.words)
         
         for word, count in self.word_count.items():
             if count >= min_frequency:
@@ -245,57 +1198,102 @@ class AdvancedWordAnalyzer:
         
         return density
     
-    def analyze_word_patterns(self):
-        """単語パターンを分析"""
-        patterns = {
-            'starts_with_vowel': 0,
-            'ends_with_consonant': 0,
-            'contains_numbers': 0,
-            'all_caps_words': 0,
-            'repeated_letters': 0
-        }
+    def analyze_word_patterns(self, return_members=False):
+        """
+        単語パターンを分析
         
-        vowels = set('aeiouAEIOU')
-        consonants = set('bcdfghjklmnpqrstvwxyzBCDFGHJKLMNPQRSTVWXYZ')
+        パターンの判定は単語の種類ごとに1回だけ行い、出現回数で重み付けして数えます。
         
-        for word in self.words:
-            # 母音で始まる
-            if word[0] in vowels:
-                patterns['starts_with_vowel'] += 1
-            
-            # 子音で終わる
-            if word[-1] in consonants:
-                patterns['ends_with_consonant'] += 1
+        Args:
+            return_members (bool): パターンごとの該当単語の一覧も返すか
             
-            # 数字を含む
-            if any(c.isdigit() for c in word):
-                patterns['contains_numbers'] += 1
-            
-            # 全て大文字
-            if word.isupper() and len(word) > 1:
-                patterns['all_caps_words'] += 1
-            
-            # 連続する同じ文字
-            if any(word[i] == word[i+1] for i in range(len(word)-1)):
-                patterns['repeated_letters'] += 1
+        Returns:
+            dict: パターン名と出現回数（return_members=True の場合は
+                  (出現回数の辞書, パターン名と該当単語リストの辞書) のタプル）
+        """
+        patterns = dict.fromkeys(WORD_PATTERN_NAMES, 0)
+        members = {name: [] for name in WORD_PATTERN_NAMES}
+        
+        # 単語列を保持していない場合は集計済みの出現回数を使う
+        word_counts = self._count_words() if self.words else self.word_count
         
+        for word, count in word_counts.items():
+            for name in classify_word(word):
+                patterns[name] += count
+                members[name].append(word)
+        
+        if return_members:
+            return patterns, members
         return patterns
     
-    def export_analysis_to_json(self, filename="analysis_result.json"):
-        """解析結果をJSONで出力"""
+    def get_analysis_result(self):
+        """
+        JSON出力する解析結果の辞書を取得
+        
+        一度計算した結果（キャッシュから読み込んだ場合はその内容）は、
+        テキストが変わるまで再利用します。
+        """
+        if self.analysis_result is None:
+            self.analysis_result = dict(self.iter_analysis_sections())
+        return self.analysis_result
+    
+    def iter_analysis_sections(self, full=False):
+        """
+        解析結果をセクションごとに計算して (セクション名, 値) として返す
+        
+        Args:
+            full (bool): 上位だけでなく全ての単語・N-gram・TF-IDF・キーワード密度を返すか。
+                表は出現回数・スコアの高い順の StreamedList・StreamedDict になる
+        
+        Yields:
+            tuple: (セクション名, 値)
+        """
+        if not full and self.analysis_result is not None:
+            yield from self.analysis_result.items()
+            return
+        
+        def by_score(scores):
+            return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        
+        yield 'basic_stats', dict(self.stats)
+        if full:
+            yield 'top_words', StreamedList(self.word_count.most_common())
+            yield 'bigrams', StreamedList(self._get_ngram_counts(2).most_common())
+            yield 'trigrams', StreamedList(self._get_ngram_counts(3).most_common())
+            yield 'tf_idf_scores', StreamedDict(by_score(self.calculate_tf_idf()))
+            yield 'word_patterns', self.analyze_word_patterns()
+            yield 'keyword_density', StreamedDict(by_score(self.get_keyword_density()))
+            return
+        
+        yield 'top_words', self.word_count.most_common(20)
+        yield 'bigrams', self.get_top_ngrams(2, 10)
+        yield 'trigrams', self.get_top_ngrams(3, 5)
+        yield 'tf_idf_scores', self.calculate_tf_idf(top_k=10)
+        yield 'word_patterns', self.analyze_word_patterns()
+        yield 'keyword_density', dict(by_score(self.get_keyword_density())[:10])
+    
+    def export_analysis_to_json(self, filename="analysis_result.json", format='pretty', full=False):
+        """
+        解析結果をJSONで出力
+        
+        セクションごとに計算しながら書き出し、full=True の大きな表も
+        要素ごとに書き出すため、出力全体を文字列としてメモリに持ちません。
+        
+        Args:
+            filename (str): 出力ファイル名
+            format (str): 'pretty'（インデント付き）・'compact'（1行）・'jsonl'（JSON Lines）
+            full (bool): 上位だけでなく全ての単語・N-gram・TF-IDF・キーワード密度を出力するか
+        
+        Returns:
+            bool: 出力成功時True（出力形式が不明な場合はファイルを変更せずにFalse）
+        """
         try:
-            result = {
-                'basic_stats': self.stats,
-                'top_words': self.word_count.most_common(20),
-                'bigrams': list(self.get_ngrams(2).most_common(10)),
-                'trigrams': list(self.get_ngrams(3).most_common(5)),
-                'tf_idf_scores': dict(sorted(self.calculate_tf_idf().items(), key=lambda x: x[1], reverse=True)[:10]),
-                'word_patterns': self.analyze_word_patterns(),
-                'keyword_density': dict(sorted(self.get_keyword_density().items(), key=lambda x: x[1], reverse=True)[:10])
-            }
+            # ファイルを開く（既存の内容を消す）前に出力形式を確認する
+            check_format(format)
+            sections = self.iter_analysis_sections(full) if full else self.get_analysis_result().items()
             
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(result, f, indent=2, ensure_ascii=False)
+                write_sections(f, sections, format)
             
             print(f"✅ 解析結果をJSONで保存しました: {filename}")
             return True
@@ -304,8 +1302,29 @@ class AdvancedWordAnalyzer:
             print(f"❌ JSON出力エラー: {e}")
             return False
 
+def parse_arguments():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="高度な単語解析（ファイルを指定しない場合はサンプルテキストで実行）")
+    parser.add_argument('files', nargs='*', help='解析するテキストファイル（<ファイル名>_analysis.json に出力）')
+    parser.add_argument('--cache', nargs='?', const=str(DEFAULT_CACHE_DIR), default=None, metavar='DIR',
+                        help=f'解析結果をディレクトリにキャッシュする（DIR を省略した場合: {DEFAULT_CACHE_DIR}）')
+    return parser.parse_args()
+
 def main():
-    """実行例"""
+    """実行例（ファイル名を指定した場合は解析してJSONに出力。--cache でキャッシュを使う）"""
+    args = parse_arguments()
+    if args.files:
+        cache = AnalysisCache(args.cache) if args.cache else None
+        for filename in args.files:
+            analyzer = AdvancedWordAnalyzer()
+            if cache is not None:
+                analyzed = analyzer.analyze_file_cached(filename, cache=cache)
+            else:
+                analyzed = analyzer.analyze_file_streaming(filename, detailed=True)
+            if analyzed:
+                analyzer.export_analysis_to_json(f"{Path(filename).stem}_analysis.json")
+        return
+    
     analyzer = AdvancedWordAnalyzer()
     
     # サンプルテキストで動作確認
@@ -345,8 +1364,8 @@ def main():
         print(f"  {' '.join(bigram)}: {count}回")
     
     print("\n🎯 TF-IDF上位:")
-    tf_idf = analyzer.calculate_tf_idf()
-    for word, score in sorted(tf_idf.items(), key=lambda x: x[1], reverse=True)[:3]:
+    tf_idf = analyzer.calculate_tf_idf(top_k=3)
+    for word, score in tf_idf.items():
         print(f"  {word}: {score:.3f}")
     
     # JSON出力
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 解析結果のディスクキャッシュ
+
+ファイルの内容のハッシュ値と解析オプションをキーにして、
+集計結果（単語の出現回数や各種合計値）とJSON出力の内容をファイルに保存します。
+内容が変わっていないファイルを同じオプションで解析し直す場合は、
+保存済みの結果を読み込むだけで済みます。
+
+キャッシュの合計サイズが上限を超えると、最も長く使われていないものから削除します。
+
+学習ポイント:
+- hashlib によるファイル内容のハッシュ値計算
+- JSONによる集計結果の保存と復元
+- ファイルの更新時刻を使ったLRU方式の削除
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from pathlib import Path
+
+# 保存形式を変更したら値を増やす（古いキャッシュは使われなくなる）
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path('.word_analyzer_cache')
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+# ハッシュ値の計算で1回に読み込むバイト数
+READ_SIZE = 1024 * 1024
+
+def hash_file(filename, options=None):
+    """
+    ファイルの内容と解析オプションからキャッシュのキーを作成
+    
+    Args:
+        filename (str): 対象ファイル名
+        options (dict): 解析オプション（JSONに変換できる値）
+    
+    Returns:
+        str: SHA-256の16進文字列
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CACHE_VERSION, options], sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    with open(filename, 'rb') as f:
+        while True:
+            data = f.read(READ_SIZE)
+            if not data:
+                break
+            digest.update(data)
+    return digest.hexdigest()
+
+class AnalysisCache:
+    """
+    解析結果をディレクトリに保存するキャッシュ
+    
+    1つのキーの内容は複数のセクション（JSONファイル）に分けて保存するため、
+    大きなセクション（N-gramなど）は必要になったときだけ読み込めます。
+    """
+    
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir (str): キャッシュを保存するディレクトリ
+            max_bytes (int): キャッシュの合計サイズの上限
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+    
+    def _entry_dir(self, key):
+        """キーに対応するディレクトリ"""
+        return self.cache_dir / key
+    
+    def get(self, key, section='summary'):
+        """
+        保存済みのセクションを取得
+        
+        Args:
+            key (str): キー
+            section (str): セクション名
+        
+        Returns:
+            dict: 保存した内容（見つからない・読めない場合は None）
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            with open(entry_dir / f"{section}.json", 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(entry_dir)  # 最近使ったものとして更新時刻を進める
+        except (OSError, ValueError):
+            return None
+        
+        if entry.get('version') != CACHE_VERSION:
+            return None
+        return entry['data']
+    
+    def put(self, key, sections):
+        """
+        内容を保存し、上限を超えた分を古いものから削除
+        
+        Args:
+            key (str): キー
+            sections (dict): セクション名と内容（JSONに変換できる値）の辞書
+        """
+        entry_dir = self._entry_dir(key)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        
+        # summary を最後に書き込み、書き込み途中の内容を読まないよう一時ファイルから置き換える
+        for section in sorted(sections, key=lambda name: name == 'summary'):
+            path = entry_dir / f"{section}.json"
+            temp_path = path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'data': sections[section]}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_path, path)
+        
+        self.evict()
+    
+    def evict(self):
+        """合計サイズが上限以下になるまで、最も長く使われていないものから削除"""
+        entries = []
+        total_size = 0
+        for entry_dir in self.cache_dir.iterdir():
+            if not entry_dir.is_dir():
+                continue
+            size = sum(path.stat().st_size for path in entry_dir.iterdir())
+            entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            total_size += size
+        
+        for _, size, entry_dir in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+    
+    def clear(self):
+        """キャッシュをすべて削除"""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
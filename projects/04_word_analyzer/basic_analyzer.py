@@ -19,6 +19,10 @@ import string
 from collections import Counter
 from pathlib import Path
 
+from text_tokenizer import tokenize, trailing_word_start
+from vocabulary_index import VocabularyIndex
+from file_input import read_text
+
 class BasicWordAnalyzer:
     """基本的な単語解析クラス"""
     
@@ -27,21 +31,23 @@ class BasicWordAnalyzer:
         self.text = ""
         self.words = []
         self.word_count = {}
+        self.length_counts = Counter()  # 単語長ごとの単語数
         self.stats = {}
+        self.word_splitter = None  # 単語分割の関数（日本語は JapaneseTokenizer を設定する）
+        self.vocabulary_index = None  # 単語検索用のインデックス（最初に検索したときに作成）
     
     def load_text_from_file(self, filename):
         """
-        ファイルからテキストを読み込み
+        ファイルからテキストを読み込み（mmap で読み込み、バイト列のコピーを作らない）
         
         Args:
-            filename (str): 読み込むファイル名
+            filename (str): 読み込むファイル名（'-' の場合は標準入力）
             
         Returns:
             bool: 読み込み成功時True
         """
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                self.text = f.read()
+            self.text = read_text(filename)
             print(f"✅ ファイルを読み込みました: {filename}")
             return True
         except FileNotFoundError:
@@ -78,16 +84,9 @@ class BasicWordAnalyzer:
             print("❌ テキストが読み込まれていません")
             return False
         
-        # 小文字に変換
-        text_lower = self.text.lower()
-        
-        # 英数字、ひらがな、カタカナ、漢字のみを抽出
-        # 複数の空白文字は1つの空白に置換
-        processed_text = re.sub(r'[^\w\s]', ' ', text_lower)
-        processed_text = re.sub(r'\s+', ' ', processed_text)
-        
-        # 単語に分割（空白で区切る）
-        self.words = [word.strip() for word in processed_text.split() if word.strip()]
+        # 小文字に変換し、英数字・ひらがな・カタカナ・漢字の並びを単語として抽出
+        # （共通トークナイザーで1回の走査にまとめて処理）
+        self.words = tokenize(self.text, splitter=self.word_splitter)
         
         print(f"✅ テキスト前処理完了: {len(self.words)}個の単語を抽出")
         return True
@@ -99,6 +98,7 @@ class BasicWordAnalyzer:
             return False
         
         self.word_count = Counter(self.words)
+        self.vocabulary_index = None
         print(f"✅ 単語カウント完了: {len(self.word_count)}種類の単語")
         return True
     
@@ -119,14 +119,9 @@ class BasicWordAnalyzer:
         total_lines = len(lines)
         non_empty_lines = len([line for line in lines if line.strip()])
         
-        # 単語長の統計
-        word_lengths = [len(word) for word in self.words]
-        avg_word_length = sum(word_lengths) / len(word_lengths) if word_lengths else 0
-        max_word_length = max(word_lengths) if word_lengths else 0
-        min_word_length = min(word_lengths) if word_lengths else 0
-        
-        # 語彙の豊富さ（Type-Token Ratio）
-        ttr = unique_words / total_words if total_words > 0 else 0
+        # 単語長の統計（単語長ごとの単語数から計算）
+        self.length_counts = Counter(len(word) for word in self.words)
+        word_stats = self._calculate_word_stats()
         
         self.stats = {
             'total_characters': total_chars,
@@ -135,15 +130,92 @@ class BasicWordAnalyzer:
             'unique_words': unique_words,
             'total_lines': total_lines,
             'non_empty_lines': non_empty_lines,
-            'average_word_length': avg_word_length,
-            'max_word_length': max_word_length,
-            'min_word_length': min_word_length,
-            'type_token_ratio': ttr
+            'average_word_length': word_stats['average_word_length'],
+            'max_word_length': word_stats['max_word_length'],
+            'min_word_length': word_stats['min_word_length'],
+            'type_token_ratio': word_stats['type_token_ratio']
         }
         
         print("✅ 統計計算完了")
         return True
     
+    def _calculate_word_stats(self):
+        """word_count と length_counts から単語に関する統計を計算"""
+        total_words = sum(self.length_counts.values())
+        unique_words = len(self.word_count)
+        total_length = sum(length * count for length, count in self.length_counts.items())
+        
+        return {
+            'total_words': total_words,
+            'unique_words': unique_words,
+            'average_word_length': total_length / total_words if total_words > 0 else 0,
+            'max_word_length': max(self.length_counts) if self.length_counts else 0,
+            'min_word_length': min(self.length_counts) if self.length_counts else 0,
+            # 語彙の豊富さ（Type-Token Ratio）
+            'type_token_ratio': unique_words / total_words if total_words > 0 else 0
+        }
+    
+    def append_text(self, text):
+        """
+        解析済みのテキストにテキストを追加し、追加分だけを処理して結果を更新
+        
+        末尾の単語と行は追加したテキストとつながる可能性があるため、
+        いったん取り消してから数え直します。結果はテキスト全体を
+        analyze_all() で解析し直した場合と同じになります。
+        
+        Args:
+            text (str): 追加するテキスト
+            
+        Returns:
+            bool: 解析成功時True
+        """
+        if not self.stats:
+            # まだ解析していない場合は全体を解析
+            self.text += text
+            return self.analyze_all()
+        
+        old_text = self.text
+        self.text = old_text + text
+        
+        # 単語: 末尾の単語を取り消して、追加分とつなげて数え直す
+        cut = trailing_word_start(old_text)
+        removed = tokenize(old_text[cut:], splitter=self.word_splitter)
+        if removed:
+            del self.words[-len(removed):]
+            self._update_word_counts(removed, -1)
+        added = tokenize(old_text[cut:] + text, splitter=self.word_splitter)
+        self.words.extend(added)
+        self._update_word_counts(added, 1)
+        
+        # 行: 末尾の行を取り消して、追加分とつなげて数え直す
+        last_line = old_text[old_text.rfind('\n') + 1:]
+        new_lines = (last_line + text).split('\n')
+        
+        stats = self.stats
+        stats['total_characters'] += len(text)
+        stats['total_characters_no_spaces'] += len(text) - text.count(' ') - text.count('\n') - text.count('\t')
+        stats['total_lines'] += len(new_lines) - 1
+        stats['non_empty_lines'] += len([line for line in new_lines if line.strip()]) - (1 if last_line.strip() else 0)
+        stats.update(self._calculate_word_stats())
+        
+        print(f"✅ 追加テキストを解析しました: {len(added) - len(removed)}個の単語を追加")
+        return True
+    
+    def _update_word_counts(self, words, delta):
+        """単語の出現回数と単語長ごとの単語数を増減"""
+        for word in words:
+            self.word_count[word] += delta
+            if self.word_count[word] == 0:
+                del self.word_count[word]
+                self.vocabulary_index = None
+            elif self.word_count[word] == delta:
+                self.vocabulary_index = None  # 新しい単語が増えた
+            
+            length = len(word)
+            self.length_counts[length] += delta
+            if self.length_counts[length] == 0:
+                del self.length_counts[length]
+    
     def get_most_common_words(self, n=10):
         """
         最も頻出する単語を取得
@@ -159,43 +231,68 @@ class BasicWordAnalyzer:
         
         return self.word_count.most_common(n)
     
-    def get_words_by_length(self, length):
+    def get_vocabulary_index(self):
+        """単語検索用のインデックスを取得（単語の種類が変わった場合は作り直す）"""
+        if self.vocabulary_index is None:
+            self.vocabulary_index = VocabularyIndex(self.word_count)
+        return self.vocabulary_index
+    
+    def get_words_by_length(self, length, top_k=None):
         """
         指定した長さの単語を取得
         
         Args:
             length (int): 単語の長さ
+            top_k (int): 出現回数の多い順に取得する件数（None の場合はすべてを出現順で返す）
             
         Returns:
             list: 指定した長さの単語のリスト
         """
-        return [word for word in self.word_count.keys() if len(word) == length]
+        words = self.get_vocabulary_index().words_with_length(length)
+        if top_k is None:
+            return list(words)
+        return [word for word, _ in self.vocabulary_index.top_k(words, top_k, in_dict_order=True)]
     
-    def search_words(self, pattern):
+    def search_words(self, pattern, top_k=None):
         """
         パターンにマッチする単語を検索
         
+        「^pre」「ing$」のように固定の文字列で始まる・終わるパターンは、
+        インデックスで候補を絞ってから照合します。
+        
         Args:
             pattern (str): 検索パターン（正規表現対応）
+            top_k (int): 取得する件数（None の場合はすべて）
             
         Returns:
-            list: マッチした単語のリスト
+            list: マッチした単語と出現回数のリスト（出現回数の多い順）
         """
         try:
-            regex = re.compile(pattern, re.IGNORECASE)
-            matches = []
-            for word in self.word_count.keys():
-                if regex.search(word):
-                    matches.append((word, self.word_count[word]))
-            
-            # 出現回数でソート
-            matches.sort(key=lambda x: x[1], reverse=True)
-            return matches
-            
+            return self.get_vocabulary_index().search(pattern, top_k)
         except re.error as e:
             print(f"❌ 正規表現エラー: {e}")
             return []
     
+    def search_prefix(self, prefix, top_k=None):
+        """
+        指定した文字列で始まる単語を検索
+        
+        Returns:
+            list: 単語と出現回数のリスト（出現回数の多い順）
+        """
+        index = self.get_vocabulary_index()
+        return index.top_k(index.words_with_prefix(prefix.lower()), top_k)
+    
+    def search_suffix(self, suffix, top_k=None):
+        """
+        指定した文字列で終わる単語を検索
+        
+        Returns:
+            list: 単語と出現回数のリスト（出現回数の多い順）
+        """
+        index = self.get_vocabulary_index()
+        return index.top_k(index.words_with_suffix(suffix.lower()), top_k)
+    
     def analyze_all(self):
         """すべての解析を実行"""
         if not self.text:
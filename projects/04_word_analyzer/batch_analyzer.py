@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: ディレクトリ一括解析
+
+ディレクトリ以下のテキストファイルをまとめて解析するコマンドです。
+ファイルごとの解析結果を JSON Lines（1行に1ファイルのJSON）で順次出力し、
+全ファイルを1つのコーパスとして結合した結果を export_analysis_to_json と
+同じ形式のJSONに保存します。処理中は進捗と処理速度（ファイル/秒、MB/s）を表示します。
+
+学習ポイント:
+- os.walk と fnmatch によるファイルの絞り込み
+- concurrent.futures.wait による完了順の結果処理
+- 完了順の結果をファイル順に結合する方法（並べ替え用のバッファ）
+
+使用方法:
+  python3 projects/04_word_analyzer/batch_analyzer.py corpus/ --include '*.txt' '*.md' -o files.jsonl
+  python3 projects/04_word_analyzer/batch_analyzer.py corpus/ --encoding utf-8 cp932 --summary corpus.json
+"""
+
+import os
+import sys
+import json
+import time
+import codecs
+import argparse
+from contextlib import redirect_stdout
+from fnmatch import fnmatch
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# 自作モジュールをインポート
+try:
+    from advanced_analyzer import AdvancedWordAnalyzer
+    from parallel_analyzer import analyze_document
+except ImportError as e:
+    print(f"❌ モジュールのインポートエラー: {e}")
+    print("projects/04_word_analyzer/ にある advanced_analyzer.py と一緒に実行してください")
+    sys.exit(1)
+
+# 進捗表示を更新する間隔（秒）
+PROGRESS_INTERVAL = 0.5
+
+def find_files(root, include=('*.txt',), exclude=()):
+    """
+    ディレクトリ以下のファイルをパターンで絞り込んで列挙
+    
+    パターンはファイル名またはルートからの相対パスに対して判定します。
+    
+    Args:
+        root (str): 探索するディレクトリ（ファイルを指定した場合はそのファイルだけ）
+        include (tuple): 対象にするパターン
+        exclude (tuple): 除外するパターン
+    
+    Returns:
+        list: ファイルパスのリスト（パス順）
+    """
+    if os.path.isfile(root):
+        return [root]
+    
+    def matches(relative_path, patterns):
+        name = os.path.basename(relative_path)
+        return any(fnmatch(name, pattern) or fnmatch(relative_path, pattern) for pattern in patterns)
+    
+    files = []
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories.sort()
+        for filename in sorted(filenames):
+            path = os.path.join(directory, filename)
+            relative_path = os.path.relpath(path, root)
+            if matches(relative_path, include) and not matches(relative_path, exclude):
+                files.append(path)
+    return files
+
+def analyze_file(filename, encodings=('utf-8',), remove_stopwords=True, language='english'):
+    """
+    1つのファイルを解析（ワーカープロセスで実行）
+    
+    文字コードは指定した順に試し、最初に読めたものを使います。
+    
+    Args:
+        filename (str): 解析するファイル名
+        encodings (tuple): 試す文字コード
+        remove_stopwords (bool): ストップワードを除去するか
+        language (str): ストップワードの言語
+    
+    Returns:
+        tuple: (JSON Lines に出力する辞書, 部分集計結果（失敗時は None）)
+    """
+    start = time.perf_counter()
+    record = {'file': filename, 'bytes': 0}
+    
+    try:
+        record['bytes'] = os.path.getsize(filename)
+        for encoding in encodings:
+            try:
+                accumulator = analyze_document(filename, remove_stopwords, language, encoding)
+                break
+            except UnicodeDecodeError:
+                continue
+        else:
+            record['error'] = f"文字コードを判定できません（{', '.join(encodings)}）"
+            return record, None
+    except (OSError, LookupError) as e:
+        # LookupError: 文字コード名が正しくない場合
+        record['error'] = str(e)
+        return record, None
+    
+    record['encoding'] = encoding
+    analyzer = AdvancedWordAnalyzer()
+    if analyzer.load_accumulator(accumulator):
+        record.update(analyzer.get_analysis_result())
+    else:
+        record['error'] = "単語が抽出されませんでした"
+    record['seconds'] = time.perf_counter() - start
+    return record, accumulator
+
+class BatchProgress:
+    """処理済みのファイル数・バイト数と処理速度を表示するクラス"""
+    
+    def __init__(self, total_files, stream=sys.stderr):
+        """
+        Args:
+            total_files (int): 処理するファイル数
+            stream (file): 表示先
+        """
+        self.total_files = total_files
+        self.stream = stream
+        self.files = 0
+        self.bytes = 0
+        self.errors = 0
+        self.start = time.perf_counter()
+        self._last_report = 0.0
+    
+    def update(self, record):
+        """1ファイルの処理結果を反映し、一定間隔で進捗を表示"""
+        self.files += 1
+        self.bytes += record.get('bytes', 0)
+        if 'error' in record:
+            self.errors += 1
+        
+        now = time.perf_counter()
+        if now - self._last_report >= PROGRESS_INTERVAL or self.files == self.total_files:
+            self._last_report = now
+            self.stream.write(f"\r📂 {self.files}/{self.total_files}ファイル  {self.format_rates()}")
+            self.stream.flush()
+    
+    def format_rates(self):
+        """処理速度の文字列"""
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        return f"{self.files / elapsed:.1f} ファイル/秒  {self.bytes / (1024 * 1024) / elapsed:.2f} MB/s"
+    
+    def finish(self):
+        """最終結果を表示"""
+        elapsed = time.perf_counter() - self.start
+        self.stream.write(f"\n✅ {self.files}ファイル（{self.bytes / (1024 * 1024):.1f} MB, エラー{self.errors}件）を"
+                          f"{elapsed:.2f}秒で解析しました  {self.format_rates()}\n")
+        self.stream.flush()
+
+class BatchAnalyzer:
+    """ファイルを並列に解析し、ファイルごとの結果とコーパス全体の結果を作るクラス"""
+    
+    def __init__(self, workers=None, encodings=('utf-8',), remove_stopwords=True, language='english'):
+        """
+        Args:
+            workers (int): ワーカープロセス数（None の場合はCPUコア数）
+            encodings (tuple): 試す文字コード
+            remove_stopwords (bool): ストップワードを除去するか
+            language (str): ストップワードの言語
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.encodings = tuple(encodings)
+        self.remove_stopwords = remove_stopwords
+        self.language = language
+    
+    def _iter_results(self, filenames):
+        """解析結果を (ファイルの番号, 結果) として完了順に返す"""
+        args = (self.encodings, self.remove_stopwords, self.language)
+        if self.workers == 1:
+            for index, filename in enumerate(filenames):
+                yield index, analyze_file(filename, *args)
+            return
+        
+        # 実行中のタスクはワーカー数の数倍までにして、結果がたまりすぎないようにする
+        max_pending = self.workers * 4
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            next_index = 0
+            while next_index < len(filenames) or pending:
+                while next_index < len(filenames) and len(pending) < max_pending:
+                    future = executor.submit(analyze_file, filenames[next_index], *args)
+                    pending[future] = next_index
+                    next_index += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+    
+    def analyze(self, filenames, record_stream=None, progress=None):
+        """
+        ファイルを解析し、ファイルごとの結果を JSON Lines で書き出す
+        
+        ファイルごとの結果は完了順に書き出し、コーパス全体の集計は
+        結果の順番によらず同じになるようファイル順に結合します。
+        
+        Args:
+            filenames (list): 解析するファイル名のリスト
+            record_stream (file): JSON Lines の出力先（None の場合は出力しない）
+            progress (BatchProgress): 進捗の表示
+        
+        Returns:
+            AdvancedWordAnalyzer: コーパス全体の解析結果
+        """
+        analyzer = AdvancedWordAnalyzer()
+        total = analyzer.create_accumulator(self.remove_stopwords, self.language, detailed=True)
+        waiting = {}  # 前のファイルの完了を待っている部分集計結果
+        next_merge = 0
+        
+        for index, (record, accumulator) in self._iter_results(filenames):
+            if record_stream is not None:
+                record_stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+            if progress is not None:
+                progress.update(record)
+            
+            waiting[index] = accumulator
+            while next_merge in waiting:
+                partial = waiting.pop(next_merge)
+                if partial is not None:
+                    total.merge(partial)
+                next_merge += 1
+        
+        analyzer.load_accumulator(total)
+        return analyzer
+
+def parse_arguments():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="ディレクトリ以下のテキストファイルを一括解析")
+    parser.add_argument('paths', nargs='+', help='解析するディレクトリまたはファイル')
+    parser.add_argument('--include', nargs='+', default=['*.txt'],
+                        help="対象にするファイルのパターン（デフォルト: '*.txt'）")
+    parser.add_argument('--exclude', nargs='+', default=[],
+                        help='除外するファイルのパターン')
+    parser.add_argument('--encoding', nargs='+', default=['utf-8'],
+                        help='試す文字コード（指定した順に試す。例: utf-8 cp932）')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='ワーカープロセス数（デフォルト: CPUコア数）')
+    parser.add_argument('-o', '--output', default='-',
+                        help="ファイルごとの結果（JSON Lines）の出力先（デフォルト: '-' で標準出力）")
+    parser.add_argument('--summary', default='corpus_analysis.json',
+                        help='コーパス全体の結果（JSON）の出力先')
+    parser.add_argument('--format', choices=['pretty', 'compact', 'jsonl'], default='pretty',
+                        help='コーパス全体の結果の形式（pretty: インデント付き, compact: 1行, jsonl: JSON Lines）')
+    parser.add_argument('--full', action='store_true',
+                        help='上位だけでなく全ての単語・N-gram・TF-IDFを出力')
+    parser.add_argument('--language', default='english',
+                        help='ストップワードの言語')
+    parser.add_argument('--keep-stopwords', action='store_true',
+                        help='ストップワードを除去しない')
+    args = parser.parse_args()
+    
+    # 文字コード名の誤りはすべてのファイルで失敗するため、解析を始める前に確認する
+    for encoding in args.encoding:
+        try:
+            codecs.lookup(encoding)
+        except LookupError:
+            parser.error(f"不明な文字コードです: {encoding}")
+    return args
+
+def main():
+    """メイン関数"""
+    args = parse_arguments()
+    
+    filenames = []
+    for path in args.paths:
+        filenames.extend(find_files(path, args.include, args.exclude))
+    if not filenames:
+        print("❌ 対象のファイルが見つかりませんでした", file=sys.stderr)
+        sys.exit(1)
+    
+    batch = BatchAnalyzer(workers=args.workers, encodings=args.encoding,
+                          remove_stopwords=not args.keep_stopwords, language=args.language)
+    progress = BatchProgress(len(filenames))
+    print(f"🚀 {len(filenames)}ファイルを{batch.workers}プロセスで解析します", file=sys.stderr)
+    
+    if args.output == '-':
+        analyzer = batch.analyze(filenames, sys.stdout, progress)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            analyzer = batch.analyze(filenames, f, progress)
+    progress.finish()
+    
+    if not analyzer.stats:
+        print("❌ 単語が抽出されませんでした", file=sys.stderr)
+        sys.exit(1)
+    
+    # export_analysis_to_json の完了メッセージも JSON Lines と混ざらないよう標準エラーに出す
+    with redirect_stdout(sys.stderr):
+        analyzer.export_analysis_to_json(args.summary, format=args.format, full=args.full)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 単語解析のベンチマーク
+
+乱数のシードから毎回同じ英語・日本語の合成コーパスを作り、
+AdvancedWordAnalyzer の各段階の処理時間とメモリのピーク使用量を計測します。
+結果はJSONで保存し、別のコミットで保存した結果と比較できます。
+
+計測する段階:
+  preprocess_text → calculate_advanced_statistics → get_ngrams → calculate_tf_idf → export_analysis_to_json
+
+処理時間は tracemalloc を止めた状態で計測し、メモリは別の実行で
+tracemalloc のピーク値（段階ごと）を計測します（tracemalloc は処理を遅くするため）。
+
+学習ポイント:
+- random.Random によるシード付きの再現可能なデータ生成
+- Zipf分布に近い単語の出現頻度の作り方
+- tracemalloc によるメモリのピーク計測
+- 比較しやすいJSONレポートの作り方
+
+使用方法:
+  python3 projects/04_word_analyzer/benchmark_analyzer.py --sizes 1MB 10MB -o before.json
+  python3 projects/04_word_analyzer/benchmark_analyzer.py --sizes 1MB 10MB -o after.json --compare before.json
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from itertools import accumulate
+from contextlib import redirect_stdout
+
+# 自作モジュールをインポート
+try:
+    from advanced_analyzer import AdvancedWordAnalyzer
+    from japanese_tokenizer import JapaneseTokenizer, build_dictionary, BASIC_WORDS
+except ImportError as e:
+    print(f"❌ モジュールのインポートエラー: {e}")
+    print("projects/04_word_analyzer/ にある advanced_analyzer.py と一緒に実行してください")
+    sys.exit(1)
+
+# レポートの形式を変更したら値を増やす
+REPORT_VERSION = 1
+
+# 計測する段階（calculate_advanced_statistics は統計情報を遅延評価するため、
+# この段階ですべての指標を評価して計測する）
+STAGES = ['preprocess_text', 'calculate_advanced_statistics', 'get_ngrams', 'calculate_tf_idf',
+          'export_analysis_to_json']
+
+# 1回に生成する単語数
+BLOCK_WORDS = 100000
+
+_SIZE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*(B|KB|MB|GB)?$', re.IGNORECASE)
+_SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+_ENGLISH_COMMON = ['the', 'a', 'and', 'of', 'to', 'in', 'is', 'that', 'for', 'it', 'with', 'was', 'on', 'data',
+                   'text', 'analysis', 'python', 'good', 'great', 'bad', 'problem', 'happy', 'difficult']
+_ENGLISH_SYLLABLES = ['ka', 'ter', 'lo', 'min', 'pre', 'sta', 'tion', 'ing', 'ro', 'ble', 'con', 'ex', 'ment',
+                      'al', 'ver', 'un', 'de', 'ly', 'ness', 'tri', 'pho', 'gra', 'ous', 'qui']
+_KATAKANA = 'アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワン'
+_KANJI = '日本語学生先会社時間自然言語処理分析辞書文章単東京大阪京都新旧高低長短春夏秋冬山川海空電車話題問'
+_JAPANESE_PARTICLES = ['は', 'が', 'を', 'に', 'で', 'と', 'の', 'も', 'から']
+_JAPANESE_ENDINGS = ['です', 'ます', 'でした', 'ました', 'ない']
+
+def parse_size(text):
+    """「10MB」のようなサイズ指定をバイト数に変換"""
+    match = _SIZE_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"サイズの形式が正しくありません: {text}")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[(unit or 'B').upper()])
+
+def format_size(size):
+    """バイト数を「10MB」のような文字列に変換"""
+    for unit in ('GB', 'MB', 'KB'):
+        if size >= _SIZE_UNITS[unit] and size % _SIZE_UNITS[unit] == 0:
+            return f"{size // _SIZE_UNITS[unit]}{unit}"
+    return f"{size}B"
+
+def _zipf_weights(count, exponent=1.1):
+    """順位の exponent 乗に反比例する重み（自然言語の単語頻度に近い）"""
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+def _english_vocabulary(rng, size):
+    """英語風の語彙（よく使う単語 + 音節を組み合わせた単語）"""
+    words = list(_ENGLISH_COMMON)
+    seen = set(words)
+    while len(words) < size:
+        word = ''.join(rng.choice(_ENGLISH_SYLLABLES) for _ in range(rng.randint(1, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+def _japanese_vocabulary(rng, size):
+    """日本語風の語彙（基本語 + カタカナ語 + 漢字の熟語）"""
+    words = [word for word in BASIC_WORDS if len(word) > 1]
+    seen = set(words) | set(BASIC_WORDS)
+    while len(words) < size:
+        if rng.random() < 0.4:
+            word = ''.join(rng.choice(_KATAKANA) for _ in range(rng.randint(3, 6)))
+        else:
+            word = ''.join(rng.choice(_KANJI) for _ in range(rng.randint(2, 4)))
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+def generate_corpus(language='english', size=1024 * 1024, seed=42, vocabulary_size=50000):
+    """
+    再現可能な合成コーパスを作成
+    
+    同じ引数からは常に同じテキストが作られます。
+    
+    Args:
+        language (str): 'english' または 'japanese'
+        size (int): おおよそのサイズ（UTF-8のバイト数）
+        seed (int): 乱数のシード
+        vocabulary_size (int): 語彙数
+    
+    Returns:
+        tuple: (テキスト, 語彙のリスト)
+    """
+    rng = random.Random(f"{language}:{seed}")
+    if language == 'english':
+        vocabulary = _english_vocabulary(rng, vocabulary_size)
+        separators = [' '] * 12 + [', ', '. ', '! ', '? ', '.\n']
+    elif language == 'japanese':
+        vocabulary = _japanese_vocabulary(rng, vocabulary_size)
+        separators = _JAPANESE_PARTICLES * 2 + [ending + '。' for ending in _JAPANESE_ENDINGS] + ['、', '。\n']
+    else:
+        raise ValueError(f"未対応の言語です: {language}")
+    
+    cum_weights = list(accumulate(_zipf_weights(len(vocabulary))))
+    blocks = []
+    total = 0
+    while total < size:
+        words = rng.choices(vocabulary, cum_weights=cum_weights, k=BLOCK_WORDS)
+        endings = rng.choices(separators, k=BLOCK_WORDS)
+        block = ''.join(map(str.__add__, words, endings))
+        encoded_size = len(block.encode('utf-8'))
+        if total + encoded_size > size:
+            # 最後のブロックは必要な長さで切る（文字数の比率で近似）
+            block = block[:max(1, len(block) * (size - total) // encoded_size)]
+            encoded_size = len(block.encode('utf-8'))
+        blocks.append(block)
+        total += encoded_size
+    return ''.join(blocks), vocabulary
+
+def create_analyzer(language, vocabulary):
+    """言語に合わせて設定したアナライザーを作成"""
+    analyzer = AdvancedWordAnalyzer()
+    if language == 'japanese':
+        dictionary = build_dictionary(list(vocabulary) + BASIC_WORDS)
+        analyzer.word_splitter = JapaneseTokenizer(dictionary)
+    return analyzer
+
+def run_stages(analyzer, text, language, output_filename, trace_memory=False):
+    """
+    各段階を順番に実行して計測
+    
+    Returns:
+        dict: 段階名と {'seconds': 秒数, 'peak_bytes': ピーク使用量（trace_memory の場合）} の辞書
+    """
+    steps = [
+        ('preprocess_text', lambda: analyzer.preprocess_text(remove_stopwords=True, language=language)),
+        # 遅延評価の統計情報をここで計算する（export_analysis_to_json の時間に混ざらないように）
+        ('calculate_advanced_statistics', lambda: (analyzer.calculate_advanced_statistics(), dict(analyzer.stats))),
+        ('get_ngrams', lambda: (analyzer.get_ngrams(2), analyzer.get_ngrams(3))),
+        ('calculate_tf_idf', lambda: analyzer.calculate_tf_idf(top_k=10)),
+        ('export_analysis_to_json', lambda: analyzer.export_analysis_to_json(output_filename))
+    ]
+    
+    analyzer.text = text
+    results = {}
+    with redirect_stdout(io.StringIO()):
+        for name, step in steps:
+            if trace_memory:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            step()
+            elapsed = time.perf_counter() - start
+            results[name] = {'seconds': elapsed}
+            if trace_memory:
+                results[name]['peak_bytes'] = tracemalloc.get_traced_memory()[1] - base
+    return results
+
+def benchmark_corpus(language, size, seed=42, repeat=1, trace_memory=True):
+    """
+    1つのコーパスで全段階を計測
+    
+    Args:
+        language (str): コーパスの言語
+        size (int): コーパスのサイズ（バイト）
+        seed (int): 乱数のシード
+        repeat (int): 処理時間の計測回数（最小値を使う）
+        trace_memory (bool): メモリのピーク使用量も計測するか
+    
+    Returns:
+        dict: 計測結果
+    """
+    start = time.perf_counter()
+    text, vocabulary = generate_corpus(language, size, seed)
+    generate_seconds = time.perf_counter() - start
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    
+    output_filename = os.path.join(tempfile.mkdtemp(), 'analysis.json')
+    try:
+        timings = None
+        for _ in range(repeat):
+            analyzer = create_analyzer(language, vocabulary)
+            stages = run_stages(analyzer, text, language, output_filename)
+            if timings is None:
+                timings = stages
+            else:
+                for name, result in stages.items():
+                    timings[name]['seconds'] = min(timings[name]['seconds'], result['seconds'])
+        words = len(analyzer.words)
+        del analyzer  # メモリ計測の前に解放する
+        
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                memory = run_stages(create_analyzer(language, vocabulary), text, language, output_filename, True)
+            finally:
+                tracemalloc.stop()
+            for name, result in memory.items():
+                timings[name]['peak_bytes'] = result['peak_bytes']
+    finally:
+        if os.path.exists(output_filename):
+            os.remove(output_filename)
+        os.rmdir(os.path.dirname(output_filename))
+    
+    for result in timings.values():
+        result['mb_per_second'] = size_mb / result['seconds'] if result['seconds'] > 0 else None
+    
+    return {
+        'name': f"{language}-{format_size(size)}",
+        'language': language,
+        'size_bytes': size,
+        'seed': seed,
+        'words': words,
+        'generate_seconds': generate_seconds,
+        'total_seconds': sum(result['seconds'] for result in timings.values()),
+        'stages': {name: timings[name] for name in STAGES}
+    }
+
+def _git_revision():
+    """現在のコミット（取得できない場合は None）"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(languages, sizes, seed=42, repeat=1, trace_memory=True):
+    """
+    言語とサイズの組み合わせごとに計測してレポートを作成
+    
+    Returns:
+        dict: レポート（JSONに変換できる値）
+    """
+    report = {
+        'version': REPORT_VERSION,
+        'revision': _git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'results': []
+    }
+    for language in languages:
+        for size in sizes:
+            print(f"⏱️ {language} {format_size(size)} を計測中...", file=sys.stderr)
+            report['results'].append(benchmark_corpus(language, size, seed, repeat, trace_memory))
+    return report
+
+def compare_reports(baseline, current):
+    """
+    2つのレポートの同じコーパス・段階の処理時間とメモリを比較
+    
+    Returns:
+        list: (コーパス名, 段階名, 時間の比, メモリの比) のタプルのリスト（比は 今回/基準）
+    """
+    baseline_results = {result['name']: result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        base = baseline_results.get(result['name'])
+        if base is None:
+            continue
+        for stage in STAGES:
+            old, new = base['stages'].get(stage), result['stages'].get(stage)
+            if not old or not new:
+                continue
+            time_ratio = new['seconds'] / old['seconds'] if old['seconds'] > 0 else None
+            memory_ratio = None
+            if old.get('peak_bytes') and new.get('peak_bytes') is not None:
+                memory_ratio = new['peak_bytes'] / old['peak_bytes']
+            rows.append((result['name'], stage, time_ratio, memory_ratio))
+    return rows
+
+def print_report(report):
+    """レポートを表で表示"""
+    print("=" * 78)
+    print(f"{'コーパス':<16}{'段階':<32}{'秒数':>9}{'MB/s':>10}{'ピーク(MB)':>11}")
+    print("-" * 78)
+    for result in report['results']:
+        for stage in STAGES:
+            data = result['stages'][stage]
+            peak = f"{data['peak_bytes'] / (1024 * 1024):.1f}" if 'peak_bytes' in data else '-'
+            rate = f"{data['mb_per_second']:.2f}" if data['mb_per_second'] else '-'
+            print(f"{result['name']:<16}{stage:<32}{data['seconds']:>9.3f}{rate:>10}{peak:>11}")
+    print("=" * 78)
+
+def print_comparison(rows, baseline_revision):
+    """比較結果を表示（10%以上遅くなった段階に印を付ける）"""
+    print(f"\n📊 基準（{baseline_revision or '不明'}）との比較（今回/基準）")
+    print("=" * 70)
+    for name, stage, time_ratio, memory_ratio in rows:
+        mark = '⚠️' if time_ratio and time_ratio > 1.1 else '  '
+        time_text = f"{time_ratio:.2f}x" if time_ratio else '-'
+        memory_text = f"{memory_ratio:.2f}x" if memory_ratio else '-'
+        print(f"{mark} {name:<16}{stage:<32} 時間 {time_text:>7}  メモリ {memory_text:>7}")
+    print("=" * 70)
+
+def parse_arguments():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="単語解析のベンチマーク")
+    parser.add_argument('--sizes', nargs='+', default=['1MB', '10MB'],
+                        help="コーパスのサイズ（例: 1MB 10MB 100MB 1GB）")
+    parser.add_argument('--languages', nargs='+', default=['english', 'japanese'],
+                        choices=['english', 'japanese'], help='コーパスの言語')
+    parser.add_argument('--seed', type=int, default=42, help='乱数のシード')
+    parser.add_argument('--repeat', type=int, default=1, help='処理時間の計測回数（最小値を使う）')
+    parser.add_argument('--no-memory', action='store_true', help='メモリの計測を省略する')
+    parser.add_argument('-o', '--output', default='benchmark_report.json', help='レポート（JSON）の出力先')
+    parser.add_argument('--compare', help='比較する基準のレポート')
+    return parser.parse_args()
+
+def main():
+    """メイン関数"""
+    args = parse_arguments()
+    try:
+        sizes = [parse_size(size) for size in args.sizes]
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    
+    report = run_benchmarks(args.languages, sizes, args.seed, args.repeat, not args.no_memory)
+    print_report(report)
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, sort_keys=True)
+    print(f"✅ レポートを保存しました: {args.output}")
+    
+    if args.compare:
+        try:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"❌ 基準のレポートを読み込めません: {e}")
+            sys.exit(1)
+        print_comparison(compare_reports(baseline, report), baseline.get('revision'))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 文書間のTF-IDFと類似文書検索
+
+AdvancedWordAnalyzer.calculate_tf_idf は1つのテキストの文を文書として扱います。
+このモジュールの CorpusIndex はファイル1つを1文書として、多数の文書の
+TF-IDFベクトルを持ち、コサイン類似度で似ている文書を検索します。
+
+データ構造:
+- 単語の出現回数は CSR形式（文書ごとの開始位置・単語ID・回数の3つの配列）で保持
+- 単語ごとの転置インデックス（その単語を含む文書と回数）で、
+  検索語を1つでも含む文書だけのスコアを計算する（全文書との総当たりをしない）
+- IDFは文書を追加するたびに変わるため、回数だけを保存し、重みは検索時に計算
+
+学習ポイント:
+- 疎ベクトルの CSR（Compressed Sparse Row）形式
+- 転置インデックスによる検索
+- コサイン類似度と heapq による上位k件の取得
+- array.tofile / fromfile による配列の保存と読み込み
+
+使用方法:
+  python3 projects/04_word_analyzer/corpus_index.py build corpus/ --index corpus.idx
+  python3 projects/04_word_analyzer/corpus_index.py add new1.txt new2.txt --index corpus.idx
+  python3 projects/04_word_analyzer/corpus_index.py similar corpus/a.txt --index corpus.idx -k 5
+  python3 projects/04_word_analyzer/corpus_index.py query "python data analysis" --index corpus.idx
+"""
+
+import sys
+import json
+import math
+import heapq
+import argparse
+from array import array
+from pathlib import Path
+
+# 自作モジュールをインポート
+try:
+    from advanced_analyzer import AdvancedWordAnalyzer
+    from batch_analyzer import find_files
+    from file_input import iter_text_chunks
+except ImportError as e:
+    print(f"❌ モジュールのインポートエラー: {e}")
+    print("projects/04_word_analyzer/ にある advanced_analyzer.py と一緒に実行してください")
+    sys.exit(1)
+
+# 保存形式を変更したら値を増やす
+INDEX_VERSION = 1
+
+# 保存する配列（ファイル名, 属性名, 型コード）
+_ARRAY_FILES = [('doc_ptr.bin', 'doc_ptr', 'Q'), ('term_ids.bin', 'term_ids', 'I'), ('counts.bin', 'counts', 'I'),
+                ('doc_lengths.bin', 'doc_lengths', 'Q'), ('doc_freq.bin', 'doc_freq', 'I')]
+
+class CorpusIndex:
+    """文書ごとの単語の出現回数（CSR形式）と転置インデックスによる類似文書検索"""
+    
+    def __init__(self, remove_stopwords=True, language='english', word_splitter=None):
+        """
+        Args:
+            remove_stopwords (bool): ストップワードを除去するか
+            language (str): ストップワードの言語
+            word_splitter (callable): 単語分割器（AdvancedWordAnalyzer.word_splitter と同じ。None の場合は標準の分割）
+        """
+        self.remove_stopwords = remove_stopwords
+        self.language = language
+        self.word_splitter = word_splitter
+        self.analyzer = AdvancedWordAnalyzer()
+        self.analyzer.word_splitter = word_splitter
+        
+        self.names = []           # 文書ID -> 文書名
+        self.name_ids = {}        # 文書名 -> 文書ID
+        self.terms = []           # 単語ID -> 単語
+        self.term_ids_by_word = {}  # 単語 -> 単語ID
+        
+        # CSR形式: 文書 d の単語は term_ids[doc_ptr[d]:doc_ptr[d + 1]]（単語IDの順）
+        self.doc_ptr = array('Q', [0])
+        self.term_ids = array('I')
+        self.counts = array('I')
+        self.doc_lengths = array('Q')  # 文書ごとの単語数
+        self.doc_freq = array('I')     # 単語ごとの出現文書数
+        
+        # 転置インデックス（単語ID -> 文書IDの配列と回数の配列）
+        self.postings = []
+        
+        # 文書数が変わると作り直す値
+        self._idf = None
+        self._norms = None
+    
+    def __len__(self):
+        return len(self.names)
+    
+    def _term_counts(self, chunks):
+        """テキストの断片から単語の出現回数を数える"""
+        accumulator = self.analyzer.create_accumulator(self.remove_stopwords, self.language)
+        for chunk in chunks:
+            accumulator.feed(chunk)
+        accumulator.end_document()
+        return accumulator.word_count
+    
+    def add_document(self, name, text=None, filename=None):
+        """
+        文書を追加
+        
+        Args:
+            name (str): 文書名（重複不可）
+            text (str): 文書のテキスト
+            filename (str): テキストの代わりに読み込むファイル名
+        
+        Returns:
+            int: 文書ID
+        
+        Raises:
+            ValueError: 同じ名前の文書がすでにある場合
+        """
+        if name in self.name_ids:
+            raise ValueError(f"同じ名前の文書がすでにあります: {name}")
+        
+        chunks = iter_text_chunks(filename) if filename is not None else [text or '']
+        word_count = self._term_counts(chunks)
+        return self._add_counts(name, word_count)
+    
+    def add_file(self, filename):
+        """ファイルをファイル名を文書名として追加"""
+        return self.add_document(str(filename), filename=filename)
+    
+    def _add_counts(self, name, word_count):
+        """単語の出現回数を文書として追加"""
+        doc_id = len(self.names)
+        self.names.append(name)
+        self.name_ids[name] = doc_id
+        
+        entries = []
+        for word, count in word_count.items():
+            term_id = self.term_ids_by_word.get(word)
+            if term_id is None:
+                term_id = len(self.terms)
+                self.terms.append(word)
+                self.term_ids_by_word[word] = term_id
+                self.doc_freq.append(0)
+                self.postings.append((array('I'), array('I')))
+            entries.append((term_id, count))
+        entries.sort()
+        
+        for term_id, count in entries:
+            self.term_ids.append(term_id)
+            self.counts.append(count)
+            self.doc_freq[term_id] += 1
+            documents, counts = self.postings[term_id]
+            documents.append(doc_id)
+            counts.append(count)
+        self.doc_ptr.append(len(self.term_ids))
+        self.doc_lengths.append(sum(word_count.values()))
+        
+        self._idf = None
+        self._norms = None
+        return doc_id
+    
+    def _get_idf(self):
+        """単語ごとのIDF（log((1 + 文書数) / (1 + 出現文書数)) + 1。常に正の値）"""
+        if self._idf is None:
+            total = len(self.names)
+            self._idf = [math.log((1 + total) / (1 + df)) + 1 for df in self.doc_freq]
+        return self._idf
+    
+    def _get_norms(self):
+        """文書ごとのTF-IDFベクトルの長さ（CSRの配列を1回走査して計算）"""
+        if self._norms is None:
+            idf = self._get_idf()
+            norms = []
+            term_ids, counts, doc_ptr = self.term_ids, self.counts, self.doc_ptr
+            for doc_id, length in enumerate(self.doc_lengths):
+                total = 0.0
+                for i in range(doc_ptr[doc_id], doc_ptr[doc_id + 1]):
+                    weight = counts[i] / length * idf[term_ids[i]]
+                    total += weight * weight
+                norms.append(math.sqrt(total))
+            self._norms = norms
+        return self._norms
+    
+    def document_vector(self, name):
+        """
+        文書のTF-IDFベクトル
+        
+        Returns:
+            dict: 単語IDとTF-IDFの重み
+        """
+        doc_id = self.name_ids[name]
+        idf = self._get_idf()
+        length = self.doc_lengths[doc_id]
+        start, end = self.doc_ptr[doc_id], self.doc_ptr[doc_id + 1]
+        return {self.term_ids[i]: self.counts[i] / length * idf[self.term_ids[i]] for i in range(start, end)}
+    
+    def _text_vector(self, text):
+        """テキストのTF-IDFベクトル（索引にない単語は無視）"""
+        word_count = self._term_counts([text])
+        length = sum(word_count.values())
+        idf = self._get_idf()
+        vector = {}
+        for word, count in word_count.items():
+            term_id = self.term_ids_by_word.get(word)
+            if term_id is not None:
+                vector[term_id] = count / length * idf[term_id]
+        return vector
+    
+    def top_terms(self, name, k=10):
+        """
+        文書のTF-IDFが高い単語
+        
+        Returns:
+            list: (単語, TF-IDF) のタプルのリスト
+        """
+        vector = self.document_vector(name)
+        return [(self.terms[term_id], weight)
+                for term_id, weight in heapq.nlargest(k, vector.items(), key=lambda x: x[1])]
+    
+    def _search(self, vector, k, exclude=None):
+        """転置インデックスで、ベクトルとのコサイン類似度が高い文書を求める"""
+        query_norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        if query_norm == 0:
+            return []
+        
+        idf = self._get_idf()
+        norms = self._get_norms()
+        lengths = self.doc_lengths
+        scores = {}
+        for term_id, query_weight in vector.items():
+            factor = query_weight * idf[term_id]
+            documents, counts = self.postings[term_id]
+            for doc_id, count in zip(documents, counts):
+                scores[doc_id] = scores.get(doc_id, 0.0) + factor * count / lengths[doc_id]
+        
+        scores.pop(exclude, None)
+        best = heapq.nlargest(k, scores.items(), key=lambda x: x[1])
+        return [(self.names[doc_id], score / (query_norm * norms[doc_id])) for doc_id, score in best if norms[doc_id]]
+    
+    def similar_documents(self, name, k=10):
+        """
+        文書に似ている文書を検索（その文書自身は除く）
+        
+        Returns:
+            list: (文書名, コサイン類似度) のタプルのリスト（類似度の高い順）
+        """
+        return self._search(self.document_vector(name), k, exclude=self.name_ids[name])
+    
+    def search(self, text, k=10):
+        """
+        テキストに似ている文書を検索
+        
+        Returns:
+            list: (文書名, コサイン類似度) のタプルのリスト（類似度の高い順）
+        """
+        return self._search(self._text_vector(text), k)
+    
+    def save(self, directory):
+        """
+        索引をディレクトリに保存（配列はバイナリ、名前と単語はJSON）
+        
+        Args:
+            directory (str): 保存先のディレクトリ
+        """
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        for filename, attribute, _ in _ARRAY_FILES:
+            with open(path / filename, 'wb') as f:
+                getattr(self, attribute).tofile(f)
+        
+        meta = {
+            'version': INDEX_VERSION,
+            'byteorder': sys.byteorder,
+            'remove_stopwords': self.remove_stopwords,
+            'language': self.language,
+            'splitter': getattr(self.word_splitter, 'digest', None),
+            'names': self.names,
+            'terms': self.terms
+        }
+        # meta.json を最後に書き込む（読み込み時はこれを基準に配列の長さを確認する）
+        temp_path = path / 'meta.json.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, separators=(',', ':'))
+        temp_path.replace(path / 'meta.json')
+    
+    @classmethod
+    def load(cls, directory, word_splitter=None):
+        """
+        保存した索引を読み込む
+        
+        Args:
+            directory (str): 保存先のディレクトリ
+            word_splitter (callable): 保存時と同じ単語分割器（分割器は保存されないため指定する）
+        
+        Raises:
+            ValueError: 保存形式が異なる・ファイルが壊れている・単語分割器が異なる場合
+        """
+        path = Path(directory)
+        with open(path / 'meta.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != INDEX_VERSION:
+            raise ValueError(f"索引の保存形式が異なります: {directory}")
+        
+        # 検索する文も索引と同じ分割器で数えないと単語が一致しない
+        if meta.get('splitter') != getattr(word_splitter, 'digest', None):
+            raise ValueError(f"索引を作成したときと単語分割器が異なります: {directory}")
+        
+        index = cls(meta['remove_stopwords'], meta['language'], word_splitter)
+        index.names = meta['names']
+        index.name_ids = {name: doc_id for doc_id, name in enumerate(index.names)}
+        index.terms = meta['terms']
+        index.term_ids_by_word = {word: term_id for term_id, word in enumerate(index.terms)}
+        
+        for filename, attribute, typecode in _ARRAY_FILES:
+            values = array(typecode)
+            with open(path / filename, 'rb') as f:
+                values.frombytes(f.read())
+            if meta['byteorder'] != sys.byteorder:
+                values.byteswap()
+            setattr(index, attribute, values)
+        
+        if (len(index.doc_ptr) != len(index.names) + 1 or len(index.doc_freq) != len(index.terms)
+                or len(index.term_ids) != index.doc_ptr[-1] or len(index.counts) != len(index.term_ids)):
+            raise ValueError(f"索引のファイルが壊れています: {directory}")
+        
+        index._build_postings()
+        return index
+    
+    def _build_postings(self):
+        """CSRの配列から転置インデックスを作り直す"""
+        self.postings = [(array('I'), array('I')) for _ in self.terms]
+        term_ids, counts, doc_ptr = self.term_ids, self.counts, self.doc_ptr
+        for doc_id in range(len(self.names)):
+            for i in range(doc_ptr[doc_id], doc_ptr[doc_id + 1]):
+                documents, document_counts = self.postings[term_ids[i]]
+                documents.append(doc_id)
+                document_counts.append(counts[i])
+
+def parse_arguments():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="文書間のTF-IDFと類似文書検索")
+    parser.add_argument('command', choices=['build', 'add', 'similar', 'query', 'terms'],
+                        help='build: 作成, add: 追加, similar: 類似文書, query: テキストで検索, terms: 特徴語')
+    parser.add_argument('targets', nargs='+', help='ディレクトリ・ファイル・文書名・検索テキスト')
+    parser.add_argument('--index', default='corpus.idx', help='索引のディレクトリ')
+    parser.add_argument('--include', nargs='+', default=['*.txt'], help="対象にするファイルのパターン")
+    parser.add_argument('-k', type=int, default=10, help='表示する件数')
+    parser.add_argument('--language', default='english', help='ストップワードの言語')
+    return parser.parse_args()
+
+def main():
+    """メイン関数"""
+    args = parse_arguments()
+    
+    if args.command == 'build':
+        index = CorpusIndex(language=args.language)
+    else:
+        try:
+            index = CorpusIndex.load(args.index)
+        except (OSError, ValueError) as e:
+            print(f"❌ 索引を読み込めません: {e}")
+            sys.exit(1)
+    
+    if args.command in ('build', 'add'):
+        filenames = []
+        for target in args.targets:
+            filenames.extend(find_files(target, args.include))
+        added = 0
+        for filename in filenames:
+            try:
+                index.add_file(filename)
+                added += 1
+            except (OSError, UnicodeDecodeError, ValueError) as e:
+                print(f"❌ {filename}: {e}")
+        index.save(args.index)
+        print(f"✅ {added}件の文書を追加しました（合計{len(index)}件, 単語{len(index.terms):,}種類）: {args.index}")
+        return
+    
+    if args.command == 'query':
+        results = index.search(' '.join(args.targets), args.k)
+    else:
+        for name in args.targets:
+            if name not in index.name_ids:
+                print(f"❌ 索引にない文書です: {name}")
+                sys.exit(1)
+        if args.command == 'terms':
+            for name in args.targets:
+                print(f"\n📝 {name}")
+                for word, weight in index.top_terms(name, args.k):
+                    print(f"  {word:<20} {weight:.4f}")
+            return
+        results = index.similar_documents(args.targets[0], args.k)
+    
+    print("=" * 60)
+    for rank, (name, score) in enumerate(results, 1):
+        print(f"{rank:2d}. {score:.4f}  {name}")
+    print("=" * 60)
+
+if __name__ == "__main__":
+    main()
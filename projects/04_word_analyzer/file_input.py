@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: mmap によるファイル入力
+
+ファイルを mmap でメモリに対応付けて読み込みます。read() で読む場合と違い、
+ファイルの内容をバイト列としてコピーせず、OSのページキャッシュを直接
+参照するため、同じファイルを繰り返し解析するときも読み込みが速くなります。
+
+- read_text: ファイル全体を文字列に変換（バイト列のコピーを作らない）
+- iter_text_chunks: 対応付けた範囲を少しずつ文字列に変換（全文の文字列を作らない）
+
+UTF-8の文字の途中で区切らないよう、インクリメンタルデコーダーで変換します。
+改行（\\r\\n・\\r）は open() のテキストモードと同じく \\n に変換します。
+標準入力やパイプのように mmap を使えない入力は、通常の読み込みに切り替えます。
+
+学習ポイント:
+- mmap モジュールによるファイルのメモリ対応付け
+- codecs のインクリメンタルデコーダーによる文字境界の処理
+- 例外による代替処理（フォールバック）
+"""
+
+import io
+import sys
+import mmap
+import codecs
+from contextlib import contextmanager
+
+# 標準入力を表すファイル名
+STDIN_NAME = '-'
+
+# iter_text_chunks で1回に変換するバイト数
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+@contextmanager
+def open_mapped(filename):
+    """
+    ファイルを読み込み専用で mmap する
+    
+    Yields:
+        mmap: 対応付けたファイル（空のファイルや mmap を使えない入力の場合は None）
+    """
+    with open(filename, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            yield None  # 空のファイル・パイプ・特殊ファイルなど
+            return
+        try:
+            yield data
+        finally:
+            data.close()
+
+def read_text(filename, encoding='utf-8'):
+    """
+    ファイル全体を文字列として読み込む
+    
+    Args:
+        filename (str): ファイル名（'-' の場合は標準入力）
+        encoding (str): 文字コード
+    
+    Returns:
+        str: ファイルの内容
+    """
+    if filename == STDIN_NAME:
+        return sys.stdin.read()
+    
+    with open_mapped(filename) as data:
+        if data is not None:
+            text = str(data, encoding)
+            if '\r' in text:
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            return text
+    
+    # mmap を使えない入力（空のファイルを含む）は通常の方法で読み込む
+    with open(filename, 'r', encoding=encoding) as f:
+        return f.read()
+
+def iter_text_chunks(filename, chunk_size=DEFAULT_CHUNK_SIZE, encoding='utf-8'):
+    """
+    ファイルを少しずつ文字列に変換して返す
+    
+    mmap を使える場合は chunk_size バイトずつ、使えない場合は chunk_size 文字ずつ返します。
+    どちらの場合も文字の途中で区切られることはありません。
+    
+    Args:
+        filename (str): ファイル名（'-' の場合は標準入力）
+        chunk_size (int): 1回に変換するバイト数
+        encoding (str): 文字コード
+    
+    Yields:
+        str: テキストの断片
+    """
+    if filename == STDIN_NAME:
+        yield from _iter_stream_chunks(sys.stdin, chunk_size)
+        return
+    
+    with open_mapped(filename) as data:
+        if data is not None:
+            decoder = _new_decoder(encoding)
+            for start in range(0, len(data), chunk_size):
+                chunk = decoder.decode(data[start:start + chunk_size])
+                if chunk:
+                    yield chunk
+            chunk = decoder.decode(b'', final=True)
+            if chunk:
+                yield chunk
+            return
+    
+    with open(filename, 'r', encoding=encoding) as f:
+        yield from _iter_stream_chunks(f, chunk_size)
+
+def _new_decoder(encoding):
+    """文字の境界と改行（\\r\\n の区切れも含む）を処理するインクリメンタルデコーダー"""
+    return io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)(), translate=True)
+
+def _iter_stream_chunks(stream, chunk_size):
+    """テキストストリームから chunk_size 文字ずつ読み込む"""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 日本語の単語分割（辞書による最長一致・Viterbi）
+
+日本語は単語の間に空白がないため、正規表現の \\w+ だけでは
+「今日は良い天気です」が1つの「単語」になってしまいます。
+このモジュールは単語辞書を使って日本語の文字列を単語に分割します。
+
+- 最長一致法: 先頭から辞書にある最も長い単語を順に選ぶ
+- Viterbi法: 単語のコストの合計が最小になる分割を動的計画法で選ぶ
+
+辞書はあらかじめバイナリ形式に変換しておき、mmap で読み込むため、
+大きな辞書でも読み込みは数ミリ秒で終わります。
+
+学習ポイント:
+- 動的計画法（Viterbiアルゴリズム）による最適な分割
+- mmap と memoryview によるファイルの直接参照
+- ソート済み配列と二分探索（bisect）による前方一致検索
+
+使用方法:
+  python3 projects/04_word_analyzer/japanese_tokenizer.py --compile words.txt words.dic
+  python3 projects/04_word_analyzer/japanese_tokenizer.py --benchmark --dictionary words.dic
+  python3 projects/04_word_analyzer/japanese_tokenizer.py "今日は良い天気です"
+"""
+
+import os
+import re
+import sys
+import mmap
+import time
+import struct
+import random
+import hashlib
+import argparse
+import tempfile
+from bisect import bisect_left
+
+from text_tokenizer import WORD_PATTERN
+
+# 辞書ファイルの形式: ヘッダー（識別子・単語数・最長文字数）、
+# 単語の開始位置（単語数+1個の uint32）、コスト（単語数個の int32）、UTF-8の単語（バイト順にソート）
+DICTIONARY_MAGIC = b'JADIC001'
+_HEADER = struct.Struct('<8sII')
+
+# 単語のコスト（小さいほど選ばれやすい）
+DEFAULT_WORD_COST = 2000
+UNKNOWN_RUN_COST = 6000    # 辞書にないカタカナ・英数字の並び
+UNKNOWN_CHAR_COST = 10000  # 辞書にない漢字・ひらがな1文字
+
+# 検索結果を記録しておく文字列の数の上限
+LOOKUP_CACHE_SIZE = 200000
+
+_JAPANESE_CHAR_PATTERN = re.compile(r'[ぁ-ヿ㐀-䶿一-鿿豈-﫿]')
+
+# 動作確認用の基本的な単語（実際の解析には --compile で作成した辞書を使ってください）
+BASIC_WORDS = [
+    'は', 'が', 'を', 'に', 'で', 'と', 'の', 'も', 'へ', 'や', 'から', 'まで', 'より', 'だ', 'です', 'ます',
+    'でした', 'ました', 'ません', 'ない', 'た', 'て', 'する', 'した', 'して', 'います', 'いる', 'ある', 'あります',
+    'この', 'その', 'あの', 'これ', 'それ', 'あれ', 'ここ', 'そこ', 'とても', 'よく', 'まだ', 'もう',
+    '今日', '明日', '昨日', '今年', '天気', '良い', '悪い', '大きい', '小さい', '新しい', '楽しい', '難しい',
+    '日本', '日本語', '東京', '大阪', '京都', '学校', '学生', '先生', '会社', '仕事', '時間', '今', '人', '本',
+    '単語', '文章', '解析', '分析', '辞書', '形態素', '形態素解析', '自然', '言語', '自然言語', '処理', '自然言語処理',
+    'データ', 'プログラム', 'パイソン', 'コンピュータ', '行く', '来る', '見る', '読む', '書く', '話す', '使う', '思う'
+]
+
+def char_type(char):
+    """文字の種類（'kanji', 'hiragana', 'katakana', 'other'）"""
+    code = ord(char)
+    if 0x3041 <= code <= 0x309f:
+        return 'hiragana'
+    if 0x30a0 <= code <= 0x30ff:
+        return 'katakana'
+    if 0x3400 <= code <= 0x4dbf or 0x4e00 <= code <= 0x9fff or 0xf900 <= code <= 0xfaff:
+        return 'kanji'
+    return 'other'
+
+class _MappedWords:
+    """mmap上のソート済み単語を bisect で検索できるシーケンスとして扱うクラス"""
+    
+    def __init__(self, data, offsets, base):
+        """
+        Args:
+            data (mmap): 辞書ファイル
+            offsets (memoryview): 単語の開始位置（単語数+1個）
+            base (int): 単語部分の先頭のファイル内の位置
+        """
+        self.data = data
+        self.offsets = offsets
+        self.base = base
+    
+    def __len__(self):
+        return len(self.offsets) - 1
+    
+    def __getitem__(self, index):
+        base = self.base
+        return self.data[base + self.offsets[index]:base + self.offsets[index + 1]]
+
+class WordDictionary:
+    """バイト順にソートされた単語とコストの辞書"""
+    
+    def __init__(self, words, costs, max_length, digest=None, closer=None):
+        """
+        Args:
+            words (sequence): UTF-8でエンコードしたソート済みの単語
+            costs (sequence): 単語ごとのコスト
+            max_length (int): 最も長い単語の文字数
+            digest (str): 辞書の内容を表す文字列
+            closer (callable): close() で呼び出す後片付けの関数
+        """
+        self.words = words
+        self.costs = costs
+        self.max_length = max_length
+        self.digest = digest
+        self._closer = closer
+        self._lookups = {}  # 文字列 -> (コスト（辞書にない場合は None）, より長い単語があるか)
+    
+    def __len__(self):
+        return len(self.words)
+    
+    def prefix_matches(self, text, start):
+        """
+        text[start:] の先頭に一致する辞書の単語を短い順に返す
+        
+        Returns:
+            list: (文字数, コスト) のタプルのリスト
+        """
+        lookups = self._lookups
+        matches = []
+        for length in range(1, min(self.max_length, len(text) - start) + 1):
+            key = text[start:start + length]
+            result = lookups.get(key)
+            if result is None:
+                result = self._search(key)
+            cost, has_longer = result
+            if cost is not None:
+                matches.append((length, cost))
+            if not has_longer:
+                break  # この文字列で始まるより長い単語がない
+        return matches
+    
+    def _search(self, key):
+        """二分探索で文字列を検索し、結果を記録する"""
+        if len(self._lookups) >= LOOKUP_CACHE_SIZE:
+            self._lookups.clear()
+        
+        encoded = key.encode('utf-8')
+        words = self.words
+        index = bisect_left(words, encoded)
+        cost = None
+        if index < len(words) and words[index] == encoded:
+            cost = self.costs[index]
+            index += 1
+        has_longer = index < len(words) and words[index].startswith(encoded)
+        self._lookups[key] = result = (cost, has_longer)
+        return result
+    
+    def close(self):
+        """mmapで開いたファイルを閉じる"""
+        if self._closer is not None:
+            self._closer()
+            self._closer = None
+
+def _sorted_entries(entries):
+    """(単語, コスト) をUTF-8のバイト順にソートし、重複は最小コストにまとめる"""
+    merged = {}
+    for word, cost in entries:
+        key = word.lower().encode('utf-8')
+        if key and (key not in merged or cost < merged[key]):
+            merged[key] = cost
+    return sorted(merged.items())
+
+def build_dictionary(words=None):
+    """
+    メモリ上に辞書を作成
+    
+    Args:
+        words (iterable): 単語、または (単語, コスト) のタプル（省略時は BASIC_WORDS）
+    
+    Returns:
+        WordDictionary: 作成した辞書
+    """
+    entries = [(word, DEFAULT_WORD_COST) if isinstance(word, str) else word
+               for word in (BASIC_WORDS if words is None else words)]
+    items = _sorted_entries(entries)
+    keys = [key for key, _ in items]
+    digest = hashlib.sha256(b'\n'.join(key + b'\t' + str(cost).encode() for key, cost in items)).hexdigest()
+    max_length = max((len(key.decode('utf-8')) for key in keys), default=0)
+    return WordDictionary(keys, [cost for _, cost in items], max_length, digest)
+
+def read_word_list(filename):
+    """
+    単語リスト（1行に1語。タブ区切りでコストを指定可能）を読み込む
+    
+    Returns:
+        list: (単語, コスト) のタプルのリスト
+    """
+    entries = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            word, _, cost = line.partition('\t')
+            entries.append((word, int(cost) if cost else DEFAULT_WORD_COST))
+    return entries
+
+def compile_dictionary(entries, output_filename):
+    """
+    単語とコストをバイナリ形式の辞書ファイルに変換
+    
+    Args:
+        entries (iterable): (単語, コスト) のタプル
+        output_filename (str): 出力する辞書ファイル名
+    
+    Returns:
+        int: 辞書の単語数
+    """
+    items = _sorted_entries(entries)
+    offsets = [0]
+    for key, _ in items:
+        offsets.append(offsets[-1] + len(key))
+    max_length = max((len(key.decode('utf-8')) for key, _ in items), default=0)
+    
+    with open(output_filename, 'wb') as f:
+        f.write(_HEADER.pack(DICTIONARY_MAGIC, len(items), max_length))
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        f.write(struct.pack(f'<{len(items)}i', *(cost for _, cost in items)))
+        for key, _ in items:
+            f.write(key)
+    return len(items)
+
+def load_dictionary(filename):
+    """
+    バイナリ形式の辞書ファイルを mmap で読み込む（内容はアクセスしたときに読まれる）
+    
+    Args:
+        filename (str): 辞書ファイル名
+    
+    Returns:
+        WordDictionary: 読み込んだ辞書
+    
+    Raises:
+        ValueError: 辞書ファイルの形式が正しくない場合
+    """
+    f = open(filename, 'rb')
+    try:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        f.close()
+        raise ValueError(f"辞書ファイルが空です: {filename}")
+    
+    magic, count, max_length = _HEADER.unpack_from(data, 0)
+    if magic != DICTIONARY_MAGIC:
+        data.close()
+        f.close()
+        raise ValueError(f"辞書ファイルの形式が正しくありません: {filename}")
+    
+    view = memoryview(data)
+    offsets_start = _HEADER.size
+    costs_start = offsets_start + (count + 1) * 4
+    words_start = costs_start + count * 4
+    offsets = view[offsets_start:costs_start].cast('I')
+    costs = view[costs_start:words_start].cast('i')
+    words = _MappedWords(data, offsets, words_start)
+    
+    def closer():
+        offsets.release()
+        costs.release()
+        view.release()
+        data.close()
+        f.close()
+    
+    stat = os.stat(filename)
+    digest = f"{os.path.abspath(filename)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return WordDictionary(words, costs, max_length, digest, closer)
+
+class JapaneseTokenizer:
+    """
+    辞書を使って日本語を単語に分割するトークナイザー
+    
+    インスタンスはテキストを単語リストに変換する関数として使えます
+    （アナライザーの word_splitter に設定します）。日本語を含まない
+    \\w+ の並びはそのまま1語として扱います。
+    """
+    
+    def __init__(self, dictionary=None, mode='viterbi'):
+        """
+        Args:
+            dictionary (WordDictionary): 単語辞書（省略時は BASIC_WORDS の辞書）
+            mode (str): 'viterbi'（コスト最小）または 'longest'（最長一致）
+        """
+        if mode not in ('viterbi', 'longest'):
+            raise ValueError(f"不明な分割方法です: {mode}")
+        self.dictionary = dictionary if dictionary is not None else build_dictionary()
+        self.mode = mode
+        self.digest = f"{mode}:{self.dictionary.digest}"
+    
+    def __call__(self, text):
+        """テキストを単語リストに変換（text_tokenizer.tokenize の splitter として使う）"""
+        words = []
+        segment = self.segment_viterbi if self.mode == 'viterbi' else self.segment_longest
+        for run in WORD_PATTERN.findall(text):
+            if _JAPANESE_CHAR_PATTERN.search(run):
+                words.extend(segment(run))
+            else:
+                words.append(run)
+        return words
+    
+    def _unknown_length(self, text, start):
+        """辞書にない単語として扱う長さ（カタカナ・英数字は同じ種類の並び、それ以外は1文字）"""
+        kind = char_type(text[start])
+        if kind in ('kanji', 'hiragana'):
+            return 1, UNKNOWN_CHAR_COST
+        end = start + 1
+        while end < len(text) and char_type(text[end]) == kind:
+            end += 1
+        return end - start, UNKNOWN_RUN_COST
+    
+    def segment_longest(self, text):
+        """最長一致法で分割"""
+        words = []
+        start = 0
+        while start < len(text):
+            matches = self.dictionary.prefix_matches(text, start)
+            length = matches[-1][0] if matches else self._unknown_length(text, start)[0]
+            words.append(text[start:start + length])
+            start += length
+        return words
+    
+    def segment_viterbi(self, text):
+        """Viterbi法（単語のコストの合計が最小になる分割）で分割"""
+        size = len(text)
+        best_cost = [0] + [float('inf')] * size
+        best_start = [0] * (size + 1)
+        
+        for start in range(size):
+            base = best_cost[start]
+            if base == float('inf'):
+                continue
+            candidates = self.dictionary.prefix_matches(text, start)
+            candidates.append(self._unknown_length(text, start))
+            for length, cost in candidates:
+                end = start + length
+                if base + cost < best_cost[end]:
+                    best_cost[end] = base + cost
+                    best_start[end] = start
+        
+        # 終端から最適な分割をたどる
+        words = []
+        end = size
+        while end > 0:
+            start = best_start[end]
+            words.append(text[start:end])
+            end = start
+        words.reverse()
+        return words
+
+def _random_word(rng, length):
+    """ベンチマーク用のランダムな日本語の単語"""
+    pools = ['あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん',
+             'アイウエオカキクケコサシスセソタチツテトナニヌネノハヒフヘホマミムメモヤユヨラリルレロワン',
+             '日本語学生先会社時間自然言語処理分析辞書文章単東京大阪京都新旧高低長短春夏秋冬山川海空']
+    pool = rng.choice(pools)
+    return ''.join(rng.choice(pool) for _ in range(length))
+
+def benchmark(dictionary_filename=None, corpus_mb=5, dictionary_size=200000, seed=42):
+    """
+    辞書の読み込み時間と分割速度を計測
+    
+    辞書を指定しない場合は、ランダムな単語で作成した大きな辞書と
+    その単語を並べたコーパスで計測します。
+    
+    Returns:
+        dict: 計測結果
+    """
+    rng = random.Random(seed)
+    temp_dir = None
+    if dictionary_filename is None:
+        temp_dir = tempfile.mkdtemp()
+        dictionary_filename = os.path.join(temp_dir, 'benchmark.dic')
+        entries = [(_random_word(rng, rng.randint(1, 6)), rng.randint(1000, 4000)) for _ in range(dictionary_size)]
+        entries += [(word, DEFAULT_WORD_COST) for word in BASIC_WORDS]
+        compile_dictionary(entries, dictionary_filename)
+    
+    start = time.perf_counter()
+    dictionary = load_dictionary(dictionary_filename)
+    load_ms = (time.perf_counter() - start) * 1000
+    
+    # 辞書の単語と助詞を並べたコーパス
+    sample = [dictionary.words[rng.randrange(len(dictionary))].decode('utf-8') for _ in range(5000)]
+    particles = ['は', 'が', 'を', 'に', 'で', 'と', 'の', 'です。', 'ます。\n']
+    pieces = []
+    size = 0
+    while size < corpus_mb * 1024 * 1024:
+        piece = rng.choice(sample) + rng.choice(particles)
+        pieces.append(piece)
+        size += len(piece.encode('utf-8'))
+    corpus = ''.join(pieces)
+    
+    results = {'dictionary_words': len(dictionary), 'load_ms': load_ms, 'corpus_mb': size / (1024 * 1024)}
+    for mode in ('longest', 'viterbi'):
+        tokenizer = JapaneseTokenizer(dictionary, mode)
+        start = time.perf_counter()
+        words = tokenizer(corpus)
+        elapsed = time.perf_counter() - start
+        results[mode] = {'seconds': elapsed, 'mb_per_second': results['corpus_mb'] / elapsed, 'words': len(words)}
+    
+    dictionary.close()
+    if temp_dir is not None:
+        os.remove(dictionary_filename)
+        os.rmdir(temp_dir)
+    return results
+
+def parse_arguments():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="辞書による日本語の単語分割")
+    parser.add_argument('text', nargs='?', help='分割するテキスト')
+    parser.add_argument('--dictionary', help='バイナリ形式の辞書ファイル')
+    parser.add_argument('--mode', choices=['viterbi', 'longest'], default='viterbi', help='分割方法')
+    parser.add_argument('--compile', nargs=2, metavar=('WORD_LIST', 'OUTPUT'),
+                        help='単語リスト（1行に1語、タブ区切りでコスト）を辞書ファイルに変換')
+    parser.add_argument('--benchmark', action='store_true', help='読み込み時間と分割速度を計測')
+    parser.add_argument('--corpus-mb', type=float, default=5, help='ベンチマークのコーパスサイズ（MB）')
+    return parser.parse_args()
+
+def main():
+    """メイン関数"""
+    args = parse_arguments()
+    
+    if args.compile:
+        source, output = args.compile
+        count = compile_dictionary(read_word_list(source), output)
+        print(f"✅ 辞書を作成しました: {output}（{count:,}語）")
+        return
+    
+    if args.benchmark:
+        results = benchmark(args.dictionary, args.corpus_mb)
+        print("⏱️ 日本語トークナイザーの計測")
+        print("=" * 50)
+        print(f"辞書:         {results['dictionary_words']:,}語（読み込み {results['load_ms']:.2f}ms）")
+        print(f"コーパス:     {results['corpus_mb']:.1f} MB")
+        for mode in ('longest', 'viterbi'):
+            result = results[mode]
+            print(f"{mode:<12}  {result['mb_per_second']:.2f} MB/s（{result['words']:,}語, {result['seconds']:.2f}秒）")
+        print("=" * 50)
+        return
+    
+    if not args.text:
+        print("❌ 分割するテキストを指定してください")
+        sys.exit(1)
+    
+    dictionary = load_dictionary(args.dictionary) if args.dictionary else None
+    tokenizer = JapaneseTokenizer(dictionary, args.mode)
+    print(' / '.join(tokenizer(args.text.lower())))
+
+if __name__ == "__main__":
+    main()
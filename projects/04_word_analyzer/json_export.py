@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 解析結果のストリーミングJSON出力
+
+解析結果を項目（セクション）ごとに順番にファイルへ書き出します。
+全体を1つの辞書や文字列にまとめないため、語彙全体の出現回数のような
+大きな表も、表の要素を1つずつ変換しながら出力できます。
+
+出力形式:
+- pretty: インデント付きのJSON（json.dump(..., indent=2) と同じ内容・書式）
+- compact: 空白を含まない1行のJSON
+- jsonl: 1行に1つのJSON（セクションの値、または表の要素ごとに1行）
+
+表は StreamedList（リストとして出力）・StreamedDict（辞書として出力）で
+包むと、要素を取り出しながら出力します。
+
+学習ポイント:
+- ジェネレータによる逐次出力
+- json.dumps の indent・separators による書式の制御
+- JSON Lines 形式
+"""
+
+import json
+from itertools import islice
+
+# 出力形式
+EXPORT_FORMATS = ('pretty', 'compact', 'jsonl')
+
+# 表の要素をまとめて変換する件数（変換の呼び出し回数を減らす）
+CHUNK_ITEMS = 1000
+
+class StreamedList:
+    """要素を1つずつ出力する表（JSONの配列になる）"""
+    
+    def __init__(self, items):
+        """
+        Args:
+            items (iterable): 配列の要素
+        """
+        self.items = items
+
+class StreamedDict:
+    """要素を1つずつ出力する表（JSONのオブジェクトになる）"""
+    
+    def __init__(self, items):
+        """
+        Args:
+            items (iterable): (キー, 値) のタプル
+        """
+        self.items = items
+
+def check_format(format):
+    """
+    出力形式を確認（ファイルを開く前に呼ぶと、不明な形式で既存のファイルを消さずに済む）
+    
+    Raises:
+        ValueError: 出力形式が不明な場合
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"不明な出力形式です: {format}（{', '.join(EXPORT_FORMATS)} のいずれか）")
+
+def write_sections(stream, sections, format='pretty'):
+    """
+    セクションを順番にJSONとして書き出す
+    
+    Args:
+        stream (file): 出力先（テキストモード）
+        sections (iterable): (セクション名, 値) のタプル。値が StreamedList・StreamedDict の
+            場合は要素を1つずつ書き出す
+        format (str): 'pretty'・'compact'・'jsonl'
+    
+    Raises:
+        ValueError: 出力形式が不明な場合
+    """
+    check_format(format)
+    if format == 'jsonl':
+        _write_json_lines(stream, sections)
+    else:
+        _write_document(stream, sections, pretty=format == 'pretty')
+
+def _iter_chunks(items):
+    """要素を CHUNK_ITEMS 件ずつのリストにまとめる"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, CHUNK_ITEMS))
+        if not chunk:
+            return
+        yield chunk
+
+def _write_document(stream, sections, pretty):
+    """1つのJSONオブジェクトとして書き出す"""
+    if pretty:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+        key_separator, indent = ': ', '\n  '
+    else:
+        # インデントなしの場合はC実装のエンコーダーが使われる
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        key_separator, indent = ':', ''
+    
+    def dumps(value):
+        """セクションの値を1段インデントして変換"""
+        return encoder.encode(value).replace('\n', indent) if pretty else encoder.encode(value)
+    
+    stream.write('{')
+    empty = True
+    for name, value in sections:
+        stream.write(('' if empty else ',') + indent + encoder.encode(name) + key_separator)
+        empty = False
+        if isinstance(value, (StreamedList, StreamedDict)):
+            _write_table(stream, value, dumps, indent)
+        else:
+            stream.write(dumps(value))
+    stream.write(('' if empty or not pretty else '\n') + '}')
+
+def _write_table(stream, table, dumps, indent):
+    """
+    表を CHUNK_ITEMS 件ずつ変換して書き出す
+    
+    まとめて変換した配列（オブジェクト）から前後の括弧を除いた部分をつなげるため、
+    出力は表全体を一度に変換した場合と同じになります。
+    """
+    is_list = isinstance(table, StreamedList)
+    opening, closing = ('[', ']') if is_list else ('{', '}')
+    stream.write(opening)
+    empty = True
+    for chunk in _iter_chunks(table.items):
+        text = dumps(chunk if is_list else dict(chunk))
+        stream.write(('' if empty else ',') + text[1:len(text) - 1 - len(indent)])
+        empty = False
+    stream.write(('' if empty else indent) + closing)
+
+def _write_json_lines(stream, sections):
+    """
+    JSON Lines として書き出す
+    
+    通常の値は {"section": 名前, "value": 値}、StreamedList の要素は
+    {"section": 名前, "value": 要素}、StreamedDict の要素は
+    {"section": 名前, "key": キー, "value": 値} の1行になります。
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    
+    for name, value in sections:
+        if isinstance(value, StreamedList):
+            for chunk in _iter_chunks(value.items):
+                stream.write(''.join([encode({'section': name, 'value': item}) + '\n' for item in chunk]))
+        elif isinstance(value, StreamedDict):
+            for chunk in _iter_chunks(value.items):
+                stream.write(''.join([encode({'section': name, 'key': key, 'value': item_value}) + '\n'
+                                      for key, item_value in chunk]))
+        else:
+            stream.write(encode({'section': name, 'value': value}) + '\n')
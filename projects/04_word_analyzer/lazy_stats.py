@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 必要になったときに計算する統計情報
+
+LazyStats は辞書と同じように使える統計情報のマッピングです。
+各指標は初めて参照したときに計算してキャッシュし、元になる値が変わったときは
+invalidate() でその値に依存する指標だけを破棄します。
+type_token_ratio だけを参照する場合、読みやすさスコアや感情スコアは計算されません。
+
+学習ポイント:
+- collections.abc.Mapping による辞書風のクラス
+- 遅延評価とキャッシュ
+- 依存関係をたどったキャッシュの無効化
+"""
+
+from collections.abc import Mapping
+
+class LazyStats(Mapping):
+    """初めて参照したときに計算してキャッシュする統計情報"""
+    
+    def __init__(self, definitions):
+        """
+        Args:
+            definitions (dict): 指標名と (計算する関数, 依存する値の名前のタプル) の辞書。
+                関数はこのオブジェクトを受け取り、他の指標を参照できる
+        """
+        self.definitions = definitions
+        self.values = {}
+    
+    def __getitem__(self, name):
+        if name in self.values:
+            return self.values[name]
+        
+        function, _ = self.definitions[name]
+        value = self.values[name] = function(self)
+        return value
+    
+    def __iter__(self):
+        return iter(self.definitions)
+    
+    def __len__(self):
+        return len(self.definitions)
+    
+    def __repr__(self):
+        pending = [name for name in self.definitions if name not in self.values]
+        return f"LazyStats({self.values!r}, pending={pending!r})"
+    
+    def computed(self):
+        """計算済みの指標だけの辞書"""
+        return dict(self.values)
+    
+    def to_dict(self):
+        """すべての指標を計算した辞書（JSON出力用）"""
+        return {name: self[name] for name in self.definitions}
+    
+    def invalidate(self, *names):
+        """
+        値が変わったときに、それに依存する計算済みの指標を破棄
+        
+        Args:
+            *names: 変わった値・指標の名前（省略した場合はすべて破棄）
+        """
+        if not names:
+            self.values.clear()
+            return
+        
+        changed = set(names)
+        grew = True
+        while grew:
+            grew = False
+            for name, (_, dependencies) in self.definitions.items():
+                if name not in changed and changed.intersection(dependencies):
+                    changed.add(name)
+                    grew = True
+        
+        for name in changed:
+            self.values.pop(name, None)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 辞書（レキシコン）の高速照合
+
+「not good」「very bad」のような複数語のフレーズを含む大きな辞書を
+Aho-Corasick オートマトンに変換し、単語列を1回走査するだけで
+すべてのフレーズの出現を見つけます。
+
+辞書ファイルの形式（1行に1フレーズ、タブ区切りでスコア。# で始まる行はコメント）:
+    good	1
+    not good	-1
+    very bad	-2
+
+学習ポイント:
+- トライ木と失敗リンクによる Aho-Corasick 法
+- 幅優先探索（collections.deque）による失敗リンクの構築
+- 重ならない最長一致の選び方
+"""
+
+import json
+import time
+import pickle
+import hashlib
+import random
+from pathlib import Path
+from collections import deque
+
+from text_tokenizer import tokenize
+from analysis_cache import hash_file
+
+# 読み込み済みの辞書（ファイル内容のハッシュ値 -> PhraseLexicon）
+_loaded_lexicons = {}
+
+class PhraseLexicon:
+    """フレーズとスコアの辞書を Aho-Corasick オートマトンにまとめたクラス"""
+    
+    def __init__(self, phrases, digest=None):
+        """
+        Args:
+            phrases (dict): 単語のタプルとスコアの辞書（例: {('not', 'good'): -1.0}）
+            digest (str): 辞書の内容を表す文字列（キャッシュのキーに使う。省略時は内容から計算）
+        """
+        if digest is None:
+            content = json.dumps(sorted([list(phrase), score] for phrase, score in phrases.items()), ensure_ascii=False)
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self.digest = digest
+        self.size = len(phrases)
+        self.max_length = max((len(phrase) for phrase in phrases), default=0)
+        self.word_scores = {phrase[0]: score for phrase, score in phrases.items() if len(phrase) == 1}
+        
+        # 状態ごとの遷移・失敗リンク・出力（(フレーズの長さ, スコア) のタプル）
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        self._build(phrases)
+    
+    def _build(self, phrases):
+        """トライ木を作り、幅優先探索で失敗リンクを設定"""
+        goto = self.goto
+        for phrase, score in phrases.items():
+            state = 0
+            for word in phrase:
+                next_state = goto[state].get(word)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][word] = next_state
+                    goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] = ((len(phrase), score),)
+        
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in goto[state].items():
+                queue.append(next_state)
+                
+                # 失敗リンク: 最も長く一致する接尾辞の状態
+                fallback = self.fail[state]
+                while fallback and word not in goto[fallback]:
+                    fallback = self.fail[fallback]
+                link = goto[fallback].get(word, 0)
+                self.fail[next_state] = link
+                
+                # 失敗リンク先で見つかるフレーズも出力に含める（長い順）
+                if self.output[link]:
+                    self.output[next_state] = self.output[next_state] + self.output[link]
+    
+    def iter_matches(self, words, start=0):
+        """
+        words[start:] に出現するすべてのフレーズを返す
+        
+        Yields:
+            tuple: (開始位置, 終了位置（この位置は含まない）, スコア)
+        """
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        
+        for end, word in enumerate(words[start:] if start else words, start + 1):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for length, score in output[state]:
+                yield end - length, end, score
+    
+    def find_matches(self, words, start=0, free=0):
+        """
+        重ならない最長一致（左から順に、その位置から始まる最も長いフレーズ）を求める
+        
+        Args:
+            words (list): 単語列
+            start (int): 照合を始める位置
+            free (int): この位置より前から始まる一致は選ばない（直前の一致の終了位置）
+        
+        Returns:
+            list: (開始位置, 終了位置, スコア) のタプルのリスト（開始位置の順）
+        """
+        longest = {}
+        for match_start, match_end, score in self.iter_matches(words, start):
+            best = longest.get(match_start)
+            if best is None or match_end > best[0]:
+                longest[match_start] = (match_end, score)
+        
+        matches = []
+        for match_start in sorted(longest):
+            if match_start < free:
+                continue
+            match_end, score = longest[match_start]
+            matches.append((match_start, match_end, score))
+            free = match_end
+        return matches
+    
+    def score(self, words):
+        """
+        単語列のポジティブ・ネガティブの合計スコアを計算
+        
+        Returns:
+            tuple: (ポジティブの合計, ネガティブの合計（正の値）)
+        """
+        return sum_scores(self.find_matches(words))
+
+def sum_scores(matches):
+    """一致のリストからポジティブ・ネガティブの合計スコアを求める"""
+    positive = 0
+    negative = 0
+    for _, _, score in matches:
+        if score > 0:
+            positive += score
+        elif score < 0:
+            negative -= score
+    return positive, negative
+
+def read_lexicon_file(filename, stopwords=(), min_length=1, splitter=None):
+    """
+    辞書ファイルを読み込む
+    
+    フレーズは照合する単語列と同じ規則（ストップワード・最小文字数・単語分割器）で
+    単語に分割します（例: ストップワード the を除くと「the worst」は ('worst',)）。
+    分割後に同じになるフレーズは後の行のスコアを使い、単語が残らないフレーズは無視します。
+    
+    Args:
+        filename (str): 辞書ファイル名（フレーズ<TAB>スコア の形式）
+        stopwords (set): フレーズから除く単語の集合
+        min_length (int): フレーズに残す単語の最小文字数
+        splitter (callable): 単語分割器（省略時は \\w+ の並び）
+    
+    Returns:
+        dict: 単語のタプルとスコアの辞書
+    
+    Raises:
+        ValueError: スコアが数値でない行がある場合
+    """
+    phrases = {}
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            phrase, _, score = line.rpartition('\t')
+            if not phrase:
+                raise ValueError(f"{filename}:{line_number}: フレーズとスコアをタブで区切ってください")
+            try:
+                value = float(score)
+            except ValueError:
+                raise ValueError(f"{filename}:{line_number}: スコアが数値ではありません: {score}")
+            
+            words = tuple(tokenize(phrase, stopwords, min_length, splitter))
+            if words:
+                phrases[words] = int(value) if value.is_integer() else value
+    return phrases
+
+def load_lexicon(filename, cache_dir=None, stopwords=(), min_length=1, splitter=None):
+    """
+    辞書ファイルを読み込んでオートマトンに変換
+    
+    内容が同じファイルは、このプロセスで変換済みのものを再利用します。
+    cache_dir を指定すると変換結果をpickleで保存し、次回以降の実行でも再利用します
+    （pickleは信頼できるファイルだけを読み込むため、自分で作ったディレクトリを指定してください）。
+    
+    Args:
+        filename (str): 辞書ファイル名
+        cache_dir (str): 変換結果を保存するディレクトリ
+        stopwords, min_length, splitter: フレーズの分割の規則（read_lexicon_file と同じ）
+    
+    Returns:
+        PhraseLexicon: 変換済みの辞書
+    """
+    options = {'kind': 'lexicon', 'stopwords': sorted(stopwords), 'min_length': min_length,
+               'splitter': getattr(splitter, 'digest', None)}
+    digest = hash_file(filename, options)
+    lexicon = _loaded_lexicons.get(digest)
+    if lexicon is not None:
+        return lexicon
+    
+    cache_path = Path(cache_dir) / f"lexicon-{digest}.pickle" if cache_dir else None
+    if cache_path and cache_path.exists():
+        with open(cache_path, 'rb') as f:
+            lexicon = pickle.load(f)
+    else:
+        lexicon = PhraseLexicon(read_lexicon_file(filename, stopwords, min_length, splitter), digest)
+        if cache_path:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(lexicon, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    _loaded_lexicons[digest] = lexicon
+    return lexicon
+
+def main():
+    """照合速度の計測例"""
+    random.seed(42)
+    vocabulary = [''.join(random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(random.randint(3, 9)))
+                  for _ in range(50000)]
+    phrases = {}
+    for _ in range(200000):
+        phrase = tuple(random.sample(vocabulary, random.randint(1, 3)))
+        phrases[phrase] = random.choice([-2, -1, 1, 2])
+    phrases[('not', 'good')] = -1
+    phrases[('good',)] = 1
+    
+    start = time.perf_counter()
+    lexicon = PhraseLexicon(phrases)
+    build_time = time.perf_counter() - start
+    
+    words = [random.choice(vocabulary) for _ in range(1000000)] + ['not', 'good', 'good']
+    start = time.perf_counter()
+    positive, negative = lexicon.score(words)
+    match_time = time.perf_counter() - start
+    
+    print("🔎 辞書照合の計測")
+    print("=" * 40)
+    print(f"フレーズ数:   {lexicon.size:,}")
+    print(f"変換時間:     {build_time:.2f}秒")
+    print(f"照合速度:     {len(words) / match_time / 1e6:.2f}M語/秒")
+    print(f"スコア:       +{positive} / -{negative}")
+    print("=" * 40)
+
+if __name__ == "__main__":
+    main()
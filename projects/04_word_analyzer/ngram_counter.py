@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: ストリーミングN-gramカウンター
+
+N-gramのリストを作らずにスライディングウィンドウで数える関数と、
+単語を整数IDに置き換えて省メモリに数えるクラス、
+決まった件数のメモリで上位のN-gramを近似的に求める
+Space-Saving アルゴリズムの実装です。
+
+学習ポイント:
+- itertools.islice と zip によるスライディングウィンドウ
+- ビット演算で複数の整数を1つの整数に詰める方法
+- ストリームアルゴリズム（Space-Saving）による近似集計
+"""
+
+import heapq
+from collections import Counter
+from itertools import islice
+
+# 1単語のIDに使うビット数（約43億語まで）
+ID_BITS = 32
+
+def iter_ngrams(words, n):
+    """
+    N-gramのタプルを順番に返す（途中のリストを作らない）
+    
+    Args:
+        words (iterable): 単語の並び（リストまたはイテレータ）
+        n (int): N-gramのサイズ
+    
+    Returns:
+        iterator: N-gramのタプルのイテレータ
+    """
+    if isinstance(words, (list, tuple)):
+        return zip(*(islice(words, i, None) for i in range(n)))
+    
+    # 1回しか読めないイテレータの場合は直前のn-1語だけを保持する
+    return _iter_ngrams_from_stream(iter(words), n)
+
+def _iter_ngrams_from_stream(words, n):
+    """イテレータからN-gramを順番に作る"""
+    window = tuple(islice(words, n - 1))
+    for word in words:
+        window = window[1 - n:] + (word,) if n > 1 else (word,)
+        yield window
+
+def count_ngrams(words, n):
+    """
+    N-gramの出現回数を数える
+    
+    Args:
+        words (iterable): 単語の並び
+        n (int): N-gramのサイズ
+    
+    Returns:
+        Counter: N-gramのタプルと出現回数
+    """
+    return Counter(iter_ngrams(words, n))
+
+class SpaceSavingCounter:
+    """
+    決まった件数のメモリで頻出要素を近似的に数えるクラス（Space-Saving）
+    
+    保持する要素が capacity を超えると、最も回数の少ない要素を追い出し、
+    新しい要素はその回数+1から数え始めます。出現回数が
+    総数/capacity より多い要素は必ず残り、回数は多めに見積もられます
+    （誤差は error() で確認できます）。
+    """
+    
+    def __init__(self, capacity=10000):
+        """
+        Args:
+            capacity (int): 保持する要素数の上限
+        """
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        self._heap = []  # (回数, 要素) の最小ヒープ（古い値は取り出すときに読み飛ばす）
+    
+    def add(self, item, count=1):
+        """要素の出現を数える"""
+        self.total += count
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            # 最も回数の少ない要素を追い出して置き換える
+            minimum, evicted = self._pop_minimum()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = minimum + count
+            self.errors[item] = minimum
+        
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+    
+    def update(self, items):
+        """複数の要素をまとめて数える"""
+        for item in items:
+            self.add(item)
+    
+    def _pop_minimum(self):
+        """現在の最小の (回数, 要素) を取り出す"""
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self.counts.get(item) == count:
+                return count, item
+    
+    def _rebuild_heap(self):
+        """古い値を捨ててヒープを作り直す"""
+        self._heap = [(count, item) for item, count in self.counts.items()]
+        heapq.heapify(self._heap)
+    
+    def error(self, item):
+        """要素の回数の最大誤差（見積もりがこの値だけ多い可能性がある）"""
+        return self.errors.get(item, 0)
+    
+    def most_common(self, k=None):
+        """回数の多い順に (要素, 回数) のリストを返す"""
+        if k is None:
+            return sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+        return heapq.nlargest(k, self.counts.items(), key=lambda x: x[1])
+    
+    def items(self):
+        """保持している (要素, 回数) を返す"""
+        return self.counts.items()
+    
+    def __len__(self):
+        return len(self.counts)
+
+class NGramCounter:
+    """
+    単語を整数IDに置き換えてN-gramを数えるクラス
+    
+    N-gramは各単語のIDをビット演算で1つの整数に詰めたキーで数えるため、
+    文字列のタプルをキーにするより少ないメモリで済みます。
+    capacity を指定すると Space-Saving による近似集計になり、
+    メモリ使用量が一定になります。
+    """
+    
+    def __init__(self, n=2, capacity=None):
+        """
+        Args:
+            n (int): N-gramのサイズ
+            capacity (int): 近似集計で保持するN-gramの上限（None の場合は正確に数える）
+        """
+        self.n = n
+        self.word_ids = {}  # 単語 -> ID
+        self.id_words = []  # ID -> 単語
+        self.counts = Counter() if capacity is None else SpaceSavingCounter(capacity)
+        self._mask = (1 << (ID_BITS * n)) - 1
+        self._window = 0
+        self._filled = 0
+    
+    def _intern(self, word):
+        """単語のIDを取得（初めての単語には新しいIDを割り当てる）"""
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            word_id = len(self.id_words)
+            self.word_ids[word] = word_id
+            self.id_words.append(word)
+        return word_id
+    
+    def update(self, words):
+        """
+        単語の並びを追加で数える
+        
+        前回の update() の最後の単語とつながったN-gramも数えます。
+        """
+        self.counts.update(self._iter_keys(words))
+    
+    def _iter_keys(self, words):
+        """単語の並びからN-gramの整数キーを順番に作る"""
+        n = self.n
+        mask = self._mask
+        window = self._window
+        filled = self._filled
+        intern = self._intern
+        
+        for word in words:
+            window = ((window << ID_BITS) | intern(word)) & mask
+            filled += 1
+            if filled >= n:
+                yield window
+        
+        self._window = window
+        self._filled = filled
+    
+    def reset_window(self):
+        """文書の区切りなど、前の単語とN-gramをつなげないようにする"""
+        self._window = 0
+        self._filled = 0
+    
+    def decode(self, key):
+        """整数キーをN-gramのタプルに戻す"""
+        id_mask = (1 << ID_BITS) - 1
+        ids = [(key >> (ID_BITS * i)) & id_mask for i in range(self.n - 1, -1, -1)]
+        return tuple(self.id_words[word_id] for word_id in ids)
+    
+    def most_common(self, k=None):
+        """出現回数の多い順に (N-gramのタプル, 回数) のリストを返す"""
+        return [(self.decode(key), count) for key, count in self.counts.most_common(k)]
+    
+    def to_counter(self):
+        """N-gramのタプルをキーにしたCounterに変換"""
+        return Counter({self.decode(key): count for key, count in self.counts.items()})
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 並列コーパス解析
+
+複数のテキストファイル（または1つの巨大ファイルのバイト範囲）を
+プロセスプールで分担して解析し、部分結果を結合して
+AdvancedWordAnalyzer と同じ統計情報・JSON出力を作成します。
+
+学習ポイント:
+- concurrent.futures によるマルチプロセス処理
+- 結合できる部分集計（map-reduce）の考え方
+- バイト範囲の分割と行境界への調整
+
+使用方法:
+  python3 projects/04_word_analyzer/parallel_analyzer.py doc1.txt doc2.txt -o result.json
+  python3 projects/04_word_analyzer/parallel_analyzer.py huge.txt --split
+  python3 projects/04_word_analyzer/parallel_analyzer.py huge.txt --benchmark
+"""
+
+import os
+import sys
+import time
+import codecs
+import pickle
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+# 自作モジュールをインポート
+try:
+    from advanced_analyzer import AdvancedWordAnalyzer
+except ImportError as e:
+    print(f"❌ モジュールのインポートエラー: {e}")
+    print("projects/04_word_analyzer/ にある advanced_analyzer.py と一緒に実行してください")
+    sys.exit(1)
+
+# 1回に読み込むバイト数
+READ_SIZE = 1024 * 1024
+
+def split_byte_ranges(filename, num_parts):
+    """
+    ファイルを行の境界でおおよそ等しいバイト範囲に分割
+    
+    Args:
+        filename (str): 分割するファイル名
+        num_parts (int): 分割数
+    
+    Returns:
+        list: (開始位置, 終了位置) のタプルのリスト
+    """
+    size = os.path.getsize(filename)
+    if size == 0:
+        return []
+    
+    boundaries = [0]
+    with open(filename, 'rb') as f:
+        for i in range(1, num_parts):
+            f.seek(size * i // num_parts)
+            f.readline()  # 次の行頭まで進める（改行はUTF-8の文字境界でもある）
+            position = f.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def analyze_byte_range(filename, start, end, remove_stopwords=True, language='english', encoding='utf-8',
+                       word_splitter=None):
+    """
+    ファイルの指定バイト範囲を集計（ワーカープロセスで実行）
+    
+    Args:
+        word_splitter (callable): 単語分割器（None の場合は標準の分割）
+    
+    Returns:
+        TextStatsAccumulator: 部分集計結果
+    
+    Raises:
+        UnicodeDecodeError: 指定した文字コードで読めない場合
+    """
+    analyzer = AdvancedWordAnalyzer()
+    analyzer.word_splitter = word_splitter
+    accumulator = analyzer.create_accumulator(remove_stopwords, language, detailed=True)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            data = f.read(min(READ_SIZE, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            accumulator.feed(decoder.decode(data))
+        accumulator.feed(decoder.decode(b'', final=True))
+    
+    return accumulator
+
+def analyze_document(filename, remove_stopwords=True, language='english', encoding='utf-8', word_splitter=None):
+    """1つのファイルを1文書として集計（ワーカープロセスで実行）"""
+    accumulator = analyze_byte_range(filename, 0, os.path.getsize(filename), remove_stopwords, language, encoding,
+                                     word_splitter)
+    accumulator.end_document()
+    return accumulator
+
+class ParallelCorpusAnalyzer:
+    """複数プロセスでコーパスを解析するクラス"""
+    
+    def __init__(self, workers=None, remove_stopwords=True, language='english', word_splitter=None):
+        """
+        Args:
+            workers (int): ワーカープロセス数（None の場合はCPUコア数）
+            remove_stopwords (bool): ストップワードを除去するか
+            language (str): ストップワードの言語
+            word_splitter (callable): 単語分割器（AdvancedWordAnalyzer.word_splitter と同じ。None の場合は標準の分割）
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.remove_stopwords = remove_stopwords
+        self.language = language
+        self.word_splitter = word_splitter
+    
+    def _can_send_splitter(self):
+        """単語分割器をワーカープロセスに渡せるか（mmapで開いた辞書などはpickleできない）"""
+        if self.word_splitter is None:
+            return True
+        try:
+            pickle.dumps(self.word_splitter)
+        except (TypeError, AttributeError, pickle.PicklingError):
+            return False
+        return True
+    
+    def _run(self, function, *arg_lists):
+        """ワーカーで関数を実行し、入力順に結果を返す"""
+        if self.workers == 1:
+            return list(map(function, *arg_lists))
+        
+        if not self._can_send_splitter():
+            # 別の分割器で数えると結果が変わるため、このプロセス内で順番に処理する
+            print("⚠️ 単語分割器をワーカープロセスに渡せないため、1プロセスで解析します")
+            return list(map(function, *arg_lists))
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(function, *arg_lists))
+    
+    def _merge(self, partials):
+        """部分集計を順番に結合して AdvancedWordAnalyzer に読み込む"""
+        analyzer = AdvancedWordAnalyzer()
+        analyzer.word_splitter = self.word_splitter
+        total = analyzer.create_accumulator(self.remove_stopwords, self.language, detailed=True)
+        for partial in partials:
+            total.merge(partial)
+        
+        analyzer.load_accumulator(total)
+        return analyzer
+    
+    def analyze_files(self, filenames):
+        """
+        複数のファイルをファイル単位で並列に解析
+        
+        各ファイルは独立した文書として扱い、ファイルをまたぐ文やN-gramは作りません。
+        
+        Args:
+            filenames (list): 解析するファイル名のリスト
+        
+        Returns:
+            AdvancedWordAnalyzer: 結合済みの解析結果
+        """
+        count = len(filenames)
+        partials = self._run(analyze_document, filenames,
+                             [self.remove_stopwords] * count, [self.language] * count,
+                             ['utf-8'] * count, [self.word_splitter] * count)
+        return self._merge(partials)
+    
+    def analyze_large_file(self, filename, num_parts=None):
+        """
+        1つの巨大ファイルをバイト範囲に分割して並列に解析
+        
+        結果はファイル全体を AdvancedWordAnalyzer で解析した場合と同じになります。
+        
+        Args:
+            filename (str): 解析するファイル名
+            num_parts (int): 分割数（None の場合はワーカー数の4倍）
+        
+        Returns:
+            AdvancedWordAnalyzer: 結合済みの解析結果
+        """
+        ranges = split_byte_ranges(filename, num_parts or self.workers * 4)
+        count = len(ranges)
+        partials = self._run(analyze_byte_range, [filename] * count,
+                             [start for start, _ in ranges], [end for _, end in ranges],
+                             [self.remove_stopwords] * count, [self.language] * count,
+                             ['utf-8'] * count, [self.word_splitter] * count)
+        return self._merge(partials)
+
+def benchmark_scaling(filename, worker_counts=None):
+    """
+    ワーカー数ごとの処理時間を計測してスケーリングを表示
+    
+    Args:
+        filename (str): 計測に使うファイル名
+        worker_counts (list): 計測するワーカー数のリスト
+    
+    Returns:
+        list: (ワーカー数, 秒数) のタプルのリスト
+    """
+    cpu_count = os.cpu_count() or 1
+    if worker_counts is None:
+        worker_counts = sorted({1, 2, 4, 8, cpu_count})
+    
+    size_mb = os.path.getsize(filename) / (1024 * 1024)
+    results = []
+    
+    print(f"\n⏱️ スケーリング計測: {filename} ({size_mb:.1f} MB, CPU {cpu_count}コア)")
+    print("=" * 60)
+    print("ワーカー数    秒数      MB/s   速度向上   効率")
+    print("-" * 60)
+    
+    for workers in worker_counts:
+        analyzer = ParallelCorpusAnalyzer(workers=workers)
+        start = time.perf_counter()
+        analyzer.analyze_large_file(filename)
+        elapsed = time.perf_counter() - start
+        results.append((workers, elapsed))
+        
+        speedup = results[0][1] / elapsed
+        efficiency = speedup / workers * results[0][0]
+        print(f"{workers:>8}  {elapsed:>8.2f}  {size_mb / elapsed:>8.2f}  {speedup:>7.2f}x  {efficiency:>6.0%}")
+    
+    print("=" * 60)
+    return results
+
+def parse_arguments():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="複数プロセスによるコーパス解析")
+    parser.add_argument('files', nargs='+', help='解析するテキストファイル')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='ワーカープロセス数（デフォルト: CPUコア数）')
+    parser.add_argument('-o', '--output', default='analysis_result.json',
+                        help='JSONの出力先')
+    parser.add_argument('--format', choices=['pretty', 'compact', 'jsonl'], default='pretty',
+                        help='JSONの形式（pretty: インデント付き, compact: 1行, jsonl: JSON Lines）')
+    parser.add_argument('--full', action='store_true',
+                        help='上位だけでなく全ての単語・N-gram・TF-IDFを出力')
+    parser.add_argument('--split', action='store_true',
+                        help='1つのファイルをバイト範囲に分割して解析')
+    parser.add_argument('--benchmark', action='store_true',
+                        help='ワーカー数ごとのスケーリングを計測')
+    parser.add_argument('--language', default='english',
+                        help='ストップワードの言語')
+    parser.add_argument('--keep-stopwords', action='store_true',
+                        help='ストップワードを除去しない')
+    return parser.parse_args()
+
+def main():
+    """メイン関数"""
+    args = parse_arguments()
+    
+    if args.benchmark:
+        benchmark_scaling(args.files[0])
+        return
+    
+    parallel = ParallelCorpusAnalyzer(workers=args.workers,
+                                      remove_stopwords=not args.keep_stopwords,
+                                      language=args.language)
+    
+    start = time.perf_counter()
+    if args.split:
+        analyzer = parallel.analyze_large_file(args.files[0])
+    else:
+        analyzer = parallel.analyze_files(args.files)
+    elapsed = time.perf_counter() - start
+    
+    if not analyzer.stats:
+        print("❌ 単語が抽出されませんでした")
+        return
+    
+    print(f"✅ 並列解析完了: {analyzer.stats['total_words']:,}語 ({elapsed:.2f}秒, {parallel.workers}プロセス)")
+    analyzer.export_analysis_to_json(args.output, format=args.format, full=args.full)
+
+if __name__ == "__main__":
+    main()
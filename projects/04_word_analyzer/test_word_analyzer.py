@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 単語解析の回帰テスト
+
+テキストの解析方法（全文・ストリーミング・追加・並列・キャッシュ）を変えても、
+統計情報・単語の出現回数・N-gram・TF-IDFが変わらないことを確かめます。
+
+使用方法:
+  python3 -m unittest discover -s projects/04_word_analyzer
+  python3 -m pytest projects/04_word_analyzer
+"""
+
+import io
+import os
+import tempfile
+import unittest
+import contextlib
+
+from advanced_analyzer import AdvancedWordAnalyzer
+from analysis_cache import AnalysisCache
+from japanese_tokenizer import JapaneseTokenizer
+from parallel_analyzer import ParallelCorpusAnalyzer
+
+# 英語のサンプルテキスト（文の区切り・改行・感情語・繰り返しのN-gramを含む）
+SAMPLE_TEXT = """The quick brown fox jumps over the lazy dog. The dog was not amused!
+Is this a good day or a bad day? It is a great day for data analysis.
+
+Word analysis finds the most frequent words, and the quick brown fox appears again.
+Love and hate, joy and pain: every review has a problem or an issue... but the data is beautiful.
+Streaming analysis must give the same result as full analysis; parallel analysis too!
+""" * 6 + "The last sentence has no period and ends with the quick brown fox"
+
+# 日本語のサンプルテキスト（辞書による単語分割で解析する）
+JAPANESE_TEXT = """今日は良い天気です。私は公園で本を読みました！
+明日も晴れるといいですね。東京の大学で日本語を勉強しています。
+""" * 8 + "最後の文は句点で終わらない"
+
+def summarize(analyzer):
+    """比較する解析結果（統計情報・単語の出現回数・N-gram・TF-IDF）をまとめる"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return {
+            'stats': dict(analyzer.stats),
+            'word_count': dict(analyzer.word_count),
+            'bigrams': dict(analyzer.get_ngrams(2)),
+            'trigrams': dict(analyzer.get_ngrams(3)),
+            'tf_idf': analyzer.calculate_tf_idf(20)
+        }
+
+def split_text(text, sizes):
+    """テキストを sizes の長さを順番に繰り返して区切る"""
+    pieces = []
+    position = 0
+    while position < len(text):
+        size = sizes[len(pieces) % len(sizes)]
+        pieces.append(text[position:position + size])
+        position += size
+    return pieces
+
+class WordAnalyzerPathsTest(unittest.TestCase):
+    """解析方法による違いがないことを確かめるテスト"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.filename = self.write_text('sample.txt', SAMPLE_TEXT)
+        self.expected = summarize(self.analyze_full(SAMPLE_TEXT))
+    
+    def write_text(self, name, text):
+        """テキストファイルを一時ディレクトリに作成"""
+        filename = os.path.join(self.directory.name, name)
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return filename
+    
+    def analyze_full(self, text, language='english', word_splitter=None):
+        """全文を preprocess_text と calculate_advanced_statistics で解析"""
+        analyzer = AdvancedWordAnalyzer()
+        analyzer.word_splitter = word_splitter
+        analyzer.text = text
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(analyzer.preprocess_text(True, language))
+            self.assertTrue(analyzer.calculate_advanced_statistics())
+        return analyzer
+    
+    def analyze_appended(self, pieces, language='english', word_splitter=None):
+        """テキストを append_text で少しずつ追加して解析（単語がまだない間は False が返る）"""
+        analyzer = AdvancedWordAnalyzer()
+        analyzer.word_splitter = word_splitter
+        analyzer.preprocess_options = (True, language)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for piece in pieces:
+                analyzer.append_text(piece)
+        return analyzer
+    
+    def test_sample_text_is_not_trivial(self):
+        """比較する解析結果が空でない（空どうしの比較で通らないように）"""
+        for name, value in self.expected.items():
+            with self.subTest(result=name):
+                self.assertTrue(value)
+    
+    def test_streaming_matches_full(self):
+        """チャンクの大きさによらず、ストリーミング解析は全文の解析と同じ"""
+        for chunk_size in (7, 97, 1024 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                analyzer = AdvancedWordAnalyzer()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    self.assertTrue(analyzer.analyze_file_streaming(self.filename, chunk_size=chunk_size,
+                                                                    detailed=True))
+                self.assertEqual(summarize(analyzer), self.expected)
+    
+    def test_append_matches_full(self):
+        """テキストを単語や文の途中で区切って追加しても、全文の解析と同じ"""
+        for sizes in ([1, 2, 3, 5], [13, 61], [500]):
+            with self.subTest(sizes=sizes):
+                analyzer = self.analyze_appended(split_text(SAMPLE_TEXT, sizes))
+                self.assertEqual(summarize(analyzer), self.expected)
+    
+    def test_append_after_streaming_matches_full(self):
+        """ストリーミング解析の結果に追加しても、全文の解析と同じ"""
+        half = len(SAMPLE_TEXT) // 2
+        analyzer = AdvancedWordAnalyzer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(analyzer.analyze_file_streaming(self.write_text('half.txt', SAMPLE_TEXT[:half]),
+                                                            detailed=True))
+            for piece in split_text(SAMPLE_TEXT[half:], [17, 3]):
+                self.assertTrue(analyzer.append_text(piece))
+        self.assertEqual(summarize(analyzer), self.expected)
+    
+    def test_parallel_matches_full(self):
+        """ワーカー数・分割数によらず、並列解析は全文の解析と同じ"""
+        for workers, num_parts in [(1, None), (1, 9), (2, None), (2, 5)]:
+            with self.subTest(workers=workers, num_parts=num_parts):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    analyzer = ParallelCorpusAnalyzer(workers=workers).analyze_large_file(self.filename, num_parts)
+                self.assertEqual(summarize(analyzer), self.expected)
+    
+    def test_cache_hit_matches_full(self):
+        """キャッシュから読み込んだ結果も、全文の解析と同じ"""
+        cache = AnalysisCache(os.path.join(self.directory.name, 'cache'))
+        message = f"✅ キャッシュから読み込みました: {self.filename}"
+        for hit in (False, True):
+            with self.subTest(hit=hit):
+                analyzer = AdvancedWordAnalyzer()
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    self.assertTrue(analyzer.analyze_file_cached(self.filename, cache=cache))
+                self.assertEqual(message in output.getvalue().splitlines(), hit)
+                self.assertEqual(summarize(analyzer), self.expected)
+    
+    def test_japanese_paths_match_full(self):
+        """日本語の単語分割器でも、ストリーミング・追加・並列解析は全文の解析と同じ"""
+        tokenizer = JapaneseTokenizer()
+        filename = self.write_text('japanese.txt', JAPANESE_TEXT)
+        expected = summarize(self.analyze_full(JAPANESE_TEXT, 'japanese', tokenizer))
+        self.assertTrue(expected['word_count'])
+        
+        streaming = AdvancedWordAnalyzer()
+        streaming.word_splitter = tokenizer
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(streaming.analyze_file_streaming(filename, language='japanese', chunk_size=31,
+                                                             detailed=True))
+            parallel = ParallelCorpusAnalyzer(workers=2, language='japanese',
+                                              word_splitter=tokenizer).analyze_large_file(filename)
+        appended = self.analyze_appended(split_text(JAPANESE_TEXT, [4, 11]), 'japanese', tokenizer)
+        
+        for name, analyzer in [('streaming', streaming), ('append', appended), ('parallel', parallel)]:
+            with self.subTest(path=name):
+                self.assertEqual(summarize(analyzer), expected)
+
+if __name__ == "__main__":
+    unittest.main()
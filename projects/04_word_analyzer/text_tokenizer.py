@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 共通トークナイザー
+
+BasicWordAnalyzer と AdvancedWordAnalyzer で共有する単語分割処理です。
+小文字化を1回だけ行い、コンパイル済みの正規表現1回の走査で単語を取り出し、
+ストップワードと長さによる除外も同じ内包表記の中で行います。
+
+学習ポイント:
+- 正規表現のコンパイルと再利用
+- 中間リストを作らない処理の組み立て方
+- time.perf_counter による処理速度の計測
+
+実行すると、従来の前処理（置換・分割を繰り返す方式）との速度比較を表示します。
+"""
+
+import re
+import time
+import random
+from collections import Counter
+from itertools import accumulate
+from operator import itemgetter
+
+# 文の区切り文字
+SENTENCE_DELIMITERS = '.!?。！？'
+
+_DELIMITER_SET = frozenset(SENTENCE_DELIMITERS)
+
+WORD_PATTERN = re.compile(r'\w+')
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?。！？]')
+
+# 単語と文区切りを1回の走査でまとめて取り出すパターン
+WORD_OR_DELIMITER_PATTERN = re.compile(r'\w+|[.!?。！？]')
+
+def is_separator(char):
+    """空白または文区切り文字かどうか"""
+    return char.isspace() or char in SENTENCE_DELIMITERS
+
+def filter_words(words, stopwords=(), min_length=1):
+    """ストップワードと短い単語を除外"""
+    if not stopwords and min_length <= 1:
+        return words
+    return [word for word in words if len(word) >= min_length and word not in stopwords]
+
+def tokenize(text, stopwords=(), min_length=1, splitter=None):
+    """
+    テキストを正規化済みの単語リストに変換
+    
+    Args:
+        text (str): 対象テキスト
+        stopwords (set): 除外する単語の集合
+        min_length (int): 残す単語の最小文字数
+        splitter (callable): テキストを単語リストに分割する関数（省略時は \\w+ の並び）
+    
+    Returns:
+        list: 小文字化された単語のリスト
+    """
+    return filter_words((splitter or WORD_PATTERN.findall)(text.lower()), stopwords, min_length)
+
+def split_sentences(text):
+    """文に分割（前後の空白を除き、空の文は除外）"""
+    sentences = []
+    for sentence in SENTENCE_SPLIT_PATTERN.split(text):
+        sentence = sentence.strip()
+        if sentence:
+            sentences.append(sentence)
+    return sentences
+
+def trailing_word_start(text):
+    """
+    末尾の単語（後ろに追加されるテキストとつながる可能性がある部分）の開始位置
+    
+    Returns:
+        int: 末尾が単語の文字でなければ len(text)
+    """
+    start = len(text)
+    while start > 0 and WORD_PATTERN.match(text[start - 1]):
+        start -= 1
+    return start
+
+def last_sentence_start(text, start=0):
+    """
+    最後の文区切り文字の直後の位置（text[start:] の範囲で探す）
+    
+    Returns:
+        int: 区切り文字がなければ start
+    """
+    return max(start, max(text.rfind(delimiter, start) for delimiter in SENTENCE_DELIMITERS) + 1)
+
+def count_sentence_frequency(text, splitter=None):
+    """
+    単語ごとに、その単語を含む文の数を数える（TF-IDFの文書頻度）
+    
+    単語と文区切りを1回の走査で取り出し、区切りごとに文番号を進めて
+    (文番号, 単語) の重複を除いてから数えます。
+    
+    Args:
+        text (str): 対象テキスト
+        splitter (callable): テキストを単語リストに分割する関数
+        
+    Returns:
+        Counter: 単語と出現文数
+    """
+    if splitter is not None:
+        frequency = Counter()
+        for sentence in SENTENCE_SPLIT_PATTERN.split(text.lower()):
+            frequency.update(set(splitter(sentence)))
+        return frequency
+    
+    tokens = WORD_OR_DELIMITER_PATTERN.findall(text.lower())
+    sentence_ids = accumulate(map(_DELIMITER_SET.__contains__, tokens))
+    frequency = Counter(map(itemgetter(1), set(zip(sentence_ids, tokens))))
+    for delimiter in SENTENCE_DELIMITERS:
+        frequency.pop(delimiter, None)
+    return frequency
+
+def scan_segments(text, stopwords=(), min_length=1, splitter=None):
+    """
+    文区切り文字で区切られた区間ごとに、空白区切りのトークン数と単語を求める
+    
+    最初の区間は直前のテキストの続き、最後の区間は次のテキストへ続く可能性があります。
+    
+    Args:
+        text (str): 対象テキスト
+        stopwords (set): 除外する単語の集合
+        min_length (int): 残す単語の最小文字数
+        splitter (callable): テキストを単語リストに分割する関数
+    
+    Returns:
+        list: (トークン数, 単語リスト) のタプルのリスト
+    """
+    findall = splitter or WORD_PATTERN.findall
+    segments = []
+    for segment in SENTENCE_SPLIT_PATTERN.split(text.lower()):
+        segments.append((len(segment.split()), filter_words(findall(segment), stopwords, min_length)))
+    return segments
+
+def _legacy_preprocess(text, stopwords, min_length):
+    """比較用: 置換と分割を繰り返す従来の前処理"""
+    text_processed = re.sub(r'[^\w\s]', ' ', text.lower())
+    text_processed = re.sub(r'\s+', ' ', text_processed)
+    words = [word.strip() for word in text_processed.split() if word.strip()]
+    words = [word for word in words if word not in stopwords]
+    return [word for word in words if len(word) >= min_length]
+
+def benchmark_tokenizer(text, stopwords=(), min_length=2, repeat=3):
+    """
+    従来の前処理と tokenize() の処理速度（MB/s）を比較
+    
+    Returns:
+        dict: 方式名とMB/sの辞書
+    """
+    size_mb = len(text.encode('utf-8')) / (1024 * 1024)
+    results = {}
+    
+    for name, function in [('従来方式', _legacy_preprocess), ('tokenize', tokenize)]:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(text, stopwords, min_length)
+            best = min(best, time.perf_counter() - start)
+        results[name] = size_mb / best
+    
+    return results
+
+def main():
+    """速度比較の実行例"""
+    random.seed(42)
+    vocabulary = ['python', 'data', 'analysis', 'the', 'and', 'is', 'Text', "word's", 'e.g', '東京', 'a', 'I']
+    vocabulary += [''.join(random.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(random.randint(2, 10))) for _ in range(5000)]
+    endings = ['', '', ' ', ',', '.', '!\n']
+    text = ' '.join(random.choice(vocabulary) + random.choice(endings) for _ in range(500000))
+    stopwords = {'the', 'and', 'is', 'a'}
+    
+    assert tokenize(text, stopwords, 2) == _legacy_preprocess(text, stopwords, 2)
+    
+    print("⏱️ トークナイザーの処理速度")
+    print("=" * 40)
+    results = benchmark_tokenizer(text, stopwords)
+    for name, throughput in results.items():
+        print(f"{name:<10} {throughput:>8.1f} MB/s")
+    print("-" * 40)
+    print(f"速度向上: {results['tokenize'] / results['従来方式']:.2f}倍")
+    print("=" * 40)
+
+if __name__ == "__main__":
+    main()
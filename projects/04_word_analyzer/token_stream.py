@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 整数IDによる単語列
+
+単語列を Python の文字列のリストで持つと、出現ごとに文字列オブジェクトと
+参照（8バイト）が必要になります。このモジュールの TokenStream は
+単語を語彙表の整数IDに置き換え、array('I')（1語4バイト）に格納します。
+
+TokenStream は文字列のリストと同じように len()・添字・スライス・for文で
+使えるため、既存の処理はそのまま動きます。出現回数と出現位置は
+整数IDのまま数えてから単語に戻し、N-gramは語彙表の文字列を参照しながら数えます。
+
+学習ポイント:
+- array モジュールによる省メモリな数値配列
+- 語彙表（単語 <-> ID）による文字列の置き換え
+- シーケンスとして振る舞うクラス（__len__・__getitem__・__iter__）
+"""
+
+from array import array
+from collections import Counter
+from itertools import islice
+
+class TokenStream:
+    """単語を整数IDの配列として保持する単語列"""
+    
+    def __init__(self, words=()):
+        """
+        Args:
+            words (iterable): 最初に追加する単語
+        """
+        self.vocabulary = []  # ID -> 単語
+        self.word_ids = {}    # 単語 -> ID
+        self.ids = array('I')
+        self.extend(words)
+    
+    def _intern(self, word):
+        """単語のIDを取得（初めての単語には新しいIDを割り当てる）"""
+        word_id = self.word_ids.get(word)
+        if word_id is None:
+            word_id = len(self.vocabulary)
+            self.word_ids[word] = word_id
+            self.vocabulary.append(word)
+        return word_id
+    
+    def extend(self, words):
+        """単語を末尾に追加"""
+        word_ids = self.word_ids
+        intern = self._intern
+        self.ids.extend([word_ids[word] if word in word_ids else intern(word) for word in words])
+    
+    def append(self, word):
+        """単語を1つ末尾に追加"""
+        self.ids.append(self._intern(word))
+    
+    def __len__(self):
+        return len(self.ids)
+    
+    def __iter__(self):
+        return map(self.vocabulary.__getitem__, self.ids)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(map(self.vocabulary.__getitem__, self.ids[index]))
+        return self.vocabulary[self.ids[index]]
+    
+    def __delitem__(self, index):
+        del self.ids[index]
+    
+    def __eq__(self, other):
+        if isinstance(other, TokenStream):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+    
+    def __repr__(self):
+        return f"TokenStream({len(self)} words, {len(self.vocabulary)} types)"
+    
+    def memory_size(self):
+        """IDの配列のバイト数（語彙表は含まない）"""
+        return self.ids.itemsize * len(self.ids)
+    
+    def count_words(self):
+        """
+        単語の出現回数を数える（Counter(words) と同じ順番・内容）
+        
+        Returns:
+            Counter: 単語と出現回数
+        """
+        vocabulary = self.vocabulary
+        return Counter({vocabulary[word_id]: count for word_id, count in Counter(self.ids).items()})
+    
+    def count_ngrams(self, n, start=0):
+        """
+        ids[start:] のN-gramを数える
+        
+        IDを語彙表の文字列に置き換えながら数えるため、N-gramのタプルは
+        語彙表の同じ文字列オブジェクト（ハッシュ値は計算済み）を参照します。
+        
+        Returns:
+            Counter: N-gramのタプルと出現回数
+        """
+        ids = self.ids[start:] if start else self.ids
+        lookup = self.vocabulary.__getitem__
+        return Counter(zip(*(islice(map(lookup, ids), i, None) for i in range(n))))
+    
+    def positions(self):
+        """
+        単語ごとの出現位置を求める
+        
+        Returns:
+            dict: 単語と出現位置の array('I') の辞書（初めて出現した順）
+        """
+        by_id = {}
+        for i, word_id in enumerate(self.ids):
+            positions = by_id.get(word_id)
+            if positions is None:
+                by_id[word_id] = positions = array('I')
+            positions.append(i)
+        vocabulary = self.vocabulary
+        return {vocabulary[word_id]: positions for word_id, positions in by_id.items()}
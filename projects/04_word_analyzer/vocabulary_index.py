@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+プロジェクト4: 語彙の検索インデックス
+
+単語の出現回数の辞書から、次の3つのインデックスを作ります。
+
+- ソート済みの単語リスト（前方一致の単語が連続した範囲に並ぶ）
+- 単語を逆順にしてソートしたリスト（後方一致の単語が連続した範囲に並ぶ）
+- 単語長ごとの単語リスト
+
+前方一致・後方一致は二分探索で範囲を求めるだけで済み、
+「^pre」「ing$」のように固定の文字列で始まる・終わる正規表現は
+候補をその範囲に絞ってから照合します。結果は出現回数の多い順に、
+必要な件数だけをヒープで取り出します。
+
+学習ポイント:
+- bisect による範囲検索
+- 正規表現から固定の文字列を取り出して候補を絞る方法
+- heapq.nsmallest による上位k件の取得
+"""
+
+import re
+import heapq
+from bisect import bisect_left
+
+# 前方一致の範囲の終わりを求めるための、どの文字よりも大きい文字
+_MAX_CHAR = '\U0010ffff'
+
+# 正規表現で特別な意味を持つ文字
+_REGEX_SPECIAL = frozenset('.^$*+?{}[]\\|()')
+
+# 直前の文字を省略可能にする量指定子
+_OPTIONAL_QUANTIFIERS = frozenset('*?{')
+
+def literal_prefix(pattern):
+    """
+    「^」で始まる正規表現から、一致する単語が必ず持つ先頭の固定文字列を取り出す
+    
+    Returns:
+        str: 固定文字列（取り出せない場合は空文字列）
+    """
+    if not pattern.startswith('^') or '|' in pattern or '(?' in pattern:
+        return ''
+    
+    end = 1
+    while end < len(pattern) and pattern[end] not in _REGEX_SPECIAL:
+        end += 1
+    prefix = pattern[1:end]
+    if prefix and end < len(pattern) and pattern[end] in _OPTIONAL_QUANTIFIERS:
+        prefix = prefix[:-1]  # 量指定子が付いた最後の文字は省略される可能性がある
+    return prefix.lower()
+
+def literal_suffix(pattern):
+    """
+    「$」で終わる正規表現から、一致する単語が必ず持つ末尾の固定文字列を取り出す
+    
+    Returns:
+        str: 固定文字列（取り出せない場合は空文字列）
+    """
+    if not pattern.endswith('$') or pattern.endswith('\\$') or '|' in pattern or '(?' in pattern:
+        return ''
+    
+    start = len(pattern) - 1
+    while start > 0 and pattern[start - 1] not in _REGEX_SPECIAL:
+        start -= 1
+    suffix = pattern[start:-1]
+    if suffix and start > 0 and pattern[start - 1] == '\\':
+        suffix = suffix[1:]  # 「\d」のようなエスケープの文字は固定文字列ではない
+    return suffix.lower()
+
+class VocabularyIndex:
+    """単語の出現回数の辞書から作る、前方一致・後方一致・長さ・正規表現の検索インデックス"""
+    
+    def __init__(self, word_count):
+        """
+        Args:
+            word_count (dict): 単語と出現回数の辞書（検索結果の回数はこの辞書から取得する）
+        """
+        self.word_count = word_count
+        self.rank = {}            # 単語 -> 辞書での順番（同じ回数の単語の並び順）
+        self.length_buckets = {}  # 単語長 -> 単語のリスト（辞書の順）
+        for rank, word in enumerate(word_count):
+            self.rank[word] = rank
+            self.length_buckets.setdefault(len(word), []).append(word)
+        
+        self.sorted_words = sorted(word_count)
+        self.reversed_words = sorted(word[::-1] for word in word_count)
+    
+    def __len__(self):
+        return len(self.sorted_words)
+    
+    def top_k(self, words, k=None, in_dict_order=False):
+        """
+        単語を出現回数の多い順に並べて返す（同じ回数は辞書の順）
+        
+        Args:
+            words (list): 対象の単語
+            k (int): 取得する件数（None の場合はすべて）
+            in_dict_order (bool): words がすでに辞書の順に並んでいるか
+        
+        Returns:
+            list: (単語, 出現回数) のタプルのリスト
+        """
+        if not in_dict_order:
+            words = sorted(words, key=self.rank.__getitem__)
+        
+        # sorted と heapq.nlargest は同じ回数の単語の順番を保つ
+        get_count = self.word_count.__getitem__
+        if k is None:
+            ordered = sorted(words, key=get_count, reverse=True)
+        else:
+            ordered = heapq.nlargest(k, words, key=get_count)
+        return [(word, get_count(word)) for word in ordered]
+    
+    def words_with_prefix(self, prefix):
+        """指定した文字列で始まる単語（ソート順）"""
+        start = bisect_left(self.sorted_words, prefix)
+        end = bisect_left(self.sorted_words, prefix + _MAX_CHAR, start)
+        return self.sorted_words[start:end]
+    
+    def words_with_suffix(self, suffix):
+        """指定した文字列で終わる単語"""
+        reversed_suffix = suffix[::-1]
+        start = bisect_left(self.reversed_words, reversed_suffix)
+        end = bisect_left(self.reversed_words, reversed_suffix + _MAX_CHAR, start)
+        return [word[::-1] for word in self.reversed_words[start:end]]
+    
+    def words_with_length(self, length):
+        """指定した長さの単語（辞書の順。top_k には in_dict_order=True で渡せる）"""
+        return self.length_buckets.get(length, [])
+    
+    def candidates(self, pattern):
+        """
+        正規表現に一致する可能性がある単語（固定の先頭・末尾の文字列で絞り込む）
+        
+        Returns:
+            tuple: (候補の単語, 辞書の順に並んでいるか)
+        """
+        prefix = literal_prefix(pattern)
+        suffix = literal_suffix(pattern)
+        if prefix and suffix:
+            # 範囲が狭い方を使い、もう一方の条件で絞る
+            by_prefix = self.words_with_prefix(prefix)
+            if len(by_prefix) <= self._suffix_range_size(suffix):
+                return [word for word in by_prefix if word.endswith(suffix)], False
+            return [word for word in self.words_with_suffix(suffix) if word.startswith(prefix)], False
+        if prefix:
+            return self.words_with_prefix(prefix), False
+        if suffix:
+            return self.words_with_suffix(suffix), False
+        return self.word_count, True
+    
+    def _suffix_range_size(self, suffix):
+        """指定した文字列で終わる単語の数"""
+        reversed_suffix = suffix[::-1]
+        start = bisect_left(self.reversed_words, reversed_suffix)
+        return bisect_left(self.reversed_words, reversed_suffix + _MAX_CHAR, start) - start
+    
+    def search(self, pattern, k=None, flags=re.IGNORECASE):
+        """
+        正規表現に一致する単語を出現回数の多い順に検索
+        
+        Args:
+            pattern (str): 正規表現
+            k (int): 取得する件数（None の場合はすべて）
+            flags (int): 正規表現のフラグ
+        
+        Returns:
+            list: (単語, 出現回数) のタプルのリスト
+        
+        Raises:
+            re.error: 正規表現が正しくない場合
+        """
+        search = re.compile(pattern, flags).search
+        words, in_dict_order = self.candidates(pattern)
+        return self.top_k([word for word in words if search(word)], k, in_dict_order)
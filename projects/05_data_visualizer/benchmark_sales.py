@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+プロジェクト5: 売上データ分析のベンチマーク
+
+乱数のシードから毎回同じ売上データのCSVを作り、日付を扱う処理の時間を
+従来の方法（before）と現在の SalesDataAnalyzer（after）で比較します。
+
+従来の方法:
+  売上データを辞書のリストで保持し、分析のたびに各行の日付を
+  datetime.strptime で変換する（月別分析では strftime で年月の文字列に戻す）
+
+現在の方法:
+  日付は読み込み時に1回だけ日の通し番号に変換し（同じ文字列は変換結果を再利用）、
+  年月の列と集計キューブを各分析で再利用する
+
+計測する段階:
+  parse_dates → load_from_csv → calculate_summary_statistics → analyze_monthly_trends → calculate_growth_rate
+
+--scaling を指定すると、load_from_csv をワーカー数ごとに計測し（スケーリング）、
+並列に読み込んだ結果が1プロセスで読み込んだ結果と同じかを確かめます。
+
+学習ポイント:
+- time.perf_counter による処理時間の計測
+- 変換結果のキャッシュ（メモ化）の効果
+- 同じ結果になることを確かめてから速さを比べる
+
+使用方法:
+  python3 projects/05_data_visualizer/benchmark_sales.py --rows 1000000
+  python3 projects/05_data_visualizer/benchmark_sales.py --rows 100000 --repeat 3 -o sales_benchmark.json
+  python3 projects/05_data_visualizer/benchmark_sales.py --rows 1000000 --scaling --workers 2 4 8
+"""
+
+import io
+import os
+import csv
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+from datetime import date, datetime, timedelta
+from collections import defaultdict
+from contextlib import redirect_stdout
+import statistics
+
+# 自作モジュールをインポート
+try:
+    from sales_analyzer import SalesDataAnalyzer
+    from sales_columns import FIELDS, DateParser
+except ImportError as e:
+    print(f"❌ モジュールのインポートエラー: {e}")
+    print("projects/05_data_visualizer/ にある sales_analyzer.py と一緒に実行してください")
+    sys.exit(1)
+
+STAGES = ['parse_dates', 'load_from_csv', 'calculate_summary_statistics', 'analyze_monthly_trends',
+          'calculate_growth_rate']
+
+_PRODUCTS = ['商品A', '商品B', '商品C', '商品D', '商品E', '商品F']
+_REGIONS = ['東京', '大阪', '名古屋', '福岡', '札幌']
+_SALES_REPS = ['田中', '佐藤', '鈴木', '高橋', '伊藤', '渡辺']
+
+def generate_sales_csv(filename, rows, seed=42):
+    """
+    再現可能な売上データのCSVを作成（2023年1月1日からの2年分）
+    
+    Args:
+        filename (str): 出力先
+        rows (int): 行数
+        seed (int): 乱数のシード
+    """
+    rng = random.Random(seed)
+    first_day = date(2023, 1, 1)
+    dates = [(first_day + timedelta(days=offset)).isoformat() for offset in range(730)]
+    
+    with open(filename, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for _ in range(rows):
+            quantity = rng.randint(1, 10)
+            amount = rng.randint(1000, 50000)
+            writer.writerow([rng.choice(dates), rng.choice(_PRODUCTS), rng.choice(_REGIONS),
+                             rng.choice(_SALES_REPS), amount, quantity, amount // quantity])
+
+class LegacySalesAnalyzer:
+    """従来の方法（辞書のリスト・分析ごとに strptime）で日付を扱う分析（比較用）"""
+    
+    def __init__(self):
+        self.sales_data = []
+        self.summary_stats = {}
+    
+    def load_from_csv(self, filename):
+        """CSVを辞書のリストとして読み込み（日付は文字列のまま）"""
+        with open(filename, 'r', encoding='utf-8') as f:
+            self.sales_data = []
+            for row in csv.DictReader(f):
+                record = {
+                    'date': row['date'],
+                    'product': row['product'],
+                    'region': row['region'],
+                    'sales_rep': row.get('sales_rep', ''),
+                    'amount': float(row['amount']),
+                    'quantity': int(row.get('quantity', 1)),
+                    'unit_price': float(row.get('unit_price', 0))
+                }
+                if record['unit_price'] == 0 and record['quantity'] > 0:
+                    record['unit_price'] = record['amount'] / record['quantity']
+                self.sales_data.append(record)
+    
+    def calculate_summary_statistics(self):
+        """基本統計（期間の計算で全行の日付を strptime で変換）"""
+        amounts = [record['amount'] for record in self.sales_data]
+        dates = [datetime.strptime(record['date'], '%Y-%m-%d') for record in self.sales_data]
+        min_date, max_date = min(dates), max(dates)
+        date_range = (max_date - min_date).days + 1
+        self.summary_stats = {
+            'total_records': len(self.sales_data),
+            'total_sales': sum(amounts),
+            'median_sale': statistics.median(amounts),
+            'date_range_days': date_range,
+            'start_date': min_date.strftime('%Y-%m-%d'),
+            'end_date': max_date.strftime('%Y-%m-%d')
+        }
+    
+    def analyze_monthly_trends(self):
+        """月別の売上・取引数（全行の日付を strptime → strftime で年月に変換）"""
+        monthly_sales = defaultdict(float)
+        monthly_count = defaultdict(int)
+        for record in self.sales_data:
+            month_key = datetime.strptime(record['date'], '%Y-%m-%d').strftime('%Y-%m')
+            monthly_sales[month_key] += record['amount']
+            monthly_count[month_key] += 1
+        return {month: {'sales': sales, 'transactions': monthly_count[month]}
+                for month, sales in monthly_sales.items()}
+    
+    def calculate_growth_rate(self):
+        """月次成長率（月別分析をもう一度行う）"""
+        monthly_stats = self.analyze_monthly_trends()
+        months = sorted(monthly_stats)
+        growth_rates = {}
+        for prev_month, curr_month in zip(months, months[1:]):
+            prev_sales = monthly_stats[prev_month]['sales']
+            curr_sales = monthly_stats[curr_month]['sales']
+            growth_rates[curr_month] = (curr_sales - prev_sales) / prev_sales * 100 if prev_sales > 0 else 0
+        return growth_rates
+
+def _read_dates(filename):
+    """CSVの日付の列を読み込む"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        position = next(reader).index('date')
+        return [row[position] for row in reader]
+
+def run_stages(analyzer, filename, dates, parse):
+    """
+    各段階を順番に実行して計測
+    
+    Returns:
+        tuple: (段階名と秒数の辞書, 比較用の結果)
+    """
+    steps = [
+        ('parse_dates', lambda: [parse(text) for text in dates]),
+        ('load_from_csv', lambda: analyzer.load_from_csv(filename)),
+        ('calculate_summary_statistics', analyzer.calculate_summary_statistics),
+        ('analyze_monthly_trends', analyzer.analyze_monthly_trends),
+        ('calculate_growth_rate', analyzer.calculate_growth_rate)
+    ]
+    
+    seconds = {}
+    outputs = {}
+    with redirect_stdout(io.StringIO()):
+        for name, step in steps:
+            start = time.perf_counter()
+            outputs[name] = step()
+            seconds[name] = time.perf_counter() - start
+    
+    summary = analyzer.summary_stats
+    result = {
+        'summary': [summary['total_records'], summary['date_range_days'], summary['start_date'], summary['end_date']],
+        'monthly': {month: stats['transactions'] for month, stats in outputs['analyze_monthly_trends'].items()},
+        'growth': outputs['calculate_growth_rate']
+    }
+    return seconds, result
+
+def _legacy_parse(text):
+    """従来の日付の変換"""
+    return datetime.strptime(text, '%Y-%m-%d').toordinal()
+
+def _same_result(before, after):
+    """2つの方法の結果が同じか（成長率は小数の誤差を許す）"""
+    if before['summary'] != after['summary'] or before['monthly'] != after['monthly']:
+        return False
+    if before['growth'].keys() != after['growth'].keys():
+        return False
+    return all(abs(before['growth'][month] - after['growth'][month]) <= 1e-9 * max(1.0, abs(value))
+               for month, value in before['growth'].items())
+
+def run_benchmark(rows, seed=42, repeat=1):
+    """
+    従来の方法と現在の方法で各段階を計測
+    
+    Args:
+        rows (int): 売上データの行数
+        seed (int): 乱数のシード
+        repeat (int): 計測回数（最小値を使う）
+    
+    Returns:
+        dict: レポート（JSONに変換できる値）
+    """
+    temp_dir = tempfile.mkdtemp()
+    filename = os.path.join(temp_dir, 'sales.csv')
+    try:
+        print(f"⏱️ {rows:,}行の売上データを作成中...", file=sys.stderr)
+        generate_sales_csv(filename, rows, seed)
+        dates = _read_dates(filename)
+        
+        timings = {'before': {}, 'after': {}}
+        results = {}
+        for _ in range(repeat):
+            for method, analyzer, parse in (('before', LegacySalesAnalyzer(), _legacy_parse),
+                                            ('after', SalesDataAnalyzer(), DateParser())):
+                print(f"⏱️ {method} を計測中...", file=sys.stderr)
+                seconds, results[method] = run_stages(analyzer, filename, dates, parse)
+                del analyzer  # 次の計測の前に解放する
+                for name, value in seconds.items():
+                    timings[method][name] = min(timings[method].get(name, value), value)
+    finally:
+        if os.path.exists(filename):
+            os.remove(filename)
+        os.rmdir(temp_dir)
+    
+    return {
+        'rows': rows,
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'same_result': _same_result(results['before'], results['after']),
+        'stages': {name: {'before': timings['before'][name], 'after': timings['after'][name]} for name in STAGES}
+    }
+
+def same_columns(first, second):
+    """2つの SalesColumns が同じ行（カテゴリ値の番号の順番を含む）を持つか"""
+    categories = ((first.products, second.products), (first.regions, second.regions),
+                  (first.sales_reps, second.sales_reps))
+    return (first.dates == second.dates and first.quantities == second.quantities and
+            first.amounts.data == second.amounts.data and first.unit_prices.data == second.unit_prices.data and
+            all(mine.values == theirs.values and mine.codes == theirs.codes for mine, theirs in categories))
+
+def _same_analysis(first, second):
+    """2つのアナライザーの基本統計と月別・商品別分析が同じか（小数の合計も正確に一致する）"""
+    with redirect_stdout(io.StringIO()):
+        return (first.summary_stats == second.summary_stats and
+                first.analyze_monthly_trends() == second.analyze_monthly_trends() and
+                first.analyze_product_performance() == second.analyze_product_performance())
+
+def run_scaling_benchmark(rows, seed=42, worker_counts=None, keep_rows=True):
+    """
+    load_from_csv をワーカー数ごとに計測し、1プロセスで読み込んだ結果と比較
+    
+    Args:
+        rows (int): 売上データの行数
+        seed (int): 乱数のシード
+        worker_counts (list): 計測するワーカー数のリスト（1プロセスの計測は常に行う）
+        keep_rows (bool): 行を保持するか（False の場合は集計だけ）
+    
+    Returns:
+        dict: レポート（JSONに変換できる値）
+    """
+    cpu_count = os.cpu_count() or 1
+    if worker_counts is None:
+        worker_counts = [2, 4, 8, cpu_count]
+    worker_counts = sorted(set(worker_counts) | {1})
+    
+    temp_dir = tempfile.mkdtemp()
+    filename = os.path.join(temp_dir, 'sales.csv')
+    results = []
+    try:
+        print(f"⏱️ {rows:,}行の売上データを作成中...", file=sys.stderr)
+        generate_sales_csv(filename, rows, seed)
+        size_mb = os.path.getsize(filename) / (1024 * 1024)
+        
+        serial = None
+        for workers in worker_counts:
+            print(f"⏱️ ワーカー数 {workers} を計測中...", file=sys.stderr)
+            analyzer = SalesDataAnalyzer()
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                loaded = analyzer.load_from_csv(filename, keep_rows=keep_rows, workers=workers)
+                elapsed = time.perf_counter() - start
+                analyzer.calculate_summary_statistics()
+            
+            if serial is None:
+                serial = analyzer
+                same = loaded
+            elif keep_rows:
+                same = loaded and same_columns(serial.columns, analyzer.columns) and _same_analysis(serial, analyzer)
+            else:
+                same = loaded and _same_analysis(serial, analyzer)
+            results.append({'workers': workers, 'seconds': elapsed, 'same_result': same})
+    finally:
+        if os.path.exists(filename):
+            os.remove(filename)
+        os.rmdir(temp_dir)
+    
+    return {
+        'rows': rows,
+        'seed': seed,
+        'size_mb': size_mb,
+        'keep_rows': keep_rows,
+        'cpu_count': cpu_count,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'same_result': all(result['same_result'] for result in results),
+        'scaling': results
+    }
+
+def print_scaling_report(report):
+    """スケーリングの計測結果を表で表示"""
+    mode = '' if report['keep_rows'] else '、集計のみ'
+    print("=" * 66)
+    print(f"load_from_csv {report['rows']:,}行（{report['size_mb']:.1f} MB、CPU {report['cpu_count']}コア{mode}）")
+    print("-" * 66)
+    print("ワーカー数    秒数      MB/s   速度向上   効率   結果")
+    print("-" * 66)
+    base = report['scaling'][0]['seconds']
+    for result in report['scaling']:
+        workers, elapsed = result['workers'], result['seconds']
+        speedup = base / elapsed
+        mark = '✅' if result['same_result'] else '❌'
+        print(f"{workers:>8}  {elapsed:>8.2f}  {report['size_mb'] / elapsed:>8.2f}  {speedup:>7.2f}x  "
+              f"{speedup / workers:>6.0%}   {mark}")
+    print("=" * 66)
+    
+    if report['same_result']:
+        print("✅ すべてのワーカー数で1プロセスと同じ結果です")
+    else:
+        print("❌ 1プロセスで読み込んだ結果と異なるワーカー数があります")
+
+def print_report(report):
+    """計測結果を表で表示"""
+    print("=" * 70)
+    print(f"売上データ {report['rows']:,}行（計測 {report['repeat']}回の最小値）")
+    print("-" * 70)
+    print(f"{'段階':<32}{'before(秒)':>12}{'after(秒)':>12}{'速度比':>10}")
+    print("-" * 70)
+    total_before = total_after = 0
+    for name in STAGES:
+        before, after = report['stages'][name]['before'], report['stages'][name]['after']
+        total_before += before
+        total_after += after
+        ratio = f"{before / after:.1f}x" if after > 0 else '-'
+        print(f"{name:<32}{before:>12.3f}{after:>12.3f}{ratio:>10}")
+    print("-" * 70)
+    ratio = f"{total_before / total_after:.1f}x" if total_after > 0 else '-'
+    print(f"{'合計':<32}{total_before:>12.3f}{total_after:>12.3f}{ratio:>10}")
+    print("=" * 70)
+    
+    if report['same_result']:
+        print("✅ 従来の方法と同じ結果です")
+    else:
+        print("⚠️ 従来の方法と結果が異なります")
+
+def parse_arguments():
+    """コマンドライン引数を解析"""
+    parser = argparse.ArgumentParser(description="売上データ分析のベンチマーク")
+    parser.add_argument('--rows', type=int, default=1000000, help='売上データの行数')
+    parser.add_argument('--seed', type=int, default=42, help='乱数のシード')
+    parser.add_argument('--repeat', type=int, default=1, help='計測回数（最小値を使う）')
+    parser.add_argument('--scaling', action='store_true', help='並列読み込みのスケーリングを計測する')
+    parser.add_argument('--workers', type=int, nargs='+', help='--scaling で計測するワーカー数（例: 2 4 8）')
+    parser.add_argument('--aggregate', action='store_true', help='--scaling で行を保持せずに読み込む')
+    parser.add_argument('-o', '--output', help='レポート（JSON）の出力先')
+    return parser.parse_args()
+
+def main():
+    """メイン関数"""
+    args = parse_arguments()
+    if args.rows < 1 or args.repeat < 1:
+        print("❌ 行数と計測回数は1以上を指定してください")
+        sys.exit(1)
+    
+    if args.workers and min(args.workers) < 1:
+        print("❌ ワーカー数は1以上を指定してください")
+        sys.exit(1)
+    
+    if args.scaling:
+        report = run_scaling_benchmark(args.rows, args.seed, args.workers, not args.aggregate)
+        print_scaling_report(report)
+    else:
+        report = run_benchmark(args.rows, args.seed, args.repeat)
+        print_report(report)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"✅ レポートを保存しました: {args.output}")
+    
+    if not report['same_result']:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -10,27 +10,61 @@
 - ビジネス分析指標の計算
 - トレンド分析
 - データの集計とグループ化
+- 列指向のデータ保持（sales_columns.py）
+- CSVのストリーミング読み込み（sales_loader.py）
 
 対応章: basics/08_input_output.py完了後
 """
 
+import os
 import csv
 import json
+import math
 import calendar
 from datetime import datetime, timedelta
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import statistics
 
+from sales_columns import FIELDS, SalesColumns, SalesRecords, format_date
+from sales_cube import SalesCube
+from sales_loader import (LoadReport, SalesAggregates, check_header, load_byte_range, read_header,
+                          read_sales_chunks, split_byte_ranges)
+
 class SalesDataAnalyzer:
     """売上データ分析クラス"""
     
     def __init__(self):
         """アナライザーを初期化"""
-        self.sales_data = []  # 売上データのリスト
+        self.columns = SalesColumns()  # 売上データ（項目ごとの列）
         self.summary_stats = {}
         self.monthly_sales = defaultdict(float)
         self.product_sales = defaultdict(float)
         self.region_sales = defaultdict(float)
+        
+        # 全次元の集計キューブ（データが変わるまで各分析で再利用する）
+        self.cube = None
+        
+        # 行を保持せずに読み込んだ場合の集計（load_from_csv(..., keep_rows=False)）
+        self.aggregates = None
+    
+    @property
+    def sales_data(self):
+        """
+        売上データ（1件ずつの読み取り専用の辞書のシーケンスとして参照するビュー）
+        
+        行は列から作るため、ビューや各行の辞書を変更することはできません（TypeError）。
+        変更する場合は [dict(record) for record in analyzer.sales_data] を編集して代入します。
+        """
+        return SalesRecords(self.columns)
+    
+    @sales_data.setter
+    def sales_data(self, records):
+        """売上データの辞書のリストから列を作り直す"""
+        self.columns = SalesColumns()
+        self.aggregates = None
+        for record in records:
+            self.columns.append_record(record)
     
     def generate_sample_data(self, num_records=500):
         """サンプル売上データを生成"""
@@ -41,7 +75,8 @@ class SalesDataAnalyzer:
         regions = ['東京', '大阪', '名古屋', '福岡', '札幌']
         sales_reps = ['田中', '佐藤', '鈴木', '高橋', '伊藤', '渡辺']
         
-        self.sales_data = []
+        self.columns = SalesColumns()
+        self.aggregates = None
         
         # 過去1年分のデータを生成
         start_date = datetime.now() - timedelta(days=365)
@@ -68,56 +103,60 @@ class SalesDataAnalyzer:
             # 数量（1-10個）
             quantity = random.randint(1, 10)
             
-            record = {
-                'date': sale_date.strftime('%Y-%m-%d'),
-                'product': random.choice(products),
-                'region': random.choice(regions),
-                'sales_rep': random.choice(sales_reps),
-                'amount': amount,
-                'quantity': quantity,
-                'unit_price': amount // quantity
-            }
-            
-            self.sales_data.append(record)
+            self.columns.append(sale_date.toordinal(), random.choice(products), random.choice(regions),
+                                random.choice(sales_reps), amount, quantity, amount // quantity)
         
         # 日付でソート
-        self.sales_data.sort(key=lambda x: x['date'])
+        self.columns.sort_by_date()
         
-        print(f"✅ サンプル売上データを生成しました: {len(self.sales_data)}件")
+        print(f"✅ サンプル売上データを生成しました: {len(self.columns)}件")
         return True
     
-    def load_from_csv(self, filename):
-        """CSVファイルから売上データを読み込み"""
+    def has_data(self):
+        """売上データ（行、または行を保持せずに読み込んだ集計）があるか"""
+        return bool(self.columns) or bool(self.aggregates and self.aggregates.count)
+    
+    def load_from_csv(self, filename, keep_rows=True, workers=1):
+        """
+        CSVファイルから売上データを読み込み
+        
+        CSVはチャンク単位で読み込み、必要な列だけを変換して列に追加します。
+        不正な行はスキップし、最後に件数と最初の数行の例を表示します。
+        
+        Args:
+            filename (str): CSVファイル名
+            keep_rows (bool): 行を保持するか。False の場合は集計だけを更新するため
+                メモリ使用量が行数に比例しない（各分析は行えるが、sales_data と CSV出力は空になる）
+            workers (int): 読み込むプロセス数（None の場合はCPUコア数）。2以上の場合は
+                ファイルを行の境界でバイト範囲に分割して並列に読み込む
+                （値の中に改行を含むCSVには使えない）
+        """
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                self.sales_data = []
-                
-                for row in reader:
-                    try:
-                        record = {
-                            'date': row['date'],
-                            'product': row['product'],
-                            'region': row['region'],
-                            'sales_rep': row.get('sales_rep', ''),
-                            'amount': float(row['amount']),
-                            'quantity': int(row.get('quantity', 1)),
-                            'unit_price': float(row.get('unit_price', 0))
-                        }
-                        
-                        # 単価が0の場合は計算
-                        if record['unit_price'] == 0 and record['quantity'] > 0:
-                            record['unit_price'] = record['amount'] / record['quantity']
-                        
-                        self.sales_data.append(record)
-                        
-                    except (ValueError, KeyError) as e:
-                        print(f"⚠️ データ行をスキップ: {e}")
-                        continue
-                
-                print(f"✅ CSVから読み込みました: {len(self.sales_data)}件")
-                return True
-                
+            if workers is None:
+                workers = os.cpu_count() or 1
+            
+            if workers > 1:
+                columns, aggregates, report = self._load_csv_parallel(filename, keep_rows, workers)
+            else:
+                with open(filename, 'r', encoding='utf-8', newline='') as f:
+                    columns = SalesColumns()
+                    aggregates = None if keep_rows else SalesAggregates()
+                    report = LoadReport()
+                    
+                    # 日付は読み込み時に1回だけ変換する（同じ日付の文字列は変換結果を再利用）
+                    for chunk in read_sales_chunks(f, report, parse_date=columns.date_parser):
+                        if keep_rows:
+                            columns.extend(chunk)
+                        else:
+                            aggregates.update(chunk)
+            
+            self.columns = columns
+            self.aggregates = aggregates
+            
+            report.print_summary()
+            print(f"✅ CSVから読み込みました: {report.rows}件" + ("" if keep_rows else "（集計のみ）"))
+            return True
+            
         except FileNotFoundError:
             print(f"❌ ファイルが見つかりません: {filename}")
             return False
@@ -125,20 +164,52 @@ class SalesDataAnalyzer:
             print(f"❌ CSV読み込みエラー: {e}")
             return False
     
+    def _load_csv_parallel(self, filename, keep_rows, workers):
+        """
+        CSVをバイト範囲に分割し、プロセスプールで読み込んで結合
+        
+        範囲の順番に結合するため、カテゴリ値の番号や行の順番は
+        1プロセスで読み込んだ場合と同じになります。
+        
+        Returns:
+            tuple: (SalesColumns, SalesAggregates（keep_rows の場合は None）, LoadReport)
+        """
+        columns = SalesColumns()
+        aggregates = None if keep_rows else SalesAggregates()
+        report = LoadReport()
+        
+        header, data_start = read_header(filename)
+        if header is None:
+            return columns, aggregates, report
+        # データ行がない場合も1プロセスで読み込んだ場合と同じエラーにする
+        check_header(header)
+        report.lines = 1
+        
+        # ワーカー数より多めに分割して、処理時間のばらつきをならす
+        ranges = split_byte_ranges(filename, workers * 4, data_start)
+        count = len(ranges)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = executor.map(load_byte_range, [filename] * count, [start for start, _ in ranges],
+                                    [end for _, end in ranges], [header] * count, [keep_rows] * count)
+            for partial, partial_report in partials:
+                (columns if keep_rows else aggregates).merge(partial)
+                report.merge(partial_report)
+        
+        return columns, aggregates, report
+    
     def export_to_csv(self, filename="sales_export.csv"):
         """売上データをCSVにエクスポート"""
         try:
             with open(filename, 'w', newline='', encoding='utf-8') as f:
-                if not self.sales_data:
+                if not self.columns:
                     print("❌ エクスポートするデータがありません")
                     return False
                 
-                fieldnames = self.sales_data[0].keys()
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for record in self.sales_data:
-                    writer.writerow(record)
+                columns = self.columns
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                writer.writerows(zip(map(format_date, columns.dates), columns.products, columns.regions,
+                                     columns.sales_reps, columns.amounts, columns.quantities, columns.unit_prices))
             
             print(f"✅ CSVにエクスポートしました: {filename}")
             return True
@@ -149,149 +220,176 @@ class SalesDataAnalyzer:
     
     def calculate_summary_statistics(self):
         """基本統計を計算"""
-        if not self.sales_data:
+        if not self.has_data():
             print("❌ データが読み込まれていません")
             return False
         
         # 基本統計
-        amounts = [record['amount'] for record in self.sales_data]
-        quantities = [record['quantity'] for record in self.sales_data]
-        
-        total_sales = sum(amounts)
-        total_quantity = sum(quantities)
-        avg_sale = statistics.mean(amounts)
-        median_sale = statistics.median(amounts)
+        if self.columns:
+            amounts = self.columns.amounts.data
+            
+            total_records = len(self.columns)
+            # 小数の金額は足す順番によらない正確な合計にする（集計のみの読み込み・並列読み込みと同じ値）
+            total_sales = math.fsum(amounts) if amounts.typecode == 'd' else sum(amounts)
+            total_quantity = sum(self.columns.quantities)
+            avg_sale = statistics.mean(amounts)
+            median_sale = statistics.median(amounts)
+            max_sale, min_sale = max(amounts), min(amounts)
+            
+            # 日付は日の通し番号で保持している
+            min_date = min(self.columns.dates)
+            max_date = max(self.columns.dates)
+        else:
+            # 行を保持せずに読み込んだ場合は集計から求める
+            aggregates = self.aggregates
+            
+            total_records = aggregates.count
+            total_sales = aggregates.total_sales
+            total_quantity = aggregates.total_quantity
+            avg_sale = aggregates.mean()
+            median_sale = aggregates.median()
+            max_sale, min_sale = max(aggregates.amount_counts), min(aggregates.amount_counts)
+            min_date, max_date = aggregates.min_date, aggregates.max_date
         
         # 期間の計算
-        dates = [datetime.strptime(record['date'], '%Y-%m-%d') for record in self.sales_data]
-        min_date = min(dates)
-        max_date = max(dates)
-        date_range = (max_date - min_date).days + 1
+        date_range = max_date - min_date + 1
         
         # 日平均売上
         daily_avg = total_sales / date_range if date_range > 0 else 0
         
         self.summary_stats = {
-            'total_records': len(self.sales_data),
+            'total_records': total_records,
             'total_sales': total_sales,
             'total_quantity': total_quantity,
             'average_sale': avg_sale,
             'median_sale': median_sale,
-            'max_sale': max(amounts),
-            'min_sale': min(amounts),
+            'max_sale': max_sale,
+            'min_sale': min_sale,
             'date_range_days': date_range,
             'daily_average': daily_avg,
-            'start_date': min_date.strftime('%Y-%m-%d'),
-            'end_date': max_date.strftime('%Y-%m-%d')
+            'start_date': format_date(min_date),
+            'end_date': format_date(max_date)
         }
         
         print("✅ 基本統計計算完了")
         return True
     
+    def get_cube(self):
+        """
+        月・日・商品・地域・担当者の集計キューブを取得
+        
+        データを1回走査して作成し、データが変わるまで再利用します。
+        各分析はキューブをロールアップして求めるため、ビジネスレポートのように
+        複数の分析を行ってもデータの走査は1回で済みます。
+        
+        Returns:
+            SalesCube: 集計キューブ
+        """
+        if not self.columns and self.aggregates is not None:
+            return self.aggregates.cube()
+        
+        cube = self.cube
+        if cube is None or cube.columns is not self.columns or cube.version != self.columns.version:
+            self.cube = cube = SalesCube(self.columns)
+        return cube
+    
+    def analyze_dimensions(self, *dimensions):
+        """
+        次元の組み合わせ（例: 'product', 'region'）ごとに売上を集計
+        
+        Args:
+            *dimensions: 'month'・'day'・'product'・'region'・'sales_rep'
+        
+        Returns:
+            dict: 次元の値のタプルと統計（売上高・数量・取引数・平均取引額）の辞書
+        """
+        stats = {}
+        for key, sales, quantity, count in self.get_cube().rollup(*dimensions):
+            stats[key] = {
+                'sales': sales,
+                'quantity': quantity,
+                'transactions': count,
+                'avg_per_transaction': sales / count if count > 0 else 0
+            }
+        return stats
+    
     def analyze_monthly_trends(self):
         """月別売上トレンドを分析"""
-        self.monthly_sales = defaultdict(float)
-        monthly_quantity = defaultdict(int)
-        monthly_count = defaultdict(int)
-        
-        for record in self.sales_data:
-            date_obj = datetime.strptime(record['date'], '%Y-%m-%d')
-            month_key = date_obj.strftime('%Y-%m')
-            
-            self.monthly_sales[month_key] += record['amount']
-            monthly_quantity[month_key] += record['quantity']
-            monthly_count[month_key] += 1
+        totals = [(month, float(sales), quantity, count)
+                  for (month,), sales, quantity, count in self.get_cube().rollup('month')]
+        self.monthly_sales = defaultdict(float, {month: sales for month, sales, _, _ in totals})
         
         # 月別統計を計算
         monthly_stats = {}
-        for month in self.monthly_sales:
+        for month, sales, quantity, count in totals:
             monthly_stats[month] = {
-                'sales': self.monthly_sales[month],
-                'quantity': monthly_quantity[month],
-                'transactions': monthly_count[month],
-                'avg_per_transaction': self.monthly_sales[month] / monthly_count[month] if monthly_count[month] > 0 else 0
+                'sales': sales,
+                'quantity': quantity,
+                'transactions': count,
+                'avg_per_transaction': sales / count if count > 0 else 0
             }
         
         return monthly_stats
     
     def analyze_product_performance(self):
         """商品別パフォーマンスを分析"""
-        self.product_sales = defaultdict(float)
-        product_quantity = defaultdict(int)
-        product_count = defaultdict(int)
-        
-        for record in self.sales_data:
-            product = record['product']
-            self.product_sales[product] += record['amount']
-            product_quantity[product] += record['quantity']
-            product_count[product] += 1
+        totals = [(product, float(sales), quantity, count)
+                  for (product,), sales, quantity, count in self.get_cube().rollup('product')]
+        self.product_sales = defaultdict(float, {product: sales for product, sales, _, _ in totals})
         
         # 商品別統計
         product_stats = {}
-        for product in self.product_sales:
+        for product, sales, quantity, count in totals:
             product_stats[product] = {
-                'sales': self.product_sales[product],
-                'quantity': product_quantity[product],
-                'transactions': product_count[product],
-                'avg_unit_price': self.product_sales[product] / product_quantity[product] if product_quantity[product] > 0 else 0,
-                'avg_per_transaction': self.product_sales[product] / product_count[product] if product_count[product] > 0 else 0
+                'sales': sales,
+                'quantity': quantity,
+                'transactions': count,
+                'avg_unit_price': sales / quantity if quantity > 0 else 0,
+                'avg_per_transaction': sales / count if count > 0 else 0
             }
         
         return product_stats
     
     def analyze_regional_performance(self):
         """地域別パフォーマンスを分析"""
-        self.region_sales = defaultdict(float)
-        region_quantity = defaultdict(int)
-        region_count = defaultdict(int)
-        
-        for record in self.sales_data:
-            region = record['region']
-            self.region_sales[region] += record['amount']
-            region_quantity[region] += record['quantity']
-            region_count[region] += 1
+        totals = [(region, float(sales), quantity, count)
+                  for (region,), sales, quantity, count in self.get_cube().rollup('region')]
+        self.region_sales = defaultdict(float, {region: sales for region, sales, _, _ in totals})
         
         # 地域別統計
         region_stats = {}
-        for region in self.region_sales:
+        for region, sales, quantity, count in totals:
             region_stats[region] = {
-                'sales': self.region_sales[region],
-                'quantity': region_quantity[region],
-                'transactions': region_count[region],
-                'avg_per_transaction': self.region_sales[region] / region_count[region] if region_count[region] > 0 else 0,
-                'market_share': (self.region_sales[region] / self.summary_stats['total_sales']) * 100 if 'total_sales' in self.summary_stats else 0
+                'sales': sales,
+                'quantity': quantity,
+                'transactions': count,
+                'avg_per_transaction': sales / count if count > 0 else 0,
+                'market_share': (sales / self.summary_stats['total_sales']) * 100 if 'total_sales' in self.summary_stats else 0
             }
         
         return region_stats
     
     def analyze_sales_rep_performance(self):
         """営業担当者別パフォーマンスを分析"""
-        rep_stats = defaultdict(lambda: {'sales': 0, 'quantity': 0, 'transactions': 0})
-        
-        for record in self.sales_data:
-            rep = record.get('sales_rep', '不明')
-            rep_stats[rep]['sales'] += record['amount']
-            rep_stats[rep]['quantity'] += record['quantity']
-            rep_stats[rep]['transactions'] += 1
-        
-        # 平均取引額を計算
-        for rep in rep_stats:
-            if rep_stats[rep]['transactions'] > 0:
-                rep_stats[rep]['avg_per_transaction'] = rep_stats[rep]['sales'] / rep_stats[rep]['transactions']
-            else:
-                rep_stats[rep]['avg_per_transaction'] = 0
+        rep_stats = {}
+        
+        for (rep,), sales, quantity, count in self.get_cube().rollup('sales_rep'):
+            rep_stats[rep] = {
+                'sales': sales,
+                'quantity': quantity,
+                'transactions': count,
+                # 平均取引額
+                'avg_per_transaction': sales / count if count > 0 else 0
+            }
         
-        return dict(rep_stats)
+        return rep_stats
     
     def get_top_selling_days(self, n=10):
         """売上上位の日を取得"""
-        daily_sales = defaultdict(float)
-        
-        for record in self.sales_data:
-            daily_sales[record['date']] += record['amount']
+        days = [(day, float(sales)) for (day,), sales, _, _ in self.get_cube().rollup('day')]
         
         # 売上順でソート
-        sorted_days = sorted(daily_sales.items(), key=lambda x: x[1], reverse=True)
+        sorted_days = sorted(days, key=lambda x: x[1], reverse=True)
         return sorted_days[:n]
     
     def calculate_growth_rate(self, period='monthly'):
@@ -508,7 +606,7 @@ class SalesAnalyzerUI:
     
     def show_monthly_trends(self):
         """月別トレンドを表示"""
-        if not self.analyzer.sales_data:
+        if not self.analyzer.has_data():
             print("❌ まずデータを読み込んでください")
             return
         
@@ -533,7 +631,7 @@ class SalesAnalyzerUI:
     
     def show_product_performance(self):
         """商品別パフォーマンスを表示"""
-        if not self.analyzer.sales_data:
+        if not self.analyzer.has_data():
             print("❌ まずデータを読み込んでください")
             return
         
@@ -560,7 +658,7 @@ class SalesAnalyzerUI:
     
     def show_regional_performance(self):
         """地域別パフォーマンスを表示"""
-        if not self.analyzer.sales_data:
+        if not self.analyzer.has_data():
             print("❌ まずデータを読み込んでください")
             return
         
@@ -587,7 +685,7 @@ class SalesAnalyzerUI:
     
     def show_sales_rep_performance(self):
         """営業担当者別パフォーマンス"""
-        if not self.analyzer.sales_data:
+        if not self.analyzer.has_data():
             print("❌ まずデータを読み込んでください")
             return
         
@@ -609,7 +707,7 @@ class SalesAnalyzerUI:
     
     def show_top_selling_days(self):
         """売上上位日を表示"""
-        if not self.analyzer.sales_data:
+        if not self.analyzer.has_data():
             print("❌ まずデータを読み込んでください")
             return
         
@@ -637,7 +735,7 @@ class SalesAnalyzerUI:
     
     def show_growth_analysis(self):
         """成長率分析を表示"""
-        if not self.analyzer.sales_data:
+        if not self.analyzer.has_data():
             print("❌ まずデータを読み込んでください")
             return
         
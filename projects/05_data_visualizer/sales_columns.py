@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+プロジェクト5: 列指向の売上データ
+
+売上データを1件ずつの辞書ではなく、項目ごとの配列（列）で保持します。
+
+- 日付: 日の通し番号（date.toordinal()）の array('i')（読み込み時に1回だけ変換）
+- 商品・地域・担当者: 辞書符号化（値の一覧と、各行の値の番号の array('I')）
+- 金額・単価: 整数なら array('q')、小数を含めば array('d')
+- 数量: array('q')
+
+同じ文字列を行ごとに持たないため、100万件で数GBになる辞書のリストに比べて
+メモリ使用量は数十MBになります。集計は値の番号ごとにリストの要素へ足し込むため、
+文字列のハッシュ計算や辞書の参照が不要になります。
+
+学習ポイント:
+- array モジュールによる型付きの列
+- 辞書符号化（カテゴリ値を整数の番号に置き換える）
+- 番号によるグループ集計
+"""
+
+import math
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from datetime import date, datetime
+from types import MappingProxyType
+
+# 1件の売上データの項目
+FIELDS = ('date', 'product', 'region', 'sales_rep', 'amount', 'quantity', 'unit_price')
+
+# 部分和にまとめずにそのまま保持する売上高の数の上限
+PARTIAL_VALUES_LIMIT = 32
+
+def parse_date(text):
+    """
+    'YYYY-MM-DD' 形式の日付を日の通し番号に変換
+    
+    ISO形式の日付は date.fromisoformat で変換します（strptime の数十倍速い）。
+    それ以外（'2024-1-5' など）は strptime で変換します。
+    
+    Raises:
+        ValueError: 日付の形式が正しくない場合
+    """
+    if len(text) == 10 and text[4] == '-' and text[7] == '-':
+        try:
+            return date.fromisoformat(text).toordinal()
+        except ValueError:
+            pass
+    return datetime.strptime(text, '%Y-%m-%d').toordinal()
+
+def format_date(ordinal):
+    """日の通し番号を 'YYYY-MM-DD' 形式の文字列に変換"""
+    return date.fromordinal(ordinal).isoformat()
+
+class DateParser:
+    """変換した日付を覚えておき、同じ文字列を2回変換しない parse_date"""
+    
+    def __init__(self):
+        self.cache = {}    # 日付の文字列 -> 日の通し番号
+    
+    def __call__(self, text):
+        ordinal = self.cache.get(text)
+        if ordinal is None:
+            ordinal = self.cache[text] = parse_date(text)
+        return ordinal
+
+class CategoryColumn:
+    """文字列を辞書符号化して保持する列"""
+    
+    def __init__(self):
+        self.values = []           # 番号 -> 値
+        self.index = {}            # 値 -> 番号
+        self.codes = array('I')    # 各行の値の番号
+    
+    def encode(self, value):
+        """値の番号を取得（初めての値には新しい番号を割り当てる）"""
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.index[value] = code
+            self.values.append(value)
+        return code
+    
+    def append(self, value):
+        """値を末尾に追加"""
+        self.codes.append(self.encode(value))
+    
+    def extend(self, values):
+        """値をまとめて末尾に追加"""
+        self.codes.extend(map(self.encode, values))
+    
+    def __len__(self):
+        return len(self.codes)
+    
+    def __getitem__(self, index):
+        return self.values[self.codes[index]]
+    
+    def __iter__(self):
+        return map(self.values.__getitem__, self.codes)
+    
+    def reorder(self, order):
+        """行を order の順番に並べ替える"""
+        self.codes = array('I', map(self.codes.__getitem__, order))
+
+class NumberColumn:
+    """数値の列（整数だけの間は array('q')、小数を追加すると array('d') に切り替える）"""
+    
+    def __init__(self, typecode='q'):
+        """
+        Args:
+            typecode (str): 最初の型（'q' は整数、'd' は小数）
+        """
+        self.data = array(typecode)
+    
+    def append(self, value):
+        """値を末尾に追加"""
+        if self.data.typecode == 'q' and not isinstance(value, int):
+            self.data = array('d', self.data)
+        self.data.append(value)
+    
+    def extend(self, values):
+        """値をまとめて末尾に追加"""
+        if self.data.typecode == 'q' and not all(isinstance(value, int) for value in values):
+            self.data = array('d', self.data)
+        if isinstance(values, array) and values.typecode != self.data.typecode:
+            values = values.tolist()    # 型の異なる array はそのまま extend できない
+        self.data.extend(values)
+    
+    def __len__(self):
+        return len(self.data)
+    
+    def __getitem__(self, index):
+        return self.data[index]
+    
+    def __iter__(self):
+        return iter(self.data)
+    
+    def reorder(self, order):
+        """行を order の順番に並べ替える"""
+        self.data = array(self.data.typecode, map(self.data.__getitem__, order))
+
+class SalesColumns:
+    """売上データを項目ごとの列で保持するクラス"""
+    
+    def __init__(self):
+        self.dates = array('i')        # 日の通し番号
+        self.products = CategoryColumn()
+        self.regions = CategoryColumn()
+        self.sales_reps = CategoryColumn()
+        self.amounts = NumberColumn()
+        self.quantities = array('q')
+        self.unit_prices = NumberColumn()
+        
+        # データを変更するたびに増やす（集計結果を再利用できるか判定するため）
+        self.version = 0
+        
+        # 日付の文字列の変換結果（append_record で使う）
+        self.date_parser = DateParser()
+        
+        # 年月の列（(version, 年月の一覧, 各行の年月の番号)。months() で作成）
+        self._months = None
+    
+    def __len__(self):
+        return len(self.dates)
+    
+    def append(self, date_ordinal, product, region, sales_rep, amount, quantity, unit_price):
+        """1件追加（日付は日の通し番号）"""
+        self.dates.append(date_ordinal)
+        self.products.append(product)
+        self.regions.append(region)
+        self.sales_reps.append(sales_rep)
+        self.amounts.append(amount)
+        self.quantities.append(quantity)
+        self.unit_prices.append(unit_price)
+        self.version += 1
+    
+    def extend(self, rows):
+        """
+        行をまとめて追加
+        
+        Args:
+            rows (list): (日の通し番号, 商品, 地域, 担当者, 金額, 数量, 単価) のタプルのリスト
+        """
+        if not rows:
+            return
+        dates, products, regions, sales_reps, amounts, quantities, unit_prices = zip(*rows)
+        self.dates.extend(dates)
+        self.products.extend(products)
+        self.regions.extend(regions)
+        self.sales_reps.extend(sales_reps)
+        self.amounts.extend(amounts)
+        self.quantities.extend(quantities)
+        self.unit_prices.extend(unit_prices)
+        self.version += 1
+    
+    def merge(self, other):
+        """
+        別の SalesColumns の行を末尾に追加（カテゴリ値の番号はこちらの番号に付け替える）
+        
+        ファイルを分割して読み込んだ列を順番に結合すると、ファイル全体を読み込んだ場合と
+        同じ列（カテゴリ値の番号の順番を含む）になります。
+        """
+        self.dates.extend(other.dates)
+        for mine, theirs in ((self.products, other.products), (self.regions, other.regions),
+                             (self.sales_reps, other.sales_reps)):
+            codes = [mine.encode(value) for value in theirs.values]
+            mine.codes.extend(map(codes.__getitem__, theirs.codes))
+        self.amounts.extend(other.amounts.data)
+        self.quantities.extend(other.quantities)
+        self.unit_prices.extend(other.unit_prices.data)
+        self.date_parser.cache.update(other.date_parser.cache)
+        self.version += 1
+    
+    def append_record(self, record):
+        """
+        売上データの辞書を1件追加（担当者がない場合は '不明'）
+        
+        Raises:
+            ValueError: 日付の形式が正しくない場合
+            KeyError: 必要な項目がない場合
+        """
+        self.append(self.date_parser(record['date']), record['product'], record['region'],
+                    record.get('sales_rep', '不明'), record['amount'], record.get('quantity', 1),
+                    record.get('unit_price', 0))
+    
+    def months(self):
+        """
+        各行の年月の番号の列（データが変わるまで再利用する）
+        
+        年月（'YYYY-MM'）への変換は日付の種類ごとに1回だけ行います。
+        
+        Returns:
+            tuple: (番号 -> 年月のリスト, 各行の年月の番号の array('I'))
+        """
+        if self._months is None or self._months[0] != self.version:
+            months = CategoryColumn()
+            month_of_day = {ordinal: months.encode(format_date(ordinal)[:7]) for ordinal in dict.fromkeys(self.dates)}
+            self._months = (self.version, months.values, array('I', map(month_of_day.__getitem__, self.dates)))
+        return self._months[1:]
+    
+    def record(self, index):
+        """index 行目を売上データの辞書として取得"""
+        return {
+            'date': format_date(self.dates[index]),
+            'product': self.products[index],
+            'region': self.regions[index],
+            'sales_rep': self.sales_reps[index],
+            'amount': self.amounts[index],
+            'quantity': self.quantities[index],
+            'unit_price': self.unit_prices[index]
+        }
+    
+    def sort_by_date(self):
+        """日付順に並べ替える（同じ日付の行は元の順番を保つ）"""
+        order = sorted(range(len(self)), key=self.dates.__getitem__)
+        self.dates = array('i', map(self.dates.__getitem__, order))
+        self.quantities = array('q', map(self.quantities.__getitem__, order))
+        for column in (self.products, self.regions, self.sales_reps, self.amounts, self.unit_prices):
+            column.reorder(order)
+        self.version += 1
+    
+    def memory_size(self):
+        """列の配列のバイト数（カテゴリ値の一覧は含まない）"""
+        arrays = (self.dates, self.products.codes, self.regions.codes, self.sales_reps.codes,
+                  self.amounts.data, self.quantities, self.unit_prices.data)
+        return sum(column.itemsize * len(column) for column in arrays)
+
+class SalesRecords(Sequence):
+    """
+    SalesColumns を売上データのシーケンスとして見せる読み取り専用のビュー
+    
+    各行は参照するたびに列から作る読み取り専用の辞書（MappingProxyType）です。
+    行の変更・削除・並べ替えはできません（TypeError）。変更する場合は
+    dict(record) で辞書のリストを作って編集し、analyzer.sales_data に代入してください。
+    追加は append・extend で行えます。
+    """
+    
+    def __init__(self, columns):
+        self.columns = columns
+    
+    def __len__(self):
+        return len(self.columns)
+    
+    def _record(self, index):
+        """index 行目の読み取り専用の辞書"""
+        return MappingProxyType(self.columns.record(index))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("売上データの範囲外です")
+        return self._record(index)
+    
+    def __setitem__(self, index, record):
+        raise TypeError("sales_data は読み取り専用です（変更する場合は辞書のリストを sales_data に代入してください）")
+    
+    def __delitem__(self, index):
+        raise TypeError("sales_data は読み取り専用です（変更する場合は辞書のリストを sales_data に代入してください）")
+    
+    def __iter__(self):
+        return map(self._record, range(len(self)))
+    
+    def append(self, record):
+        """売上データの辞書を1件追加"""
+        self.columns.append_record(record)
+    
+    def extend(self, records):
+        """売上データの辞書を追加"""
+        for record in records:
+            self.columns.append_record(record)
+
+def first_seen(codes):
+    """値の番号を最初に出現した順に並べたリスト"""
+    return list(dict.fromkeys(codes))
+
+def group_counts(codes, group_count):
+    """値の番号ごとの件数のリスト"""
+    counts = [0] * group_count
+    for code, count in Counter(codes).items():
+        counts[code] = count
+    return counts
+
+def exact_partials(values):
+    """
+    values の合計を丸めずに表す小数のリスト（部分和）
+    
+    部分和を math.fsum で合計すると、足す順番によらず正しく丸めた合計になります。
+    部分和に値や他の部分和を追加して求め直しても、すべての値を1回で合計した場合と同じです。
+    
+    Args:
+        values (iterable): 合計する値
+    
+    Returns:
+        list: 部分和（大きい順。合計が0の場合は空）
+    """
+    rest = list(values)
+    if len(rest) == 1:
+        # 1つの値はそのままで正確
+        return rest if rest[0] != 0 else []
+    if len(rest) == 2:
+        # 2つの値は TwoSum（和と丸めの誤差を足し算だけで正確に求める）で分ける
+        first, second = rest
+        total = first + second
+        if math.isfinite(total):
+            second_part = total - first
+            error = (first - (total - second_part)) + (second - second_part)
+            return [total, error] if error else ([total] if total else [])
+    partials = []
+    while True:
+        # 残りの値と、これまでの部分和を引いた値の合計を正しく丸める（丸めの誤差が次の部分和になる）
+        try:
+            partial = math.fsum(rest)
+        except OverflowError:
+            return [sum(rest)]    # 合計が小数の範囲を超える場合は sum と同じく inf
+        if partial == 0:
+            return partials
+        partials.append(partial)
+        if not math.isfinite(partial):
+            return partials
+        rest.append(-partial)
+
+def extend_partials(partials, values):
+    """
+    部分和（または値）のリストに値を加えたリスト
+    
+    値は PARTIAL_VALUES_LIMIT 個まではそのまま並べ、超えた場合だけ
+    exact_partials で部分和にまとめます（どちらも math.fsum で正確な合計になる）。
+    
+    Args:
+        partials (list): 部分和、または値のリスト
+        values (list): 加える値（部分和でもよい）
+    
+    Returns:
+        list: 新しいリスト
+    """
+    combined = partials + values
+    return combined if len(combined) <= PARTIAL_VALUES_LIMIT else exact_partials(combined)
+
+def group_sums(codes, group_count, values, start=0):
+    """
+    値の番号ごとに values を合計したリスト
+    
+    行の順番に足し込むため、辞書で1件ずつ集計した場合と同じ値になります。
+    
+    Args:
+        codes (iterable): 各行の値の番号
+        group_count (int): 値の種類数
+        values (iterable): 合計する列
+        start: 合計の初期値（0 または 0.0）
+    """
+    sums = [start] * group_count
+    for code, value in zip(codes, values):
+        sums[code] += value
+    return sums
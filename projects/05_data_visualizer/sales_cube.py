@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+プロジェクト5: 売上データの集計キューブ
+
+売上データを1回走査して、次元（月・日・商品・地域・担当者）の組み合わせ
+（セル）ごとに売上高・数量・取引数を集計します。月別・商品別・地域別などの
+分析は、データを走査し直さずにセルを足し合わせて（ロールアップして）求めます。
+小数の売上高はセルごとに丸めない値（または部分和）で保持するため、ロールアップした合計は
+足し合わせる順番によらず、すべての行を math.fsum で合計した値と同じになります。
+
+学習ポイント:
+- 多次元の集計（OLAPのキューブ）
+- 複数の番号を1つの整数にまとめる方法（位取り）
+- ロールアップによる集計結果の再利用
+"""
+
+import math
+from array import array
+from collections import defaultdict
+from itertools import repeat
+from operator import add, mul
+
+from sales_columns import (CategoryColumn, format_date, first_seen, group_counts, PARTIAL_VALUES_LIMIT,
+                           exact_partials)
+
+# 集計できる次元
+CUBE_DIMENSIONS = ('month', 'day', 'product', 'region', 'sales_rep')
+
+# セルの組み合わせの数がこれ以下なら、まとめた整数をそのままリストの添字に使う
+DENSE_CELL_LIMIT = 1 << 20
+
+class _Axis:
+    """キューブの軸（番号の列と、番号から値を求める方法）"""
+    
+    def __init__(self, name, codes, size, label):
+        self.name = name
+        self.codes = codes    # 各行の番号
+        self.size = size      # 番号の種類数（0 から size - 1）
+        self.label = label    # 番号 -> 値 の関数
+
+class SalesCube:
+    """売上データを次元の組み合わせごとに集計したキューブ"""
+    
+    def __init__(self, columns, dimensions=CUBE_DIMENSIONS, weights=None, sales_partials=None):
+        """
+        データを1回走査してキューブを作成
+        
+        Args:
+            columns (SalesColumns): 売上データ
+            dimensions (tuple): 集計する次元（'month'・'day'・'product'・'region'・'sales_rep'）
+            weights (array): 各行が表す取引数（省略時はすべて1。集計済みの行から作成する場合に使う）
+            sales_partials (list): 各行の売上高を丸めずに表すリスト（値または部分和）のリスト
+                （省略時は売上高の列。集計済みの行から作成する場合に、丸める前の合計を渡す）
+        
+        Raises:
+            ValueError: 不明な次元を指定した場合
+        """
+        unknown = set(dimensions) - set(CUBE_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"不明な次元です: {', '.join(sorted(unknown))}")
+        
+        self.columns = columns
+        self.version = columns.version
+        self.dimensions = tuple(name for name in CUBE_DIMENSIONS if name in dimensions)
+        self.axes = self._create_axes(columns)
+        self._build(columns, weights, sales_partials)
+    
+    def _create_axes(self, columns):
+        """集計に使う軸を作成（'day' があれば日の軸から月も求める）"""
+        axes = []
+        dates = columns.dates
+        if 'day' in self.dimensions:
+            # 日は最も古い日からの日数を番号にする
+            first_day = min(dates, default=0)
+            size = max(dates) - first_day + 1 if dates else 0
+            axes.append(_Axis('day', array('I', (ordinal - first_day for ordinal in dates)), size,
+                              lambda code: format_date(first_day + code)))
+        elif 'month' in self.dimensions:
+            months, codes = columns.months()
+            axes.append(_Axis('month', codes, len(months), months.__getitem__))
+        
+        for name in ('product', 'region', 'sales_rep'):
+            if name in self.dimensions:
+                column = getattr(columns, name + 's')
+                axes.append(_Axis(name, column.codes, len(column.values), column.values.__getitem__))
+        return axes
+    
+    def _build(self, columns, weights, sales_partials):
+        """各行のセルの番号を求め、セルごとに売上高・数量・取引数を集計"""
+        # 軸の番号を位取りで1つの整数にまとめる（key * size + code を map で計算）
+        keys = [0] * len(columns)
+        space = 1
+        for axis in self.axes:
+            keys = list(map(add, map(mul, keys, repeat(axis.size)), axis.codes))
+            space *= axis.size
+        cell_keys = first_seen(keys)
+        
+        if space > DENSE_CELL_LIMIT:
+            # 組み合わせが多い場合は、出現したセルだけに 0, 1, 2, ... の番号を振り直す
+            cell_index = {key: i for i, key in enumerate(cell_keys)}
+            keys = list(map(cell_index.__getitem__, keys))
+            positions = range(len(cell_keys))
+            space = len(cell_keys)
+        else:
+            positions = cell_keys
+        
+        # 1回の走査で売上高と数量を合計
+        quantities = [0] * space
+        if sales_partials is None and columns.amounts.data.typecode == 'q':
+            # 整数の売上高はそのまま足しても正確
+            self.sales_partials = None
+            sales = [0] * space
+            for key, amount, quantity in zip(keys, columns.amounts.data, columns.quantities):
+                sales[key] += amount
+                quantities[key] += quantity
+        else:
+            # 小数の売上高はセルごとに値を集める（多い場合だけ部分和にまとめる）
+            values = defaultdict(list)
+            if sales_partials is None:
+                for key, amount, quantity in zip(keys, columns.amounts.data, columns.quantities):
+                    values[key].append(amount)
+                    quantities[key] += quantity
+            else:
+                for key, partials, quantity in zip(keys, sales_partials, columns.quantities):
+                    values[key] += partials
+                    quantities[key] += quantity
+            self.sales_partials = [sales if len(sales) <= PARTIAL_VALUES_LIMIT else exact_partials(sales)
+                                   for sales in map(values.__getitem__, positions)]
+            del values
+        if weights is None:
+            counts = group_counts(keys, space)
+        else:
+            counts = [0] * space
+            for key, weight in zip(keys, weights):
+                counts[key] += weight
+        del keys
+        
+        # 出現したセルだけを最初に出現した順に残す
+        if self.sales_partials is None:
+            self.sales = [sales[position] for position in positions]
+        else:
+            self.sales = list(map(math.fsum, self.sales_partials))
+        self.quantities = [quantities[position] for position in positions]
+        self.counts = [counts[position] for position in positions]
+        
+        # セルの番号 -> 軸ごとの番号のタプル
+        self.cells = []
+        for key in cell_keys:
+            coordinates = []
+            for axis in reversed(self.axes):
+                key, code = divmod(key, axis.size)
+                coordinates.append(code)
+            self.cells.append(tuple(reversed(coordinates)))
+    
+    def __len__(self):
+        """セルの数"""
+        return len(self.cells)
+    
+    def rollup(self, *dimensions):
+        """
+        指定した次元ごとにセルを足し合わせる
+        
+        Args:
+            *dimensions: 次元（キューブに含まれるもの。'day' を含むキューブからは 'month' も求められる）
+        
+        Returns:
+            list: (次元の値のタプル, 売上高, 数量, 取引数) のリスト（値が最初に出現した順）
+        
+        Raises:
+            ValueError: キューブに含まれない次元を指定した場合
+        """
+        getters = [self._code_getter(name) for name in dimensions]
+        
+        # 小数の売上高はセルの値（部分和）をつなげておき、最後に math.fsum で正確に合計する
+        exact = self.sales_partials is not None
+        groups = {}
+        for cell, sales, quantity, count in zip(self.cells, self.sales_partials if exact else self.sales,
+                                                self.quantities, self.counts):
+            key = tuple(getter(cell) for getter, _ in getters)
+            totals = groups.get(key)
+            if totals is None:
+                groups[key] = [list(sales) if exact else sales, quantity, count]
+            else:
+                totals[0] += sales
+                totals[1] += quantity
+                totals[2] += count
+        
+        return [(tuple(label(code) for (_, label), code in zip(getters, key)),
+                 math.fsum(sales) if exact else sales, quantity, count)
+                for key, (sales, quantity, count) in groups.items()]
+    
+    def _code_getter(self, name):
+        """
+        セルから次元の番号を取り出す関数と、番号 -> 値 の関数を作成
+        
+        Returns:
+            tuple: (セル -> 番号 の関数, 番号 -> 値 の関数)
+        """
+        for position, axis in enumerate(self.axes):
+            if axis.name == name:
+                return (lambda cell: cell[position]), axis.label
+        
+        if name == 'month' and self.axes and self.axes[0].name == 'day':
+            # 日の番号 -> 月の番号（日付の種類ごとに1回だけ変換）
+            day_label = self.axes[0].label
+            months = CategoryColumn()
+            month_of_day = {}
+            
+            def month_code(cell):
+                day = cell[0]
+                code = month_of_day.get(day)
+                if code is None:
+                    code = month_of_day[day] = months.encode(day_label(day)[:7])
+                return code
+            return month_code, months.values.__getitem__
+        
+        raise ValueError(f"キューブに含まれない次元です: {name}")
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+プロジェクト5: 売上データCSVのストリーミング読み込み
+
+売上データのCSVを CHUNK_ROWS 行ずつ読み込み、必要な列だけを位置で取り出して
+変換します。1行ごとに辞書を作らないため、数GBのCSVでも読み込みが速く、
+読み込み中のメモリ使用量はチャンク1つ分で済みます。
+
+- 不正な行はスキップし、件数と最初の数行の例を LoadReport にまとめる
+- SalesAggregates は行を保持せずに集計だけを更新する（行数に比例するメモリを使わない）
+- load_byte_range はファイルの一部（行の境界で分割したバイト範囲）だけを読み込む。
+  複数のプロセスで読み込んだ結果を順番に結合すると、ファイル全体を読み込んだ場合と同じになる
+
+学習ポイント:
+- csv.reader と列の位置による取り出し
+- itertools.islice によるチャンク単位の処理
+- 集計値の逐次更新（ランニング集計）
+- バイト範囲の分割と、部分結果の結合（map-reduce）
+"""
+
+import io
+import os
+import csv
+import math
+from array import array
+from collections import Counter
+from fractions import Fraction
+from itertools import islice
+from operator import itemgetter
+
+from sales_columns import DateParser, SalesColumns, PARTIAL_VALUES_LIMIT, exact_partials, extend_partials
+from sales_cube import SalesCube
+
+# 1回に変換する行数
+CHUNK_ROWS = 10000
+
+# バイト範囲を読み込むときのバッファのサイズ
+READ_SIZE = 1024 * 1024
+
+# LoadReport に残す不正な行の例の数
+MAX_BAD_ROW_EXAMPLES = 5
+
+# 必須の列と、省略できる列（省略時の値）
+REQUIRED_COLUMNS = ('date', 'product', 'region', 'amount')
+OPTIONAL_COLUMNS = {'sales_rep': '', 'quantity': '1', 'unit_price': '0'}
+
+class LoadReport:
+    """読み込んだ行数と、スキップした不正な行の集計"""
+    
+    def __init__(self):
+        self.rows = 0             # 読み込んだ行数
+        self.skipped = 0          # スキップした行数
+        self.examples = []        # (行番号, 理由) のリスト（最初の MAX_BAD_ROW_EXAMPLES 件）
+        self.lines = 0            # 読み込んだファイルの行数（ヘッダーを含む）
+    
+    def add_bad_row(self, line_number, reason):
+        """スキップした行を記録"""
+        self.skipped += 1
+        if len(self.examples) < MAX_BAD_ROW_EXAMPLES:
+            self.examples.append((line_number, reason))
+    
+    def merge(self, other):
+        """
+        続きの範囲を読み込んだ結果を結合（other の行番号はこの範囲の後ろからの番号に直す）
+        
+        Args:
+            other (LoadReport): 直後のバイト範囲を読み込んだ結果
+        """
+        self.rows += other.rows
+        self.skipped += other.skipped
+        for line_number, reason in other.examples[:MAX_BAD_ROW_EXAMPLES - len(self.examples)]:
+            self.examples.append((self.lines + line_number, reason))
+        self.lines += other.lines
+    
+    def print_summary(self):
+        """スキップした行があれば件数と例を表示"""
+        if not self.skipped:
+            return
+        print(f"⚠️ 不正なデータ行を {self.skipped:,}行スキップしました")
+        for line_number, reason in self.examples:
+            print(f"   {line_number}行目: {reason}")
+        if self.skipped > len(self.examples):
+            print(f"   ...ほか {self.skipped - len(self.examples):,}行")
+
+def check_header(header):
+    """
+    ヘッダーに必須の列があるかを確認
+    
+    Raises:
+        ValueError: ヘッダーに必須の列がない場合
+    """
+    missing = [name for name in REQUIRED_COLUMNS if name not in header]
+    if missing:
+        raise ValueError(f"必須の列がありません: {', '.join(missing)}")
+
+def read_sales_chunks(f, report, chunk_rows=CHUNK_ROWS, parse_date=None, header=None):
+    """
+    売上データのCSVを chunk_rows 行ずつ変換
+    
+    Args:
+        f (file): CSVファイル（テキストモード）
+        report (LoadReport): 読み込んだ行数・不正な行を記録する
+        chunk_rows (int): 1回に変換する行数
+        parse_date (callable): 日付の文字列 -> 日の通し番号（省略時は DateParser）
+        header (list): 列名のリスト（省略時は f の最初の行。ファイルの途中から読む場合に指定する）
+    
+    Yields:
+        list: (日の通し番号, 商品, 地域, 担当者, 金額, 数量, 単価) のタプルのリスト
+    
+    Raises:
+        ValueError: ヘッダーに必須の列がない場合
+    """
+    if parse_date is None:
+        parse_date = DateParser()
+    
+    reader = csv.reader(f)
+    if header is None:
+        header = next(reader, None)
+        if header is None:
+            return
+    check_header(header)
+    
+    # 省略された列は、行の末尾に追加する省略時の値の位置を指す
+    width = len(header)
+    defaults = [value for name, value in OPTIONAL_COLUMNS.items() if name not in header]
+    missing_positions = iter(range(width, width + len(defaults)))
+    positions = [header.index(name) for name in REQUIRED_COLUMNS]
+    positions += [header.index(name) if name in header else next(missing_positions) for name in OPTIONAL_COLUMNS]
+    get_fields = itemgetter(*positions)
+    
+    while True:
+        rows = list(islice(reader, chunk_rows))
+        if not rows:
+            return
+        first_line = reader.line_num - len(rows) + 1
+        
+        chunk = []
+        for offset, row in enumerate(rows):
+            if not row:
+                continue    # 空行（csv.DictReader と同じく読み飛ばす）
+            try:
+                if len(row) != width:
+                    if len(row) < width:
+                        raise ValueError(f"列が不足しています（{len(row)}/{width}列）")
+                    del row[width:]
+                if defaults:
+                    row.extend(defaults)
+                date_text, product, region, amount_text, sales_rep, quantity_text, unit_price_text = get_fields(row)
+                
+                amount = float(amount_text)
+                quantity = int(quantity_text)
+                unit_price = float(unit_price_text)
+                
+                # 単価が0の場合は計算
+                if unit_price == 0 and quantity > 0:
+                    unit_price = amount / quantity
+                
+                chunk.append((parse_date(date_text), product, region, sales_rep, amount, quantity, unit_price))
+            except ValueError as e:
+                # 複数行にまたがる値がある場合、行番号はおおよその値
+                report.add_bad_row(first_line + offset, e)
+        
+        report.rows += len(chunk)
+        report.lines = reader.line_num
+        yield chunk
+
+def read_header(filename, encoding='utf-8'):
+    """
+    CSVのヘッダーを読み込む
+    
+    Returns:
+        tuple: (列名のリスト（空のファイルは None）, データの最初の行のバイト位置)
+    """
+    with open(filename, 'rb') as f:
+        line = f.readline()
+        if not line:
+            return None, 0
+        return next(csv.reader([line.decode(encoding)]), []), f.tell()
+
+def split_byte_ranges(filename, num_parts, start=0):
+    """
+    ファイルの start 以降を行の境界でおおよそ等しいバイト範囲に分割
+    
+    Args:
+        filename (str): 分割するファイル名
+        num_parts (int): 分割数
+        start (int): 分割を始めるバイト位置（ヘッダーの次の行）
+    
+    Returns:
+        list: (開始位置, 終了位置) のタプルのリスト
+    """
+    size = os.path.getsize(filename)
+    if size <= start:
+        return []
+    
+    boundaries = [start]
+    with open(filename, 'rb') as f:
+        for i in range(1, num_parts):
+            f.seek(start + (size - start) * i // num_parts)
+            f.readline()  # 次の行頭まで進める（改行はUTF-8の文字境界でもある）
+            position = f.tell()
+            if position >= size:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(size)
+    
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+class _ByteRangeReader(io.RawIOBase):
+    """ファイルの現在位置から size バイトだけを読むファイルオブジェクト"""
+    
+    def __init__(self, raw, size):
+        self.raw = raw
+        self.remaining = size
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        count = self.raw.readinto(memoryview(buffer)[:size])
+        self.remaining -= count
+        return count
+
+def load_byte_range(filename, start, end, header, keep_rows=True, encoding='utf-8'):
+    """
+    CSVの指定バイト範囲を読み込む（ワーカープロセスで実行）
+    
+    Args:
+        filename (str): CSVファイル名
+        start (int): 開始位置（行頭）
+        end (int): 終了位置（行頭、またはファイルの末尾）
+        header (list): 列名のリスト
+        keep_rows (bool): 行を保持するか（False の場合は集計だけ）
+        encoding (str): 文字コード
+    
+    Returns:
+        tuple: (SalesColumns または SalesAggregates, LoadReport（行番号は範囲の先頭からの番号）)
+    """
+    columns = SalesColumns()
+    aggregates = None if keep_rows else SalesAggregates()
+    report = LoadReport()
+    
+    with open(filename, 'rb', buffering=0) as raw:
+        raw.seek(start)
+        f = io.TextIOWrapper(io.BufferedReader(_ByteRangeReader(raw, end - start), READ_SIZE),
+                             encoding=encoding, newline='')
+        for chunk in read_sales_chunks(f, report, parse_date=columns.date_parser, header=header):
+            if keep_rows:
+                columns.extend(chunk)
+            else:
+                aggregates.update(chunk)
+    
+    return (columns if keep_rows else aggregates), report
+
+class SalesAggregates:
+    """
+    行を保持せずに更新する売上データの集計
+    
+    セル（日・商品・地域・担当者の組み合わせ）ごとの売上高・数量・取引数と、
+    金額ごとの件数（中央値の計算用）を保持します。メモリ使用量は行数ではなく
+    セルの数と金額の種類数に比例します。
+    
+    売上高は丸めない値のリスト（多くなったら exact_partials の部分和）で保持するため、
+    チャンクの分け方や結合の順番によらず、行を保持して math.fsum で合計した場合と
+    同じ値になります。
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.sales_partials = []          # 売上高の合計の部分和
+        self.total_quantity = 0
+        self.min_date = None
+        self.max_date = None
+        self.amount_counts = Counter()    # 金額 -> 件数
+        self.cells = {}                   # (日の通し番号, 商品, 地域, 担当者) -> [売上高のリスト, 数量, 取引数]
+        self._names = {}                  # 商品・地域・担当者の文字列（セルごとに別の文字列を持たないため）
+        self._cube = None
+    
+    def update(self, chunk):
+        """
+        チャンクの行を集計に加える
+        
+        Args:
+            chunk (list): read_sales_chunks が返す行のタプルのリスト
+        """
+        if not chunk:
+            return
+        
+        cells = self.cells
+        name = self._names.setdefault
+        for date_ordinal, product, region, sales_rep, amount, quantity, _ in chunk:
+            key = (date_ordinal, product, region, sales_rep)
+            totals = cells.get(key)
+            if totals is None:
+                key = (date_ordinal, name(product, product), name(region, region), name(sales_rep, sales_rep))
+                cells[key] = [[amount], quantity, 1]
+            else:
+                sales = totals[0]
+                sales.append(amount)
+                if len(sales) > PARTIAL_VALUES_LIMIT:
+                    totals[0] = exact_partials(sales)
+                totals[1] += quantity
+                totals[2] += 1
+        
+        amounts = [row[4] for row in chunk]
+        dates = [row[0] for row in chunk]
+        
+        self.sales_partials = exact_partials(self.sales_partials + amounts)
+        self.total_quantity = sum(row[5] for row in chunk) + self.total_quantity
+        self.amount_counts.update(amounts)
+        self.count += len(chunk)
+        self.min_date = min(dates) if self.min_date is None else min(self.min_date, min(dates))
+        self.max_date = max(dates) if self.max_date is None else max(self.max_date, max(dates))
+        self._cube = None
+    
+    def merge(self, other):
+        """
+        続きの範囲の集計を結合
+        
+        セルは最初に出現した順を保ちます。売上高は丸めない値（部分和）を
+        つなげるため、1回で集計した場合と同じ値になります。
+        
+        Args:
+            other (SalesAggregates): 直後のバイト範囲の集計
+        """
+        if not other.count:
+            return
+        
+        cells = self.cells
+        name = self._names.setdefault
+        for key, (sales, quantity, count) in other.cells.items():
+            totals = cells.get(key)
+            if totals is None:
+                date_ordinal, product, region, sales_rep = key
+                key = (date_ordinal, name(product, product), name(region, region), name(sales_rep, sales_rep))
+                cells[key] = [list(sales), quantity, count]
+            else:
+                totals[0] = extend_partials(totals[0], sales)
+                totals[1] += quantity
+                totals[2] += count
+        
+        self.sales_partials = exact_partials(self.sales_partials + other.sales_partials)
+        self.total_quantity += other.total_quantity
+        self.amount_counts.update(other.amount_counts)
+        self.count += other.count
+        self.min_date = other.min_date if self.min_date is None else min(self.min_date, other.min_date)
+        self.max_date = other.max_date if self.max_date is None else max(self.max_date, other.max_date)
+        self._cube = None
+    
+    @property
+    def total_sales(self):
+        """売上高の合計（足す順番によらず正しく丸めた値）"""
+        return math.fsum(self.sales_partials)
+    
+    def mean(self):
+        """金額の平均（statistics.mean と同じく正確に計算して丸める）"""
+        total = sum(Fraction(amount) * count for amount, count in self.amount_counts.items())
+        return float(total / self.count)
+    
+    def median(self):
+        """金額の中央値（statistics.median と同じ値）"""
+        # 小さい順に並べたときの中央の位置（偶数件の場合は中央の2つ）
+        middle = self.count // 2
+        targets = [middle] if self.count % 2 == 1 else [middle - 1, middle]
+        
+        values = []
+        seen = 0
+        for amount in sorted(self.amount_counts):
+            seen += self.amount_counts[amount]
+            while len(values) < len(targets) and seen > targets[len(values)]:
+                values.append(amount)
+            if len(values) == len(targets):
+                break
+        else:
+            raise ValueError("データがありません")
+        return values[0] if len(values) == 1 else (values[0] + values[1]) / 2
+    
+    def cube(self):
+        """
+        セルの集計から SalesCube を作成（行を保持して作成した場合と同じ集計結果）
+        
+        セルを1行、取引数を行の重みとした列から作成します。
+        """
+        if self._cube is None:
+            columns = SalesColumns()
+            weights = array('q')
+            sales_partials = []
+            for (date_ordinal, product, region, sales_rep), (partials, quantity, count) in self.cells.items():
+                columns.append(date_ordinal, product, region, sales_rep, math.fsum(partials), quantity, 0)
+                weights.append(count)
+                sales_partials.append(partials)
+            self._cube = SalesCube(columns, weights=weights, sales_partials=sales_partials)
+        return self._cube
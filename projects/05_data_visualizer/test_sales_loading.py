@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+プロジェクト5: 売上データ読み込みの回帰テスト
+
+CSVの読み込み方（1プロセス / 複数プロセス、行を保持する / 集計のみ）を
+変えても、読み込んだ行・不正な行の表示・分析結果が変わらないことを確かめます。
+
+使用方法:
+  python3 -m unittest discover -s projects/05_data_visualizer
+  python3 -m pytest projects/05_data_visualizer
+"""
+
+import io
+import os
+import math
+import random
+import tempfile
+import unittest
+import contextlib
+
+from sales_analyzer import SalesDataAnalyzer
+from benchmark_sales import same_columns
+
+HEADER = 'date,product,region,sales_rep,amount,quantity,unit_price'
+
+# 既知の不正な行を含むCSV（行番号はヘッダーを1行目として数える）
+BAD_ROWS_CSV = [
+    HEADER,
+    '2024-01-01,A,東京,S1,100,1,100',
+    '2024-01-02,A,東京,S1,abc,1,100',
+    '',
+    '2024-13-01,B,大阪,S2,5,1,5',
+    '2024-01-03,B,大阪,,50,2,25',
+    'short,row',
+]
+BAD_ROWS_LOG = [
+    "⚠️ 不正なデータ行を 3行スキップしました",
+    "   3行目: could not convert string to float: 'abc'",
+    "   5行目: time data '2024-13-01' does not match format '%Y-%m-%d'",
+    "   7行目: 列が不足しています（2/7列）",
+    "✅ CSVから読み込みました: 2件",
+]
+
+def make_sales_lines(num_rows, seed):
+    """乱数のシードから、不正な行を散りばめた売上データのCSVの行を作成"""
+    rng = random.Random(seed)
+    lines = [HEADER]
+    for _ in range(num_rows):
+        lines.append(f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d},P{rng.randint(1, 9)},"
+                     f"R{rng.randint(1, 4)},S{rng.randint(1, 5)},{rng.random() * 1000:.2f},"
+                     f"{rng.randint(1, 5)},{rng.choice(['0', '12.5'])}")
+    for bad in ['2024-01-01,P1,R1,S1,abc,1,0', '2024-13-01,P1,R1,S1,5,1,0', 'short,row', ''] * 3:
+        lines.insert(rng.randint(1, len(lines)), bad)
+    return lines
+
+def run_analyses(analyzer):
+    """各分析を実行して結果をまとめる（表示されるメッセージは捨てる）"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.calculate_summary_statistics()
+    return [analyzer.summary_stats, analyzer.analyze_monthly_trends(), analyzer.analyze_product_performance(),
+            analyzer.analyze_regional_performance(), analyzer.analyze_sales_rep_performance(),
+            analyzer.get_top_selling_days(15), analyzer.calculate_growth_rate(),
+            analyzer.analyze_dimensions('day', 'region')]
+
+class SalesLoadingTest(unittest.TestCase):
+    """load_from_csv の読み込み方による違いがないことを確かめるテスト"""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+    
+    def write_csv(self, name, lines, trailing_newline=True):
+        """CSVファイルを一時ディレクトリに作成"""
+        filename = os.path.join(self.directory.name, name)
+        with open(filename, 'w', encoding='utf-8', newline='') as f:
+            f.write('\n'.join(lines) + ('\n' if trailing_newline and lines else ''))
+        return filename
+    
+    def load(self, filename, **options):
+        """
+        CSVを読み込む
+        
+        Returns:
+            tuple: (SalesDataAnalyzer, 表示されたメッセージの行のリスト)
+        """
+        analyzer = SalesDataAnalyzer()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertTrue(analyzer.load_from_csv(filename, **options))
+        return analyzer, output.getvalue().splitlines()
+    
+    def test_parallel_matches_serial(self):
+        """複数プロセスで読み込んでも行・カテゴリ値の順番・メッセージ・分析結果が同じ"""
+        for num_rows, trailing_newline in [(1, True), (5, False), (3000, True)]:
+            filename = self.write_csv(f'sales{num_rows}.csv', make_sales_lines(num_rows, num_rows), trailing_newline)
+            serial, serial_log = self.load(filename)
+            serial_results = run_analyses(serial)
+            for workers in (2, 3):
+                with self.subTest(rows=num_rows, workers=workers):
+                    parallel, parallel_log = self.load(filename, workers=workers)
+                    self.assertTrue(same_columns(serial.columns, parallel.columns))
+                    self.assertEqual(parallel_log, serial_log)
+                    self.assertEqual(run_analyses(parallel), serial_results)
+    
+    def test_bad_row_line_numbers(self):
+        """スキップした行はファイルの行番号で表示される（並列に読み込んだ場合も同じ）"""
+        filename = self.write_csv('bad_rows.csv', BAD_ROWS_CSV)
+        for options in ({}, {'workers': 2}, {'keep_rows': False}, {'workers': 2, 'keep_rows': False}):
+            with self.subTest(**options):
+                analyzer, log = self.load(filename, **options)
+                expected = BAD_ROWS_LOG[:-1] + [BAD_ROWS_LOG[-1] + ('' if options.get('keep_rows', True) else '（集計のみ）')]
+                self.assertEqual(log, expected)
+        
+        analyzer, _ = self.load(filename)
+        self.assertEqual(analyzer.sales_data[1]['sales_rep'], '')
+    
+    def test_empty_and_header_only(self):
+        """空のファイルとヘッダーだけのファイルは0件として読み込む"""
+        for name, lines in [('empty.csv', []), ('header_only.csv', [HEADER])]:
+            filename = self.write_csv(name, lines)
+            for workers in (1, 2):
+                for keep_rows in (True, False):
+                    with self.subTest(file=name, workers=workers, keep_rows=keep_rows):
+                        analyzer, log = self.load(filename, workers=workers, keep_rows=keep_rows)
+                        self.assertFalse(analyzer.has_data())
+                        self.assertEqual(log, ["✅ CSVから読み込みました: 0件" + ('' if keep_rows else '（集計のみ）')])
+                        self.assertEqual(analyzer.analyze_monthly_trends(), {})
+    
+    def test_missing_required_columns(self):
+        """必須の列がないヘッダーは、データ行がなくても並列に読み込んでもエラーになる"""
+        for name, lines in [('bad_header_only.csv', ['date,product,amount']),
+                            ('bad_header.csv', ['date,product,amount', '2024-01-01,A,100'])]:
+            filename = self.write_csv(name, lines)
+            for workers in (1, 2):
+                for keep_rows in (True, False):
+                    with self.subTest(file=name, workers=workers, keep_rows=keep_rows):
+                        analyzer = SalesDataAnalyzer()
+                        output = io.StringIO()
+                        with contextlib.redirect_stdout(output):
+                            self.assertFalse(analyzer.load_from_csv(filename, keep_rows=keep_rows, workers=workers))
+                        self.assertEqual(output.getvalue().splitlines(),
+                                         ["❌ CSV読み込みエラー: 必須の列がありません: region"])
+                        self.assertFalse(analyzer.has_data())
+    
+    def test_aggregates_match_rows(self):
+        """keep_rows=False の集計だけでも、行を保持した場合と同じ分析結果になる（小数の合計も一致する）"""
+        filename = self.write_csv('sales.csv', make_sales_lines(3000, 7))
+        with_rows, _ = self.load(filename)
+        expected = run_analyses(with_rows)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                aggregated, _ = self.load(filename, keep_rows=False, workers=workers)
+                self.assertEqual(len(aggregated.sales_data), 0)
+                self.assertEqual(run_analyses(aggregated), expected)
+    
+    def test_exact_sales_sums(self):
+        """小数の売上高は足す順番によらず正しく丸めた合計になる（同じセルの行が多い場合も）"""
+        amounts = [0.1] * 40 + [1e16, 1.0, -1e16]
+        self.assertNotEqual(sum(amounts), math.fsum(amounts))
+        lines = [HEADER] + [f'2024-01-{min(index, 3) + 1:02d},A,東京,S1,{amount!r},1,0'
+                            for index, amount in enumerate(amounts)]
+        filename = self.write_csv('exact.csv', lines)
+        
+        for options in ({}, {'workers': 2}, {'keep_rows': False}, {'workers': 3, 'keep_rows': False}):
+            with self.subTest(**options):
+                analyzer, _ = self.load(filename, **options)
+                run_analyses(analyzer)
+                self.assertEqual(analyzer.summary_stats['total_sales'], 5.0)
+                self.assertEqual(analyzer.analyze_monthly_trends()['2024-01']['sales'], 5.0)
+                self.assertEqual(analyzer.analyze_dimensions('product')[('A',)]['sales'], 5.0)
+    
+    def test_sales_data_is_read_only(self):
+        """sales_data の行は変更できず、append で追加した担当者のない行は '不明' になる"""
+        analyzer, _ = self.load(self.write_csv('bad_rows.csv', BAD_ROWS_CSV))
+        with self.assertRaises(TypeError):
+            analyzer.sales_data[0] = {}
+        with self.assertRaises(TypeError):
+            analyzer.sales_data[0]['amount'] = 0
+        
+        analyzer.sales_data.append({'date': '2024-02-01', 'product': 'C', 'region': '東京',
+                                    'amount': 10, 'quantity': 1, 'unit_price': 10})
+        self.assertEqual(len(analyzer.sales_data), 3)
+        self.assertEqual(analyzer.sales_data[-1]['sales_rep'], '不明')
+
+if __name__ == "__main__":
+    unittest.main()